@@ -1,4 +1,28 @@
-from .config import BaseConfig
-from .utils.configuration import CustomJSONEncoder, DEFAULT_CONVERTERS, DEFAULT_CAST
+TYPE_CHECKING = False  # see foundation._lazy
 
-from .cli_parser import BaseCLIParser, ParamFunc
+from ._lazy import attach
+
+# Submodules (and dacite, json, ...) are only imported once one of their names is used.
+__getattr__, __dir__, __all__ = attach(__name__, {
+    ".config": ["BaseConfig"],
+    ".utils.configuration": ["CustomJSONEncoder", "DEFAULT_CONVERTERS", "DEFAULT_CAST"],
+    ".cli_parser": ["BaseCLIParser", "ParamFunc"],
+    ".sweep": ["Sweep"],
+    ".store": ["ConfigStore"],
+    ".broadcast": ["ConfigBroadcast", "ConfigSubscriber"],
+    ".watch": ["ConfigWatcher"],
+    ".utils.patch": ["ConfigPatch"],
+    ".utils.load_cache": ["ConfigCache"],
+})
+
+if TYPE_CHECKING:
+    from .config import BaseConfig
+    from .utils.configuration import CustomJSONEncoder, DEFAULT_CONVERTERS, DEFAULT_CAST
+
+    from .cli_parser import BaseCLIParser, ParamFunc
+    from .sweep import Sweep
+    from .store import ConfigStore
+    from .broadcast import ConfigBroadcast, ConfigSubscriber
+    from .watch import ConfigWatcher
+    from .utils.patch import ConfigPatch
+    from .utils.load_cache import ConfigCache
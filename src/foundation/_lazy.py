@@ -0,0 +1,38 @@
+"""
+Lazy package namespaces. A package `__init__` calls `attach` with the public names of
+its submodules, so `import foundation` stays cheap and dacite, json, colorlog, ... are
+only imported once a name that needs them is used.
+
+The `__init__` files also set `TYPE_CHECKING = False` instead of importing it from
+typing, which alone would double the import time of the package. Type checkers treat
+the name like typing.TYPE_CHECKING, so the eager imports in its `if TYPE_CHECKING:`
+block give them (and IDEs) the real names while the interpreter skips them.
+"""
+import importlib
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Callable, Dict, List, Tuple
+
+
+def attach(package: str, submodules: "Dict[str, List[str]]") -> "Tuple[Callable[[str], Any], Callable[[], List[str]], List[str]]":
+    """
+    Lazy attribute access for `package`: each public name is imported from its submodule
+    on first access (PEP 562) and then cached in the package namespace.
+    Returns `__getattr__`, `__dir__` and `__all__` for the package.
+    """
+    origins = {name: module for module, names in submodules.items() for name in names}
+    namespace = importlib.import_module(package).__dict__
+
+    def __getattr__(name: str) -> "Any":
+        module = origins.get(name)
+        if module is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module, package), name)
+        namespace[name] = value
+        return value
+
+    def __dir__() -> "List[str]":
+        return sorted(set(namespace) | set(origins))
+
+    return __getattr__, __dir__, list(origins)
@@ -1,8 +1,16 @@
 from pathlib import Path
 import argparse
+from enum import Enum
+from functools import lru_cache, partial
+from typing import Any, Callable, Dict, Tuple, Type, Union, get_args, get_origin
+
+from dacite.types import extract_generic, is_optional
+
+from .utils.parsing import str2bool, LiteralParser
+
+# Fields that are not set through their own flag.
+EXCLUDED_FIELDS = ("cmd_args",)
 
-from .utils.parsing import str2bool
-    
 
 def add_extra_params(parser: argparse.ArgumentParser):
     # Controlled extras
@@ -14,20 +22,60 @@ def add_extra_params(parser: argparse.ArgumentParser):
         help="Optional extra parameters (explicit opt_in)"
     )
 
-def add_config_params(parser: argparse.ArgumentParser):
-    # File Context
-    parser.add_argument("--cfg_save_dir", type=Path, default=None, help="Config save directory")
-    parser.add_argument("--current_run_dir", type=Path, default=None, help="Current run directory")
-
-    # Config
-    parser.add_argument("--cfg_file_name_save", type=str, default=None, help="Config file name for saving")
-    parser.add_argument("--cfg_file_name_load", type=str, default=None, help="Config file name for loading")
-    parser.add_argument("--overwrite_from_cmd", type=str2bool, default=None, help="Overwrite from command line")
-    # cmd_args will be populated later, no CLI argument
-
-    # Debug Flags
-    parser.add_argument("--debug", action="store_true", help="Debug mode")
-    
-    # Logging
-    parser.add_argument("--log_dir", type=str, default=None, help="Log directory")
-    parser.add_argument("--log_level", type=int, default=None, help="Logging level")
+
+@lru_cache(maxsize=None)
+def config_params(config_class: Type) -> Callable[[argparse.ArgumentParser], None]:
+    """Param func adding the flags of `config_class`, the same object for the same class."""
+    return partial(add_dataclass_params, config_class=config_class)
+
+
+def add_dataclass_params(parser: argparse.ArgumentParser, config_class: Type) -> None:
+    """One flag per field of `config_class`, nested dataclass fields as `--nested.inner.x`."""
+    for path, kwargs in dataclass_arguments(config_class):
+        parser.add_argument(f"--{path}", dest=path, **kwargs)
+
+
+@lru_cache(maxsize=None)
+def dataclass_arguments(config_class: Type) -> Tuple[Tuple[str, Dict[str, Any]], ...]:
+    """`add_argument` keyword arguments per dotted field path, derived once per class."""
+    arguments = []
+    for path, entry in config_class.get_schema().fields.items():
+        # Sub-configs get flags for their fields, dicts and Any are set through --extras
+        if entry.nested or entry.free_form or path.split(".", 1)[0] in EXCLUDED_FIELDS:
+            continue
+        kwargs = _argument_kwargs(entry.type)
+        kwargs.setdefault("default", None)
+        kwargs.setdefault("help", _type_name(entry.type))
+        arguments.append((path, kwargs))
+    return tuple(arguments)
+
+
+def _argument_kwargs(type_: Any) -> Dict[str, Any]:
+    if is_optional(type_) and len(extract_generic(type_)) == 2:
+        type_ = extract_generic(type_)[0]
+    origin = get_origin(type_)
+    if type_ is bool:
+        return {"type": str2bool, "nargs": "?", "const": True, "metavar": "BOOL"}
+    if isinstance(type_, type) and issubclass(type_, Enum):
+        values = [member.value for member in type_]
+        value_types = {type(v) for v in values}
+        return {"type": value_types.pop() if len(value_types) == 1 else _literal, "choices": values}
+    if origin in (list, tuple, set, frozenset):
+        args = [a for a in get_args(type_) if a is not Ellipsis]
+        element = _argument_kwargs(args[0]) if len(set(args)) == 1 else {}
+        return {"type": element.get("type", _literal), "nargs": "*"}
+    if type_ in (list, tuple, set, frozenset):
+        return {"type": _literal, "nargs": "*"}
+    if type_ in (int, float, str, Path):
+        return {"type": type_}
+    if origin is Union:
+        return {"type": _literal}
+    # datetime, Decimal, UUID, ...: the string is converted while decoding
+    return {"type": str}
+
+
+def _type_name(type_: Any) -> str:
+    return getattr(type_, "__name__", None) or str(type_).replace("typing.", "")
+
+
+_literal = LiteralParser()
\ No newline at end of file
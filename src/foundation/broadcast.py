@@ -0,0 +1,155 @@
+import logging
+import pickle
+import struct
+import sys
+import threading
+import time
+from multiprocessing import shared_memory
+from typing import Generic, Optional, Tuple, Type, TypeVar
+
+from .config import BaseConfig
+
+log = logging.getLogger(__name__)
+
+TConfig = TypeVar("TConfig", bound="BaseConfig")
+
+# Segment layout: sequence number, payload length, then the pickled config.
+# The sequence is odd while the parent writes, readers retry until they saw an even
+# and unchanged sequence around their copy (a seqlock). version = sequence // 2.
+_HEADER = struct.Struct("<QQ")
+_MIN_CAPACITY = 64 * 1024
+_READ_TIMEOUT = 5.0
+
+_attach_lock = threading.Lock()
+
+
+class ConfigBroadcast(Generic[TConfig]):
+    """
+    Publishes a resolved config once into shared memory for all workers of a run, instead
+    of every worker parsing the JSON file, applying overrides and decoding on its own.
+    Pass `name` to the workers, they read it with ConfigSubscriber. `update` publishes a
+    new version in place as long as it fits into `capacity` bytes.
+
+    The config is pickled rather than JSON encoded: the parent already decoded and checked
+    it, so workers skip `from_dict` entirely. The process that created the broadcast owns
+    the segment and removes it on `close`.
+    """
+
+    def __init__(self, cfg: TConfig, capacity: Optional[int] = None, name: Optional[str] = None) -> None:
+        payload = self._encode(cfg)
+        capacity = capacity if capacity is not None else max(_MIN_CAPACITY, 2 * len(payload))
+        self._shm = shared_memory.SharedMemory(name=name, create=True, size=_HEADER.size + capacity)
+        self.name: str = self._shm.name
+        self.capacity = capacity
+        self.config_class: Type[TConfig] = type(cfg)
+        self._sequence = 0
+        self._write(payload)
+
+    def __enter__(self) -> "ConfigBroadcast[TConfig]":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def version(self) -> int:
+        return self._sequence // 2
+
+    def update(self, cfg: TConfig) -> int:
+        """Publish `cfg` as the next version and return its version number."""
+        if type(cfg) is not self.config_class:
+            raise TypeError(f"Broadcast holds {self.config_class.__name__}, got {type(cfg).__name__}")
+        self._write(self._encode(cfg))
+        return self.version
+
+    def close(self) -> None:
+        if self._shm.buf is None:
+            return
+        self._shm.close()
+        self._shm.unlink()
+
+    def _encode(self, cfg: TConfig) -> bytes:
+        return pickle.dumps(cfg, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def _write(self, payload: bytes) -> None:
+        if len(payload) > self.capacity:
+            raise ValueError(f"Config needs {len(payload)} bytes, the broadcast was created with capacity {self.capacity}")
+        buf = self._shm.buf
+        self._sequence += 1
+        _HEADER.pack_into(buf, 0, self._sequence, 0)
+        buf[_HEADER.size:_HEADER.size + len(payload)] = payload
+        self._sequence += 1
+        _HEADER.pack_into(buf, 0, self._sequence, len(payload))
+        log.debug("Published config version %d to %s (%d bytes)" % (self.version, self.name, len(payload)))
+
+
+class ConfigSubscriber(Generic[TConfig]):
+    """
+    Worker side of a ConfigBroadcast. `get` decodes the published config once per
+    version and returns the same object until the parent publishes a new one, so
+    treat it as read-only. Workers never write to the segment.
+    """
+
+    def __init__(self, name: str, config_class: Type[TConfig]) -> None:
+        self.name = name
+        self.config_class = config_class
+        self._shm = _attach(name)
+        self._version = -1
+        self._cfg: Optional[TConfig] = None
+
+    def __enter__(self) -> "ConfigSubscriber[TConfig]":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def version(self) -> int:
+        """Latest published version, without decoding it."""
+        return _HEADER.unpack_from(self._shm.buf, 0)[0] // 2
+
+    def changed(self) -> bool:
+        return self.version != self._version
+
+    def get(self) -> TConfig:
+        if self._cfg is None or self.changed():
+            version, payload = self._read()
+            cfg = pickle.loads(payload)
+            if type(cfg) is not self.config_class:
+                raise TypeError(f"Broadcast {self.name} holds {type(cfg).__name__}, expected {self.config_class.__name__}")
+            self._cfg = cfg
+            self._version = version
+        return self._cfg  # type: ignore
+
+    def close(self) -> None:
+        if self._shm.buf is not None:
+            self._shm.close()
+
+    def _read(self) -> Tuple[int, bytes]:
+        buf = self._shm.buf
+        limit = len(buf) - _HEADER.size
+        deadline = time.monotonic() + _READ_TIMEOUT
+        while True:
+            sequence, length = _HEADER.unpack_from(buf, 0)
+            if sequence % 2 == 0 and length <= limit:
+                payload = bytes(buf[_HEADER.size:_HEADER.size + length])
+                if _HEADER.unpack_from(buf, 0)[0] == sequence:
+                    return sequence // 2, payload
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"Config broadcast {self.name} stayed mid-update for {_READ_TIMEOUT}s")
+            time.sleep(0)
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    # Before 3.13 attaching registers the segment with the resource tracker, which then
+    # unlinks it when the first worker exits. Only the creating process should own it.
+    from multiprocessing import resource_tracker
+    with _attach_lock:
+        register = resource_tracker.register
+        resource_tracker.register = lambda *args, **kwargs: None  # type: ignore
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register  # type: ignore
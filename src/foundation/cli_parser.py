@@ -1,10 +1,13 @@
 import logging
 import argparse
-import json
-from typing import Dict, Any, Tuple, Type, Callable, List, TypeVar, Generic
+from functools import lru_cache
+from typing import Dict, Any, Tuple, Type, Callable, List, Sequence, TypeVar, Generic
 
-from .arguments import add_extra_params, add_config_params
+from .arguments import add_extra_params, config_params
 from .config import BaseConfig
+from .utils.configuration import set_nested
+from .utils.parsing import LiteralParser
+from .utils.git import get_git_commit_hash_future
 
 log = logging.getLogger(__name__)
 
@@ -18,35 +21,34 @@ class BaseCLIParser(Generic[TConfig]):
 
     def __init__(self, config_class: Type[TConfig]) -> None:
         self.config_class = config_class # Overwrite this if you are using another Config!!
-        self._param_funcs = [add_extra_params, add_config_params] # Add other functions to this list!
+        # Flags for every config field are generated, add other functions to this list!
+        self._param_funcs = [add_extra_params, config_params(config_class)]
+        self.literal_parser = LiteralParser()
+        get_git_commit_hash_future()  # resolves while the arguments are parsed
 
     def append_param_func(self, param_func: ParamFunc):
         self._param_funcs.append(param_func)
 
-    def build_parser(self, argv) -> Tuple[argparse.ArgumentParser, argparse.Namespace]:
-        parser = argparse.ArgumentParser(description="Run experiment")
-
-        for param_func in self._param_funcs:
-            param_func(parser)
+    def get_parser(self) -> argparse.ArgumentParser:
+        """The ArgumentParser for the current param funcs, built once and shared between parsers."""
+        return _build_parser(tuple(self._param_funcs))
 
+    def build_parser(self, argv) -> Tuple[argparse.ArgumentParser, argparse.Namespace]:
+        parser = self.get_parser()
         args, _ = parser.parse_known_args(argv)
         return parser, args
 
     def parse_value(self, v: str) -> Any:
-        try:
-            return json.loads(v)
-        except Exception as e:
-            log.warning(e)
-            return v
+        return self.literal_parser(v)
 
     def parse_dict(self, items) -> Dict[str, Any]:
-        d = {}
+        """KEY=VALUE items into a dict, dotted keys (`model.depth=3`) are nested."""
+        d: Dict[str, Any] = {}
         for item in items:
             if "=" not in item:
                 raise ValueError(f"Extras must be KEY=VALUE, got '{item}'")
             key, value = item.split("=", 1)
-            value = self.parse_value(value)
-            d[key] = value
+            set_nested(d, key, self.parse_value(value))
         return d
     
     def parse_dicts(self, args):
@@ -54,20 +56,15 @@ class BaseCLIParser(Generic[TConfig]):
 
     def parse_base(self, args: argparse.Namespace) -> dict:
         unpacked = {}
-        nested_keys = self.config_class.collect_nested_dataclasses()
-        log.debug("Nested Keys %s" % nested_keys)
+        schema = self.config_class.get_schema()
+        log.debug("Nested Keys %s" % schema.nested_names)
 
         for k, v in vars(args).items():
             if v is None:
                 continue
             if "." in k:
-                parts = k.split(".")
-                if parts[0] not in nested_keys:
-                    raise KeyError(f"Nested Key {parts[0]} detected but no corresponding dataclass exists!")
-                if parts[0] in unpacked.keys():
-                    unpacked[parts[0]][parts[1]] = v
-                else:
-                    unpacked[parts[0]] = {parts[1]:v}
+                schema.resolve(k) # Raises a KeyError for paths the config does not have
+                set_nested(unpacked, k, v)
             else:
                 unpacked[k] = v
         return unpacked
@@ -83,3 +80,17 @@ class BaseCLIParser(Generic[TConfig]):
         cfg.cmd_args = cli_args
         return cfg
 
+    def parse_many(self, argv_list: Sequence[Sequence[str]]) -> List[TConfig]:
+        """Parse many argument vectors, e.g. of a launcher, with the same parser."""
+        return [self.parse_args(list(argv)) for argv in argv_list]
+
+
+# Bounded: fresh lambdas or partials as param funcs make a new key on every call.
+@lru_cache(maxsize=32)
+def _build_parser(param_funcs: Tuple[ParamFunc, ...]) -> argparse.ArgumentParser:
+    # Later functions may redefine generated flags.
+    parser = argparse.ArgumentParser(description="Run experiment", conflict_handler="resolve")
+    for param_func in param_funcs:
+        param_func(parser)
+    return parser
+
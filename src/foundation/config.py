@@ -1,19 +1,32 @@
 from dataclasses import dataclass, asdict, field, fields
-from typing import Optional, Dict, Any, Type, TypeVar, ClassVar
+from typing import Optional, Dict, Any, Type, TypeVar, ClassVar, Union, Tuple, Iterable, List, Sequence, TYPE_CHECKING
+from functools import lru_cache
+from concurrent.futures import Future
 import logging
 import json
 from datetime import datetime
 from pathlib import Path
 from enum import Enum
-from dacite import from_dict as dacite_from_dict, Config as DaciteConfig
 
-from .utils.parsing import is_dataclass_type
-from .utils.filesystem import ensure_dir_exists, ensure_parents_exist
-from .utils.configuration import CustomJSONEncoder, DEFAULT_CAST, DEFAULT_CONVERTERS, apply_overwrite
-from .utils.git import get_git_commit_hash
+from .utils.filesystem import allocate_run_dir, atomic_write, ensure_dir_exists, ensure_parents_exist
+from .utils.configuration import CustomJSONEncoder, DEFAULT_CAST, DEFAULT_CONVERTERS, MergeReport, apply_overwrite
+from .utils.git import get_git_commit_hash_future
+from .utils.decoder import DataclassDecoder, compile_decoder
+from .utils.schema import ConfigSchema, build_schema
+from .utils.hashing import fingerprint
+from .utils.serializer import ConfigSerializer, get_serializer
+from .utils.patch import ConfigPatch, diff
+from .utils.load_cache import ConfigCache
+from .utils.validation import Check, ValidationError, Validator, Violation, compile_validator
 
 log = logging.getLogger(__name__)
 
+if TYPE_CHECKING:
+    from .store import ConfigStore
+
+# Instance attribute marking git_hash and git_repo_name as still being looked up in the background.
+_GIT_PENDING_ATTR = "_git_pending"
+
 TConfig = TypeVar("TConfig", bound="BaseConfig")
 
 
@@ -40,6 +53,9 @@ class BaseConfig:
     json_encoder: ClassVar[Type[json.JSONEncoder]]  = CustomJSONEncoder
 
     cmd_args: Dict[str, Any]    = field(default_factory=dict)
+    fingerprint_exclude: ClassVar[Tuple[str, ...]] = ("current_run_dir", "cmd_args", "git_hash", "git_repo_name")
+    # Cross-field constraints, field constraints go into field(metadata=constraint(...))
+    checks: ClassVar[Tuple[Check, ...]] = ()
 
     # Debug Flags
     debug: bool = False
@@ -58,13 +74,30 @@ class BaseConfig:
         if self.debug:
             log.info("Debugging enabled!")
             self.log_level = logging.DEBUG
-            log.debug("Retrieving git hash & repo name")
-            self.git_hash, self.git_repo_name = get_git_commit_hash()
+            log.debug("Retrieving git hash & repo name in the background")
+            get_git_commit_hash_future()
+            # The fields are filled in by _GitField when they are first read. Copies
+            # rebuilt by Sweep or patch run this again, the values may already be gone.
+            self.__dict__.pop("git_hash", None)
+            self.__dict__.pop("git_repo_name", None)
+            self.__dict__[_GIT_PENDING_ATTR] = True
+
+    def git_metadata(self) -> "Future[Tuple[str, str]]":
+        """Future of (git_hash, git_repo_name), `await asyncio.wrap_future(...)` in async code."""
+        if self.__dict__.get(_GIT_PENDING_ATTR):
+            return get_git_commit_hash_future()
+        future: "Future[Tuple[str, str]]" = Future()
+        future.set_result((self.git_hash, self.git_repo_name))
+        return future
+
+    def resolve_git(self) -> None:
+        """Wait for a pending git lookup and fill in git_hash and git_repo_name."""
+        self.git_hash  # reading resolves both
 
     
     @classmethod
     def collect_nested_dataclasses(cls):
-        return [f.name for f in fields(cls) if is_dataclass_type(f.type)]
+        return cls.get_schema().nested_names
 
 
 
@@ -79,6 +112,11 @@ class BaseConfig:
         json_name = cfg_file_name + '.json'
         return ensure_dir_exists(self.current_run_dir / self.cfg_save_dir) / json_name
     
+    def allocate_run_dir(self, parent: Optional[Path] = None, prefix: str = "run") -> Path:
+        """Create a unique run directory in `parent` (default: current_run_dir) and make it current_run_dir."""
+        self.current_run_dir = allocate_run_dir(self.current_run_dir if parent is None else parent, prefix)
+        return self.current_run_dir
+
     def get_logfile_path(self) -> Path:
         assert self.log_dir, "No log directory specified!"
         logfile_name = f"log_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.log"
@@ -87,6 +125,27 @@ class BaseConfig:
     def to_dict(self) -> Dict[str, Any]:
         return asdict(self)
 
+    def fingerprint(self, exclude: Optional[Iterable[str]] = None) -> str:
+        """
+        Stable content hash of this config, e.g. to key result caches. Dotted paths in
+        `exclude` are left out, by default the run-specific `fingerprint_exclude` fields.
+        """
+        exclude = self.fingerprint_exclude if exclude is None else exclude
+        return fingerprint(self, exclude)
+
+    def diff(self, other: "BaseConfig") -> ConfigPatch:
+        """
+        Minimal set of dotted-path changes turning this config into `other`. Send the base
+        once, then only `patch.dumps()`, and rebuild with `base.patch(ConfigPatch.loads(...))`.
+        """
+        return diff(self, other)
+
+    def patch(self: TConfig, patch: Union[ConfigPatch, Dict[str, Any]]) -> TConfig:
+        """New config with `patch` (or a dict of dotted paths) applied, untouched branches are shared."""
+        if not isinstance(patch, ConfigPatch):
+            patch = ConfigPatch(patch)
+        return patch.apply(self)
+
     def to_str(self) -> str:
         cfg_lines = []
         for field in fields(self):
@@ -94,15 +153,21 @@ class BaseConfig:
         return "\n".join(cfg_lines)
 
     # save/load
-    def save(self, cfg_save_filename: Optional[Path] = None) -> None:
+    def save(self, cfg_save_filename: Optional[Path] = None, compact: bool = False, fsync: bool = True) -> None:
+        """Atomic: readers see the previous or the complete new file. Bulk saves can share fsyncs in an FsyncBatch."""
         if cfg_save_filename == None:
             cfg_save_filename = self.get_cfg_file_path("save")
         else:
             ensure_parents_exist(cfg_save_filename)
         assert cfg_save_filename is not None, "cfg_save_dir must be set before saving config"
         log.info("Saving Config to %s" % (cfg_save_filename))
-        with open(cfg_save_filename, "w") as f:
-            json.dump(self.to_dict(), f, indent=2, cls=self.json_encoder) # Alternative would be to adjust self.to_dict()
+        with atomic_write(cfg_save_filename, fsync=fsync) as f:
+            self.serializer(compact).dump(self, f)
+
+    @classmethod
+    def serializer(cls, compact: bool = False) -> ConfigSerializer:
+        """Streaming JSON serializer for this class, indented like `save` unless `compact`."""
+        return get_serializer(cls.json_encoder, None if compact else 2)
 
     @classmethod
     def build_type_hooks(cls) -> Dict[Type, Any]:
@@ -115,48 +180,138 @@ class BaseConfig:
         return hooks
 
     @classmethod
-    def from_dict(cls, data: dict):
+    def collect_type_hooks(cls) -> Dict[Type, Any]:
         hooks = {}
         for base in reversed(cls.__mro__):
             if hasattr(base, "build_type_hooks"):
                 hooks.update(base.build_type_hooks())
+        return hooks
 
-        return dacite_from_dict(
-            data_class=cls,
-            data=data,
-            config=DaciteConfig(type_hooks=hooks, cast=DEFAULT_CAST)
-        )
+    @classmethod
+    @lru_cache(maxsize=None)
+    def get_decoder(cls) -> DataclassDecoder:
+        """
+        Compiled decoder for this class, built once and reused by `from_dict`.
+        Call `BaseConfig.get_decoder.cache_clear()` after changing type hooks or DEFAULT_CAST.
+        """
+        return compile_decoder(cls, cls.collect_type_hooks(), DEFAULT_CAST)
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def get_schema(cls) -> ConfigSchema:
+        """Flat index of all (nested) field paths of this class, built once."""
+        return build_schema(cls.get_decoder())
 
     @classmethod
-    def cfg_load(cls: Type[TConfig], cfg_filename: Path, overwrite: Optional[dict] = None) -> TConfig:
-        if not Path.is_file(cfg_filename):
-            raise Exception(
-                f"Could not load saved parameters for experiment {cls.cfg_file_name_load} "
-                f"(file {cfg_filename} not found). Check that you have the correct experiment name "
-                f"and --train_dir is set correctly."
-            )
-
-        with open(cfg_filename, "r") as json_file:
-            json_params = json.load(json_file)
+    def from_dict(cls: Type[TConfig], data: dict) -> TConfig:
+        return cls.get_decoder()(data)
+
+    @classmethod
+    def cfg_load(
+        cls: Type[TConfig],
+        cfg_filename: Union[Path, int, str],
+        overwrite: Optional[dict] = None,
+        store: Optional["ConfigStore"] = None,
+        cache: Optional[ConfigCache] = None,
+    ) -> TConfig:
+        """
+        Load a saved config and apply `overwrite`. With a `store`, `cfg_filename` is the
+        id or content hash of a config in that store instead of a file. With a `cache`,
+        files loaded before with the same content and `overwrite` are not decoded again.
+        """
+        cache_key = None
+        if store is not None:
+            json_params = store.get_dict(cfg_filename) # type: ignore
+            log.warning("Loading existing experiment configuration %s from %s", cfg_filename, store.path)
+        else:
+            cfg_filename = Path(cfg_filename)
+            if not Path.is_file(cfg_filename):
+                raise Exception(
+                    f"Could not load saved parameters for experiment {cls.cfg_file_name_load} "
+                    f"(file {cfg_filename} not found). Check that you have the correct experiment name "
+                    f"and --train_dir is set correctly."
+                )
+
+            with open(cfg_filename, "rb") as json_file:
+                data = json_file.read()
+            if cache is not None:
+                cache_key = cache.key(cls, cfg_filename, data, overwrite)
+                cached = cache.get(cache_key)
+                if cached is not None:
+                    log.info("Loading existing experiment configuration from %s (cached)", cfg_filename)
+                    return cached
+            json_params = json.loads(data)
             log.warning("Loading existing experiment configuration from %s", cfg_filename)
 
         if json_params["overwrite_from_cmd"] and overwrite is not None:
             log.debug("Overwriting the following arguments: %s" % (overwrite))
+            schema = cls.get_schema()
+            report = MergeReport()
             for key, value in overwrite.items():
-                if key.split(".")[0] in [f.name for f in fields(cls)]:
+                if key in schema:
                     if value is not None:
-                        apply_overwrite(json_params, key, value)
+                        apply_overwrite(json_params, key, value, report=report)
                 else:
                     log.warning("Key %s for overwriting not found in %s fields" % (key, str(cls)))
-            log.info("Overwriting completed")
+            report.log("Overwriting completed")
 
         loaded_cfg: "BaseConfig" = cls.from_dict(json_params)
+        if cache_key is not None:
+            cache.put(cache_key, loaded_cfg) # type: ignore
         
         return loaded_cfg
 
+    @classmethod
+    @lru_cache(maxsize=None)
+    def get_validator(cls) -> Validator:
+        """Field constraints and `checks` of this class compiled into one checker, built once."""
+        return compile_validator(cls.get_decoder(), cls.checks)
+
     def validate(self):
-        pass
+        """Raise a ValidationError listing every violated constraint."""
+        violations = self.get_validator().check(self)
+        if violations:
+            raise ValidationError(violations)
+
+    @classmethod
+    def validate_batch(cls, columns: Dict[str, Sequence[Any]], base: Optional["BaseConfig"] = None) -> List[Violation]:
+        """
+        Check many configs given column-wise (dotted path -> one value per config) in one go.
+        Paths without a column are taken from `base`. Returns all violations with their row.
+        """
+        return cls.get_validator().check_batch(columns, base)
 
 
+class _GitField:
+    """
+    Class attribute for git_hash and git_repo_name (data descriptor, so it sees every
+    read). While the background lookup started in __post_init__ is pending, the instance
+    has no value for them, the first read waits for the lookup and stores both values.
+    Nothing but the marker attribute is kept on the instance, so copies and pickles
+    resolve the lookup in their own process when they are read.
+    """
 
-    
\ No newline at end of file
+    def __init__(self, name: str, default: str) -> None:
+        self.name = name
+        self.default = default
+
+    def __get__(self, obj: Optional[BaseConfig], owner: type) -> str:
+        if obj is None:
+            return self.default
+        values = obj.__dict__
+        if self.name not in values:
+            if not values.get(_GIT_PENDING_ATTR):
+                return self.default
+            git_hash, git_repo_name = get_git_commit_hash_future().result()
+            values.setdefault("git_hash", git_hash)
+            values.setdefault("git_repo_name", git_repo_name)
+            values.pop(_GIT_PENDING_ATTR, None)
+        return values[self.name]
+
+    def __set__(self, obj: BaseConfig, value: str) -> None:
+        obj.__dict__[self.name] = value
+
+
+# After @dataclass, the generated __init__ keeps its own copy of the defaults.
+for _name in ("git_hash", "git_repo_name"):
+    setattr(BaseConfig, _name, _GitField(_name, BaseConfig.__dataclass_fields__[_name].default))
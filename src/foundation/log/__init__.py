@@ -1,10 +1,71 @@
-from .log_setup import (
-    has_file_handler,
-    has_stream_handler,
-    add_file_handler,
-    add_stream_handler,
-    create_file_handler,
-    create_stream_handler,
-    create_formatter,
-    init_root_logger
-)
\ No newline at end of file
+TYPE_CHECKING = False  # see foundation._lazy
+
+from .._lazy import attach
+from .levels import INFOV_LEVEL # registers the INFOV level and Logger.infov
+
+# colorlog and the handler machinery are only imported once one of their names is used.
+__getattr__, __dir__, __all__ = attach(__name__, {
+    ".log_setup": [
+        "has_file_handler",
+        "has_stream_handler",
+        "add_file_handler",
+        "add_stream_handler",
+        "add_ring_buffer_handler",
+        "create_file_handler",
+        "create_stream_handler",
+        "create_formatter",
+        "init_root_logger",
+    ],
+    ".queue_logging": [
+        "AsyncQueueHandler",
+        "get_async_handler",
+        "flush_logging",
+        "shutdown_logging",
+        "BLOCK",
+        "DROP_OLDEST",
+        "DROP_NEW",
+    ],
+    ".aggregation": [
+        "LogCollector",
+        "WorkerLogHandler",
+        "init_log_collector",
+        "init_worker_logging",
+    ],
+    ".formatter": ["FastFormatter"],
+    ".rate_limit": ["RateLimitFilter"],
+    ".ring_buffer": ["RingBufferHandler"],
+    ".rotation": ["RotatingLogHandler", "log_segments"],
+})
+__all__.append("INFOV_LEVEL")
+
+if TYPE_CHECKING:
+    from .log_setup import (
+        has_file_handler,
+        has_stream_handler,
+        add_file_handler,
+        add_stream_handler,
+        add_ring_buffer_handler,
+        create_file_handler,
+        create_stream_handler,
+        create_formatter,
+        init_root_logger
+    )
+    from .queue_logging import (
+        AsyncQueueHandler,
+        get_async_handler,
+        flush_logging,
+        shutdown_logging,
+        BLOCK,
+        DROP_OLDEST,
+        DROP_NEW,
+    )
+    from .aggregation import (
+        LogCollector,
+        WorkerLogHandler,
+        init_log_collector,
+        init_worker_logging,
+    )
+    from .formatter import FastFormatter
+    from .rate_limit import RateLimitFilter
+    from .ring_buffer import RingBufferHandler
+    from .rotation import RotatingLogHandler, log_segments
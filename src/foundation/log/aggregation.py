@@ -0,0 +1,270 @@
+import json
+import logging
+import os
+import queue
+import selectors
+import shutil
+import socket
+import struct
+import tempfile
+import threading
+from logging.handlers import SocketHandler
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from .log_setup import create_formatter
+
+log = logging.getLogger(__name__)
+
+Address = Tuple[str, Optional[int]]  # (socket path, None) or (host, port)
+
+_HEADER = struct.Struct(">L")  # frame length prefix written by SocketHandler
+_STOP = None
+
+# The collector running in this process, its workers are switched over after fork.
+_active_collector: Optional["LogCollector"] = None
+
+
+class LogCollector:
+    """
+    Single writer for the logs of a process and all of its workers. Workers send records
+    over a local socket (see WorkerLogHandler), a receiver thread decodes them and one
+    writer thread appends them to `path` in batches. Records keep the pid of the worker
+    that created them. A worker dying mid-record only loses that record.
+
+    Records travel as JSON of their attributes with the message already formatted, never
+    as pickles, so nothing a peer sends is executed. The socket lives in a private
+    temporary directory (localhost TCP where AF_UNIX is missing).
+    """
+
+    def __init__(self, path: Path, level: int = logging.DEBUG, batch_size: int = 512) -> None:
+        self.path = path
+        self.level = level
+        self.batch_size = batch_size
+        self.formatter = create_formatter(colour=False)
+        self.dropped_bytes = 0
+        self.logger: Optional[logging.Logger] = None  # logger routed through this collector
+        self._records: "queue.Queue[Optional[logging.LogRecord]]" = queue.Queue()
+        self._stopping = threading.Event()
+        self._tmpdir: Optional[str] = None
+        self._server = self._listen()
+        self.address: Address = self._address()
+
+        self._file = open(path, "a", encoding="utf-8")
+        self._receiver = threading.Thread(target=self._receive, name="log-collector-receiver", daemon=True)
+        self._writer = threading.Thread(target=self._write, name="log-collector-writer", daemon=True)
+        self._receiver.start()
+        self._writer.start()
+
+    # setup
+    def _listen(self) -> socket.socket:
+        if hasattr(socket, "AF_UNIX"):
+            self._tmpdir = tempfile.mkdtemp(prefix="foundation-log-")
+            server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            server.bind(os.path.join(self._tmpdir, "collector.sock"))
+        else:
+            server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            server.bind(("127.0.0.1", 0))
+        server.listen(128)
+        server.setblocking(False)
+        return server
+
+    def _address(self) -> Address:
+        name = self._server.getsockname()
+        if isinstance(name, str):
+            return name, None
+        return name[0], name[1]
+
+    def handler(self) -> logging.Handler:
+        """Handler for records of this process, they skip the socket and go straight to the writer."""
+        return _LocalHandler(self, self.level)
+
+    # threads
+    def _receive(self) -> None:
+        selector = selectors.DefaultSelector()
+        selector.register(self._server, selectors.EVENT_READ, None)
+        try:
+            while not self._stopping.is_set():
+                for key, _ in selector.select(timeout=0.1):
+                    if key.data is None:
+                        conn, _ = self._server.accept()
+                        conn.setblocking(False)
+                        selector.register(conn, selectors.EVENT_READ, bytearray())
+                    else:
+                        self._read(selector, key.fileobj, key.data)  # type: ignore
+        finally:
+            # Workers that connected but were not accepted yet still have records queued.
+            while True:
+                try:
+                    conn, _ = self._server.accept()
+                except OSError:  # BlockingIOError once the backlog is empty
+                    break
+                selector.register(conn, selectors.EVENT_READ, bytearray())
+            for key in list(selector.get_map().values()):
+                if key.data is not None:
+                    # Drain what workers sent before the collector stopped.
+                    key.fileobj.setblocking(True)  # type: ignore
+                    key.fileobj.settimeout(0.1)  # type: ignore
+                    try:
+                        while self._read(selector, key.fileobj, key.data):  # type: ignore
+                            pass
+                    except OSError:
+                        self._disconnect(selector, key.fileobj, key.data)  # type: ignore
+            selector.close()
+
+    def _read(self, selector: selectors.BaseSelector, conn: socket.socket, buffer: bytearray) -> bool:
+        try:
+            chunk = conn.recv(65536)
+        except BlockingIOError:
+            return True
+        except (ConnectionResetError, socket.timeout):
+            chunk = b""
+        if not chunk:
+            self._disconnect(selector, conn, buffer)
+            return False
+
+        buffer += chunk
+        while len(buffer) >= _HEADER.size:
+            (size,) = _HEADER.unpack_from(buffer)
+            if len(buffer) < _HEADER.size + size:
+                break
+            payload = bytes(buffer[_HEADER.size:_HEADER.size + size])
+            del buffer[:_HEADER.size + size]
+            try:
+                self._records.put(_decode(payload))
+            except Exception as e:
+                log.warning("Dropping undecodable log record from worker: %s" % e)
+        return True
+
+    def _disconnect(self, selector: selectors.BaseSelector, conn: socket.socket, buffer: bytearray) -> None:
+        selector.unregister(conn)
+        conn.close()
+        if buffer:
+            self.dropped_bytes += len(buffer)
+            log.warning("Worker connection closed mid-record, dropped %d bytes" % len(buffer))
+
+    def _write(self) -> None:
+        while True:
+            record = self._records.get()
+            batch: List[logging.LogRecord] = []
+            stop = record is _STOP
+            if not stop:
+                batch.append(record)  # type: ignore
+            while not stop and len(batch) < self.batch_size:
+                try:
+                    record = self._records.get_nowait()
+                except queue.Empty:
+                    break
+                if record is _STOP:
+                    stop = True
+                else:
+                    batch.append(record)
+            if batch:
+                lines = []
+                for r in batch:
+                    try:
+                        if r.levelno >= self.level:
+                            lines.append(self.formatter.format(r) + "\n")
+                    except Exception as e:  # e.g. a peer sent a str lineno
+                        log.warning("Dropping unformattable log record: %s" % e)
+                self._file.write("".join(lines))
+                self._file.flush()
+            for _ in range(len(batch) + stop):
+                self._records.task_done()
+            if stop:
+                return
+
+    # lifecycle
+    def flush(self) -> None:
+        """Wait until every record received so far is written."""
+        self._records.join()
+
+    def close(self) -> None:
+        global _active_collector
+        if self._stopping.is_set():
+            return
+        self._stopping.set()
+        self._receiver.join()
+        self._server.close()
+        self._records.put(_STOP)
+        self._writer.join()
+        self._file.close()
+        if self._tmpdir is not None:
+            shutil.rmtree(self._tmpdir, ignore_errors=True)
+        if _active_collector is self:
+            _active_collector = None
+
+
+class _LocalHandler(logging.Handler):
+    def __init__(self, collector: LogCollector, level: int) -> None:
+        super().__init__(level)
+        self.collector = collector
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.collector._records.put(record)
+
+
+class WorkerLogHandler(SocketHandler):
+    """Sends records of a worker process to the LogCollector listening on `address`."""
+
+    def __init__(self, address: Address) -> None:
+        super().__init__(address[0], address[1])  # type: ignore
+
+    def makePickle(self, record: logging.LogRecord) -> bytes:
+        # Same frame as SocketHandler, but JSON instead of a pickle.
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        data = dict(record.__dict__)
+        data["msg"] = record.getMessage()
+        data["args"] = None
+        data["exc_info"] = None
+        data.pop("message", None)
+        payload = json.dumps(data, default=str).encode()
+        return _HEADER.pack(len(payload)) + payload
+
+
+def _decode(payload: bytes) -> logging.LogRecord:
+    data = json.loads(payload)
+    if not isinstance(data, dict):
+        raise ValueError(f"expected an object, got {type(data).__name__}")
+    # Only plain attributes, a key like "getMessage" must not shadow a LogRecord method.
+    return logging.makeLogRecord({k: v for k, v in data.items() if not hasattr(logging.LogRecord, k)})
+
+
+def init_log_collector(path: Path, level: int = logging.DEBUG, log: Optional[logging.Logger] = None) -> LogCollector:
+    """
+    Start a LogCollector writing to `path` and route `log` (default root) through it.
+    Processes forked afterwards automatically send their records to it instead of
+    appending to `path` themselves. Spawned workers call init_worker_logging(collector.address).
+    """
+    global _active_collector
+    collector = LogCollector(path, level)
+    collector.logger = log or logging.getLogger()
+    collector.logger.addHandler(collector.handler())
+    _active_collector = collector
+    return collector
+
+
+def init_worker_logging(address: Address, level: Optional[int] = None, log: Optional[logging.Logger] = None) -> None:
+    """Replace the collector handlers `log` (default root) inherited with a socket to the collector."""
+    log = log or logging.getLogger()
+    for handler in list(log.handlers):
+        if isinstance(handler, (_LocalHandler, WorkerLogHandler)):
+            log.removeHandler(handler)
+    log.addHandler(WorkerLogHandler(address))
+    if level is not None:
+        log.setLevel(level)
+
+
+def _after_fork_in_child() -> None:
+    global _active_collector
+    collector = _active_collector
+    if collector is None:
+        return
+    # The collector threads did not survive the fork, the parent keeps owning the socket.
+    _active_collector = None
+    init_worker_logging(collector.address, log=collector.logger)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
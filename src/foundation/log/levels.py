@@ -0,0 +1,12 @@
+import logging
+
+
+# Add custom log level
+INFOV_LEVEL = 15  # between DEBUG (10) and INFO (20)
+logging.addLevelName(INFOV_LEVEL, "INFOV")
+
+def infov(self, message, *args, **kwargs) -> None:
+    if self.isEnabledFor(INFOV_LEVEL):
+        self._log(INFOV_LEVEL, message, args, **kwargs)
+
+logging.Logger.infov = infov # type: ignore
@@ -1,87 +1,137 @@
 import logging
 from colorlog import ColoredFormatter
 from pathlib import Path
-from typing import Union, Optional
+from typing import Callable, Union, Optional, List
 
+from .queue_logging import AsyncQueueHandler, get_async_handler, BLOCK
+from .formatter import FastFormatter, DEFAULT_FORMAT, DEFAULT_LOG_COLORS
+from .levels import INFOV_LEVEL
+from .rate_limit import RateLimitFilter
+from .ring_buffer import RingBufferHandler
+from .rotation import RotatingLogHandler
 
 
-
-# Add custom log level
-INFOV_LEVEL = 15  # between DEBUG (10) and INFO (20)
-logging.addLevelName(INFOV_LEVEL, "INFOV")
-
-def infov(self, message, *args, **kwargs) -> None:
-    if self.isEnabledFor(INFOV_LEVEL):
-        self._log(INFOV_LEVEL, message, args, **kwargs)
-
-logging.Logger.infov = infov # type: ignore
-
-
-def create_formatter(colour: bool, fmt: Optional[str] = None) -> Union[ColoredFormatter,logging.Formatter]:
+def create_formatter(colour: bool, fmt: Optional[str] = None, fast: bool = False) -> Union[ColoredFormatter,logging.Formatter]:
+    """`fast` returns the precompiled FastFormatter, which produces the same output."""
     if fmt is None:
-        fmt = "[{asctime}][{process:05d}][{module:.<10.10}][{lineno:04d}] {message}"
+        fmt = DEFAULT_FORMAT
         # fmt = "[{asctime}][{process:05d}][{module:.<5.5}][{funcName:.<15.15}][{lineno:04d}] {message}"
+    if fast:
+        return FastFormatter(fmt, colour=colour)
     if colour:
         return ColoredFormatter(
             "{log_color}" + fmt,
             datefmt=None,
             reset=True,
-            log_colors={
-                "DEBUG": "cyan",
-                "INFO": "white,bold",
-                "INFOV": "cyan,bold",
-                "WARNING": "yellow",
-                "ERROR": "red,bold",
-                "CRITICAL": "red,bg_white",
-            },
+            log_colors=DEFAULT_LOG_COLORS,
             secondary_log_colors={},
             style="{",
         )
     else:
-        return logging.Formatter(fmt=fmt, datefmt=None, style="%")
-
-def create_file_handler(path: Path, level) -> logging.FileHandler:
-    file_handler = logging.FileHandler(path)
+        return logging.Formatter(fmt=fmt, datefmt=None, style="{")
+
+def create_file_handler(
+    path: Path,
+    level,
+    fast: bool = False,
+    max_bytes: Optional[int] = None,
+    interval: Optional[float] = None,
+    backup_count: Optional[int] = None,
+) -> logging.FileHandler:
+    """With `max_bytes` or `interval` the file is rotated, see RotatingLogHandler."""
+    if max_bytes is not None or interval is not None:
+        file_handler: logging.FileHandler = RotatingLogHandler(path, max_bytes=max_bytes, interval=interval, backup_count=backup_count)
+    else:
+        file_handler = logging.FileHandler(path)
     file_handler.setLevel(level)
-    file_handler.setFormatter(create_formatter(colour = False))
+    file_handler.setFormatter(create_formatter(colour = False, fast = fast))
     return file_handler
 
-def create_stream_handler() -> logging.StreamHandler:
+def create_stream_handler(fast: bool = False) -> logging.StreamHandler:
     stream_handler = logging.StreamHandler()
-    stream_handler.setFormatter(create_formatter(colour = True))
+    stream_handler.setFormatter(create_formatter(colour = True, fast = fast))
     return stream_handler
 
 
-def add_file_handler(log:logging.Logger, path: Path):
+def add_file_handler(
+    log:logging.Logger,
+    path: Path,
+    rate_limit: Optional[RateLimitFilter] = None,
+    max_bytes: Optional[int] = None,
+    interval: Optional[float] = None,
+    backup_count: Optional[int] = None,
+):
+    """
+    `rate_limit` filters what reaches the new handler, use one RateLimitFilter per handler.
+    `max_bytes`, `interval` and `backup_count` rotate the file (see RotatingLogHandler).
+    """
     if has_file_handler(log):
         log.warning("A File Handler already exists! Weird! Adding anyways")
-    log.addHandler(create_file_handler(path, log.getEffectiveLevel()))
+    handler = create_file_handler(path, log.getEffectiveLevel(), max_bytes=max_bytes, interval=interval, backup_count=backup_count)
+    _attach(log, _limit(handler, rate_limit))
 
-def add_stream_handler(log:logging.Logger, path: Path):
+def add_stream_handler(log:logging.Logger, path: Path, rate_limit: Optional[RateLimitFilter] = None):
     if has_stream_handler(log):
         log.warning("A Stream Handler already exists! Weird! Adding anyways")
-    log.addHandler(create_stream_handler())
-    
+    _attach(log, _limit(create_stream_handler(), rate_limit))
+
+def add_ring_buffer_handler(log: logging.Logger, path: Union[Path, Callable[[], Path]], capacity: int = 10000, trigger_level: int = logging.ERROR) -> RingBufferHandler:
+    """
+    Buffer the last `capacity` records of `log` and write them to `path` on errors, unhandled
+    exceptions and exit (see RingBufferHandler). Only records passing the level of `log` are
+    buffered: set it to DEBUG and give the other handlers their own level.
+    """
+    handler = RingBufferHandler(path, capacity=capacity, trigger_level=trigger_level)
+    _attach(log, handler)
+    return handler
+
+def _limit(handler: logging.Handler, rate_limit: Optional[RateLimitFilter]) -> logging.Handler:
+    if rate_limit is not None:
+        rate_limit.attach(handler)
+    return handler
+
+def _attach(log: logging.Logger, handler: logging.Handler):
+    """Attach behind the background writer if `log` logs asynchronously, else directly."""
+    async_handler = get_async_handler(log)
+    if async_handler is not None:
+        async_handler.add_handler(handler)
+    else:
+        log.addHandler(handler)
+
+def _all_handlers(log: logging.Logger) -> List[logging.Handler]:
+    handlers = list(log.handlers)
+    async_handler = get_async_handler(log)
+    if async_handler is not None:
+        handlers += async_handler.handlers
+    return handlers
 
 
 def has_file_handler(log: logging.Logger) -> bool:
-    for handler in log.handlers:
+    for handler in _all_handlers(log):
         if isinstance(handler, logging.FileHandler):
             return True
     return False
 
 def has_stream_handler(log: logging.Logger) -> bool:
-    for handler in log.handlers:
+    for handler in _all_handlers(log):
         if isinstance(handler, logging.StreamHandler):
             return True
     return False
 
 
-def init_root_logger(default_level = logging.DEBUG):
+def init_root_logger(default_level = logging.DEBUG, async_mode: bool = False, maxsize: int = 10000, overflow: str = BLOCK):
+    """
+    With `async_mode` log calls only enqueue records, a background thread formats and writes
+    them. `maxsize` bounds the queue and `overflow` picks what happens when it is full
+    (see AsyncQueueHandler). Handlers added later with add_file_handler/add_stream_handler
+    are attached to the background thread as well. Calling it again reuses the running
+    AsyncQueueHandler (with its queue size), a second one would emit every record twice.
+    """
     logger = logging.getLogger()
     logger.setLevel(default_level)
+    if async_mode and get_async_handler(logger) is None:
+        logger.addHandler(AsyncQueueHandler(maxsize=maxsize, overflow=overflow))
     # Create and configure the stream (console) handler
     stream_handler = logging.StreamHandler()
     stream_handler.setFormatter(create_formatter(colour = True))
-    logger.addHandler(stream_handler)
-
+    _attach(logger, stream_handler)
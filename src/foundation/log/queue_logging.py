@@ -0,0 +1,120 @@
+import atexit
+import logging
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from typing import List, Optional
+
+
+BLOCK = "block"
+DROP_OLDEST = "drop_oldest"
+DROP_NEW = "drop_new"
+OVERFLOW_POLICIES = (BLOCK, DROP_OLDEST, DROP_NEW)
+
+
+class _BlockingQueueListener(QueueListener):
+    def enqueue_sentinel(self) -> None:
+        # The default put_nowait fails on a full bounded queue.
+        self.queue.put(self._sentinel)  # type: ignore
+
+
+class AsyncQueueHandler(QueueHandler):
+    """
+    Only enqueues records, a background QueueListener formats and writes them with the
+    handlers added through `add_handler`. A full queue is handled according to `overflow`:
+    `block` waits for space, `drop_oldest` discards the oldest queued record and `drop_new`
+    discards the incoming one. Dropped records are counted in `dropped`.
+
+    Records are not formatted before they are queued, arguments mutated after the log
+    call are formatted with their new value.
+    """
+
+    def __init__(self, maxsize: int = 10000, overflow: str = BLOCK) -> None:
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy {overflow}, expected one of {OVERFLOW_POLICIES}")
+        super().__init__(queue.Queue(maxsize))
+        self.overflow = overflow
+        self.dropped = 0
+        self._drop_lock = threading.Lock()
+        self.listener = _BlockingQueueListener(self.queue, respect_handler_level=True)
+        self.listener.start()
+        atexit.register(self.close)
+
+    @property
+    def handlers(self) -> List[logging.Handler]:
+        return list(self.listener.handlers)
+
+    def add_handler(self, handler: logging.Handler) -> None:
+        # The listener thread reads `handlers` for every record, so swapping the tuple is safe.
+        self.listener.handlers = self.listener.handlers + (handler,)
+
+    def remove_handler(self, handler: logging.Handler) -> None:
+        self.listener.handlers = tuple(h for h in self.listener.handlers if h is not handler)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        q: queue.Queue = self.queue  # type: ignore
+        if self.overflow == BLOCK:
+            q.put(record)
+            return
+        try:
+            q.put_nowait(record)
+            return
+        except queue.Full:
+            pass
+        with self._drop_lock:
+            self.dropped += 1
+            if self.overflow == DROP_NEW:
+                return
+            while True:
+                try:
+                    q.get_nowait()
+                    q.task_done()
+                except queue.Empty:
+                    pass
+                try:
+                    q.put_nowait(record)
+                    return
+                except queue.Full:
+                    continue
+
+    def flush(self) -> None:
+        """Wait until every queued record has been handled, then flush the handlers."""
+        if self.listener._thread is not None:  # type: ignore
+            self.queue.join()  # type: ignore
+        for handler in self.listener.handlers:
+            handler.flush()
+
+    def close(self) -> None:
+        """Drain the queue, stop the listener thread and close all handlers. Idempotent."""
+        if self.listener._thread is not None:  # type: ignore
+            self.listener.stop()
+            for handler in self.listener.handlers:
+                handler.close()
+        atexit.unregister(self.close)
+        super().close()
+
+
+def get_async_handler(log: logging.Logger) -> Optional[AsyncQueueHandler]:
+    for handler in log.handlers:
+        if isinstance(handler, AsyncQueueHandler):
+            return handler
+    return None
+
+
+def flush_logging(log: Optional[logging.Logger] = None) -> None:
+    """Block until all records queued on `log` (default root) are written."""
+    handler = get_async_handler(log or logging.getLogger())
+    if handler is not None:
+        handler.flush()
+
+
+def shutdown_logging(log: Optional[logging.Logger] = None) -> None:
+    """Flush and stop the background writer of `log` (default root) and detach it."""
+    log = log or logging.getLogger()
+    handler = get_async_handler(log)
+    if handler is not None:
+        log.removeHandler(handler)
+        handler.close()
@@ -0,0 +1,133 @@
+import logging
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from .levels import INFOV_LEVEL
+
+# (records per second, burst) per level, levels not listed are never limited.
+DEFAULT_RATES: Dict[int, Tuple[float, float]] = {
+    logging.DEBUG: (20.0, 100.0),
+    INFOV_LEVEL: (20.0, 100.0),
+    logging.INFO: (20.0, 100.0),
+    logging.WARNING: (2.0, 20.0),
+}
+
+_SUMMARY_ATTR = "rate_limit_summary"
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Handler filter against log floods from hot loops. Each call site (module + lineno)
+    gets a token bucket with the rate of its level, records beyond it are dropped.
+    Consecutive identical records (same call site, message and arguments) are collapsed.
+    Both are reported with summary records ("repeated N times", "N records suppressed")
+    at most every `summary_interval` seconds and when the flood ends.
+
+    Only fields the record already has are compared, messages are never formatted.
+    Attach with `attach(handler)` (or the `rate_limit` argument of add_file_handler and
+    add_stream_handler), summaries are written through that handler.
+    """
+
+    def __init__(self, rates: Optional[Dict[int, Tuple[float, float]]] = None, summary_interval: float = 5.0) -> None:
+        super().__init__()
+        self.rates = dict(DEFAULT_RATES if rates is None else rates)
+        self.summary_interval = summary_interval
+        self.handler: Optional[logging.Handler] = None
+        self._lock = threading.Lock()
+        self._buckets: Dict[Tuple[str, int], List[float]] = {}  # call site -> [tokens, last refill]
+        self._suppressed: Dict[Tuple[str, int], List] = {}  # call site -> [count, since, last record]
+        self._last: Optional[logging.LogRecord] = None
+        self._repeats = 0
+        self._repeats_since = 0.0
+
+    def attach(self, handler: logging.Handler) -> logging.Handler:
+        self.handler = handler
+        handler.addFilter(self)
+        return handler
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if getattr(record, _SUMMARY_ATTR, False):
+            return True
+        now = record.created
+        summaries: List[logging.LogRecord] = []
+        with self._lock:
+            allowed = self._check(record, now, summaries)
+        for summary in summaries:
+            self._emit(summary)
+        return allowed
+
+    def flush(self) -> None:
+        """Write the summaries of everything suppressed so far."""
+        summaries: List[logging.LogRecord] = []
+        with self._lock:
+            self._end_repeats(summaries)
+            for site in list(self._suppressed):
+                self._end_suppressed(site, summaries)
+        for summary in summaries:
+            self._emit(summary)
+
+    def _check(self, record: logging.LogRecord, now: float, summaries: List[logging.LogRecord]) -> bool:
+        last = self._last
+        if last is not None and _same(last, record):
+            self._repeats += 1
+            if now - self._repeats_since >= self.summary_interval:
+                self._end_repeats(summaries)
+                self._repeats_since = now
+            return False
+        self._end_repeats(summaries)
+        self._repeats_since = now
+
+        site = (record.module, record.lineno)
+        rate = self.rates.get(record.levelno)
+        if rate is not None:
+            bucket = self._buckets.get(site)
+            if bucket is None:
+                bucket = self._buckets[site] = [rate[1], now]
+            bucket[0] = min(rate[1], bucket[0] + (now - bucket[1]) * rate[0])
+            bucket[1] = now
+            if bucket[0] < 1.0:
+                suppressed = self._suppressed.get(site)
+                if suppressed is None:
+                    self._suppressed[site] = [1, now, record]
+                else:
+                    suppressed[0] += 1
+                    suppressed[2] = record
+                    if now - suppressed[1] >= self.summary_interval:
+                        self._end_suppressed(site, summaries)
+                return False
+            bucket[0] -= 1.0
+
+        if site in self._suppressed:
+            self._end_suppressed(site, summaries)
+        self._last = record
+        return True
+
+    def _end_repeats(self, summaries: List[logging.LogRecord]) -> None:
+        if self._repeats and self._last is not None:
+            summaries.append(_summary(self._last, "Last message repeated %d times", self._repeats))
+        self._repeats = 0
+
+    def _end_suppressed(self, site: Tuple[str, int], summaries: List[logging.LogRecord]) -> None:
+        count, _, record = self._suppressed.pop(site)
+        summaries.append(_summary(record, "%d records from this line suppressed by the rate limit", count))
+
+    def _emit(self, summary: logging.LogRecord) -> None:
+        if self.handler is not None:
+            self.handler.handle(summary)
+
+
+def _same(a: logging.LogRecord, b: logging.LogRecord) -> bool:
+    if a.lineno != b.lineno or a.msg is not b.msg and a.msg != b.msg or a.module != b.module:
+        return False
+    try:
+        return bool(a.args == b.args)
+    except Exception:  # arguments with odd __eq__
+        return False
+
+
+def _summary(record: logging.LogRecord, msg: str, count: int) -> logging.LogRecord:
+    summary = logging.LogRecord(
+        record.name, record.levelno, record.pathname, record.lineno, msg, (count,), None, record.funcName
+    )
+    setattr(summary, _SUMMARY_ATTR, True)
+    return summary
@@ -0,0 +1,177 @@
+import atexit
+import logging
+import sys
+import threading
+import weakref
+from pathlib import Path
+from typing import Callable, List, Optional, Union
+
+from .formatter import FastFormatter
+
+# Live handlers, walked by the process-wide exception and exit hooks installed once below.
+_handlers: "weakref.WeakSet[RingBufferHandler]" = weakref.WeakSet()
+_hooks_lock = threading.Lock()
+_previous_hooks: Optional[tuple] = None  # (sys.excepthook, threading.excepthook) before ours
+
+
+class RingBufferHandler(logging.Handler):
+    """
+    Keeps the last `capacity` records in memory, unformatted, and only writes them to
+    `path` when a record at or above `trigger_level` arrives, on an unhandled exception
+    and at exit. Until then a record costs one list assignment, so DEBUG context before a
+    crash is available at about the cost of logging at INFO.
+
+    `path` may be a callable (e.g. `cfg.get_logfile_path`), it is only called for the
+    first dump. Later dumps are appended to the same file. Like with the async handler,
+    arguments mutated after the log call are formatted with their new value.
+    """
+
+    def __init__(
+        self,
+        path: Union[Path, Callable[[], Path]],
+        capacity: int = 10000,
+        trigger_level: int = logging.ERROR,
+        dump_at_exit: bool = True,
+        level: int = logging.DEBUG,
+    ) -> None:
+        if capacity < 1:
+            raise ValueError(f"capacity must be at least 1, got {capacity}")
+        super().__init__(level)
+        self.setFormatter(FastFormatter())
+        self.capacity = capacity
+        self.trigger_level = trigger_level
+        self.dumps = 0
+        self.dump_at_exit = dump_at_exit
+        self._path = path
+        self._buffer: List[Optional[logging.LogRecord]] = [None] * capacity
+        self._next = 0
+        self._count = 0
+        self._write_lock = threading.Lock()  # keeps dumps in order, taken after self.lock
+        _install_hooks()
+        _handlers.add(self)
+
+    @property
+    def path(self) -> Optional[Path]:
+        """The dump file, None until it is known."""
+        return None if callable(self._path) else Path(self._path)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        # Like Handler.handle, but a triggered dump is written after the lock is released,
+        # so other threads keep logging into the buffer meanwhile.
+        rv = self.filter(record)
+        if isinstance(rv, logging.LogRecord):
+            record = rv
+        if rv:
+            with self.lock:  # type: ignore
+                records = self._store(record)
+                if records:
+                    self._write_lock.acquire()
+            if records:
+                self._write(records)
+        return bool(rv)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        records = self._store(record)
+        if records:
+            self._write_lock.acquire()
+            self._write(records)
+
+    def records(self) -> List[logging.LogRecord]:
+        """The buffered records, oldest first."""
+        with self.lock:  # type: ignore
+            return self._records()
+
+    def dump(self) -> None:
+        """Write and drop the buffered records."""
+        with self.lock:  # type: ignore
+            records = self._take()
+            if records:
+                self._write_lock.acquire()
+        if records:
+            self._write(records)
+
+    def flush(self) -> None:
+        # Flushing is what the buffer avoids, records are written by dump() only.
+        pass
+
+    def close(self) -> None:
+        if self.dump_at_exit:
+            self.dump()
+            self.dump_at_exit = False
+        _handlers.discard(self)
+        super().close()
+
+    def _store(self, record: logging.LogRecord) -> List[logging.LogRecord]:
+        """Buffer `record`, returns the records to write if it triggers a dump."""
+        self._buffer[self._next] = record
+        self._next = (self._next + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+        return self._take() if record.levelno >= self.trigger_level else []
+
+    def _records(self) -> List[logging.LogRecord]:
+        start = (self._next - self._count) % self.capacity
+        return [self._buffer[(start + i) % self.capacity] for i in range(self._count)]  # type: ignore
+
+    def _take(self) -> List[logging.LogRecord]:
+        records = self._records()
+        if records:
+            self._buffer = [None] * self.capacity  # drop the references, e.g. to tracebacks
+            self._next = self._count = 0
+        return records
+
+    def _write(self, records: List[logging.LogRecord]) -> None:
+        """Format and append `records`, called with _write_lock held, releases it."""
+        try:
+            if callable(self._path):
+                self._path = self._path()
+            lines = [self.format(record) for record in records]
+            with open(self._path, "a", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+            self.dumps += 1
+        except Exception:
+            self.handleError(records[-1])
+        finally:
+            self._write_lock.release()
+
+
+def _install_hooks() -> None:
+    """Route unhandled exceptions (main and other threads) and exit through the live handlers, once."""
+    global _previous_hooks
+    with _hooks_lock:
+        if _previous_hooks is not None:
+            return
+        _previous_hooks = (sys.excepthook, threading.excepthook)
+        sys.excepthook = _excepthook
+        threading.excepthook = _thread_excepthook
+        atexit.register(_dump_at_exit)
+
+
+def _excepthook(exc_type, exc_value, exc_traceback) -> None:
+    _handle_exception(exc_type, exc_value, exc_traceback, "Unhandled exception")
+    _previous_hooks[0](exc_type, exc_value, exc_traceback)  # type: ignore
+
+
+def _thread_excepthook(args) -> None:
+    if args.exc_type is not SystemExit:
+        name = args.thread.name if args.thread is not None else "unknown"
+        _handle_exception(args.exc_type, args.exc_value, args.exc_traceback, f"Unhandled exception in thread {name}")
+    _previous_hooks[1](args)  # type: ignore
+
+
+def _handle_exception(exc_type, exc_value, exc_traceback, msg: str) -> None:
+    record = logging.LogRecord(
+        "foundation.log", logging.CRITICAL, __file__, 0, msg, (), (exc_type, exc_value, exc_traceback)
+    )
+    for handler in list(_handlers):
+        handler.handle(record)
+        handler.dump()
+
+
+def _dump_at_exit() -> None:
+    for handler in list(_handlers):
+        if handler.dump_at_exit:
+            handler.dump()
@@ -0,0 +1,235 @@
+import gzip
+import json
+import logging
+import os
+import re
+import shutil
+import sys
+import threading
+import traceback
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Deque, List, Optional, Set, Tuple
+
+INDEX_SUFFIX = ".index.jsonl"
+
+
+class RotatingLogHandler(logging.FileHandler):
+    """
+    File handler that closes the current segment once it reaches `max_bytes` or when a
+    wall-clock `interval` (seconds, aligned to multiples of it since the epoch, so 3600
+    rotates on the hour in UTC) is over. `log_x.log` is always the active file, closed
+    segments become `log_x.0001.log`, `log_x.0002.log`, ... next to it.
+
+    Closed segments are gzipped in a background thread and only the newest
+    `backup_count` are kept. Every closed segment gets a line with its time range in
+    `log_x.index.jsonl`, `log_segments` uses it to find the files covering a time range,
+    entries of segments removed by retention are dropped again. A non-empty active file
+    left by an earlier run continues as the current segment, its time range starts where
+    the last indexed segment ended (the file's mtime if there is none). The size is
+    counted in characters written, for non-ASCII output it is approximate.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        max_bytes: Optional[int] = None,
+        interval: Optional[float] = None,
+        backup_count: Optional[int] = None,
+        compress: bool = True,
+        encoding: Optional[str] = "utf-8",
+    ) -> None:
+        if max_bytes is not None and max_bytes <= 0:
+            raise ValueError(f"max_bytes must be positive, got {max_bytes}")
+        if interval is not None and interval <= 0:
+            raise ValueError(f"interval must be positive, got {interval}")
+        super().__init__(path, mode="a", encoding=encoding)
+        self.path = Path(self.baseFilename)
+        self.max_bytes = max_bytes
+        self.interval = interval
+        self.backup_count = backup_count
+        self.compress = compress
+        self.index_path = _index_path(self.path)
+        self._bytes = os.path.getsize(self.path)
+        self._start: Optional[float] = None  # time of the first and last record of the segment
+        self._end: Optional[float] = None
+        self._rollover_at: Optional[float] = None
+        self._index_lock = threading.Lock()  # appends on rollover, compaction by the worker
+        if self._bytes:
+            self._end = os.path.getmtime(self.path)
+            entries = _read_index(self.index_path)
+            self._start = min(entries[-1]["end"], self._end) if entries else self._end
+            if interval is not None:
+                self._rollover_at = _next_boundary(self._end, interval)
+        existing = _existing_segments(self.path)
+        self._number = existing[-1][0] if existing else 0
+        self._segments: Deque[Path] = deque(p for _, p in existing)  # only touched by the worker
+        self._worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="log-rotation")
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            if self.interval is not None:
+                if self._rollover_at is None:
+                    self._rollover_at = _next_boundary(record.created, self.interval)
+                elif record.created >= self._rollover_at:
+                    self.rollover()
+                    self._rollover_at = _next_boundary(record.created, self.interval)
+            msg = self.format(record) + self.terminator
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(msg)
+            self.flush()
+            self._bytes += len(msg)
+            if self._start is None:
+                self._start = record.created
+            self._end = record.created
+            if self.max_bytes is not None and self._bytes >= self.max_bytes:
+                self.rollover()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def rollover(self) -> None:
+        """Close the active file as a new segment and start an empty one."""
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None  # type: ignore
+        if self._bytes == 0:
+            return
+        self._number += 1
+        segment = self.path.with_name(f"{self.path.stem}.{self._number:04d}{self.path.suffix}")
+        os.replace(self.path, segment)
+        final = segment.with_name(segment.name + ".gz") if self.compress else segment
+        entry = {"file": final.name, "start": self._start, "end": self._end, "bytes": self._bytes}
+        with self._index_lock, open(self.index_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+        self._bytes = 0
+        self._start = self._end = None
+        self.stream = self._open()
+        self._worker.submit(self._finish, segment)
+
+    def wait(self) -> None:
+        """Block until closed segments are compressed and old ones removed."""
+        self._worker.submit(lambda: None).result()
+
+    def close(self) -> None:
+        super().close()
+        self._worker.shutdown(wait=True)
+
+    def _finish(self, segment: Path) -> None:
+        if self.compress:
+            try:
+                segment = _compress(segment)
+            except Exception:
+                self._report_error(f"Compressing {segment} failed, it is kept uncompressed")
+        self._segments.append(segment)
+        try:
+            removed = set()
+            while self.backup_count is not None and len(self._segments) > self.backup_count:
+                old = self._segments.popleft()
+                if old.exists():
+                    os.remove(old)
+                removed.update((old.name, old.name + ".gz"))  # leftovers may predate compression
+            if removed:
+                self._compact_index(removed)
+        except Exception:
+            self._report_error(f"Removing old segments of {self.path} failed")
+
+    def _report_error(self, msg: str) -> None:
+        """
+        Like Handler.handleError for the worker, which has no record to pass: prints the
+        current exception if logging.raiseExceptions is set. Logging it could rotate again.
+        """
+        if logging.raiseExceptions and sys.stderr:
+            sys.stderr.write(f"--- Log rotation error: {msg}\n")
+            traceback.print_exc(file=sys.stderr)
+
+    def _compact_index(self, removed: Set[str]) -> None:
+        """Rewrite the index without the entries of the `removed` file names."""
+        with self._index_lock:
+            entries = [e for e in _read_index(self.index_path) if e["file"] not in removed]
+            tmp = self.index_path.with_name(self.index_path.name + ".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.writelines(json.dumps(entry) + "\n" for entry in entries)
+            os.replace(tmp, self.index_path)
+
+
+def log_segments(path: Path, start: Optional[float] = None, end: Optional[float] = None) -> List[Path]:
+    """
+    Files of a rotated log with records between `start` and `end` (`record.created`
+    timestamps, open ends if None), oldest first, the active file last. Segments
+    removed by retention are skipped, segments still being compressed are returned
+    uncompressed.
+    """
+    path = Path(path)
+    found = []
+    last_end = None
+    for entry in _read_index(_index_path(path)):
+        last_end = entry["end"]
+        if (start is not None and entry["end"] < start) or (end is not None and entry["start"] > end):
+            continue
+        segment = _segment_file(path.with_name(entry["file"]))
+        if segment is not None:
+            found.append(segment)
+    if path.exists() and (end is None or last_end is None or end >= last_end):
+        found.append(path)
+    return found
+
+
+def _compress(segment: Path) -> Path:
+    """Gzip `segment` next to it and remove it, returns the .gz path."""
+    compressed = segment.with_name(segment.name + ".gz")
+    tmp = compressed.with_name(compressed.name + ".tmp")
+    try:
+        with open(segment, "rb") as src, gzip.open(tmp, "wb") as dst:
+            shutil.copyfileobj(src, dst, 1 << 20)
+        os.replace(tmp, compressed)
+    except BaseException:
+        if tmp.exists():
+            os.remove(tmp)
+        raise
+    os.remove(segment)
+    return compressed
+
+
+def _index_path(path: Path) -> Path:
+    return path.with_name(path.stem + INDEX_SUFFIX)
+
+
+def _read_index(index_path: Path) -> List[dict]:
+    try:
+        with open(index_path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+    except FileNotFoundError:
+        return []
+
+
+def _segment_file(segment: Path) -> Optional[Path]:
+    """The indexed file of a segment, or its uncompressed file while it is still being compressed."""
+    if segment.suffix != ".gz":
+        return segment if segment.exists() else None
+    plain = segment.with_suffix("")
+    # The worker writes the .gz before it removes the plain file. If both checks miss,
+    # compression finished in between, so the second round finds the .gz.
+    for _ in range(2):
+        if segment.exists():
+            return segment
+        if plain.exists():
+            return plain
+    return None
+
+
+def _next_boundary(now: float, interval: float) -> float:
+    return (now // interval + 1) * interval
+
+
+def _existing_segments(path: Path) -> List[Tuple[int, Path]]:
+    pattern = re.compile(re.escape(path.stem) + r"\.(\d+)" + re.escape(path.suffix) + r"(\.gz)?$")
+    segments = []
+    for candidate in path.parent.glob(f"{path.stem}.*"):
+        match = pattern.match(candidate.name)
+        if match:
+            segments.append((int(match.group(1)), candidate))
+    return sorted(segments)
@@ -0,0 +1,173 @@
+import hashlib
+import json
+import logging
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type, TypeVar, Union
+
+from .config import BaseConfig
+from .utils.filesystem import ensure_parents_exist
+
+log = logging.getLogger(__name__)
+
+TConfig = TypeVar("TConfig", bound="BaseConfig")
+ConfigKey = Union[int, str]  # row id or content hash
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS configs (
+    id      INTEGER PRIMARY KEY,
+    hash    TEXT NOT NULL UNIQUE,
+    class   TEXT NOT NULL,
+    data    TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS fields (
+    config_id   INTEGER NOT NULL REFERENCES configs(id),
+    path        TEXT NOT NULL,
+    value
+);
+CREATE INDEX IF NOT EXISTS fields_path_value ON fields (path, value);
+"""
+
+
+class ConfigStore:
+    """
+    Stores many configs in one sqlite database instead of one JSON file per run.
+    Configs are deduplicated by their class and full fingerprint and every scalar field
+    (`nested.test_value_int`) is indexed, so queries never touch the stored JSON.
+    """
+
+    def __init__(self, path: Union[Path, str], indexed_paths: Optional[Iterable[str]] = None) -> None:
+        """`indexed_paths` restricts the field index to these paths, by default all scalars are indexed."""
+        if str(path) != ":memory:":
+            ensure_parents_exist(Path(path))
+        self.path = path
+        self.indexed_paths = set(indexed_paths) if indexed_paths is not None else None
+        self._conn = sqlite3.connect(str(path))
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def __enter__(self) -> "ConfigStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM configs").fetchone()[0]
+
+    def __contains__(self, key: ConfigKey) -> bool:
+        return self._row(key) is not None
+
+    # writing
+    def put(self, cfg: BaseConfig) -> int:
+        """Insert `cfg` and return its id. An identical config already in the store keeps its id."""
+        return self.put_many([cfg])[0]
+
+    def put_many(self, cfgs: Iterable[BaseConfig]) -> List[int]:
+        """Insert all configs in a single transaction, returns their ids in order."""
+        ids = []
+        with self._conn:
+            for cfg in cfgs:
+                digest, data = self.encode(cfg)
+                cursor = self._conn.execute(
+                    "INSERT OR IGNORE INTO configs (hash, class, data) VALUES (?, ?, ?)",
+                    (digest, _class_name(type(cfg)), data),
+                )
+                if cursor.rowcount:
+                    config_id = cursor.lastrowid
+                    self._conn.executemany(
+                        "INSERT INTO fields (config_id, path, value) VALUES (?, ?, ?)",
+                        ((config_id, p, v) for p, v in self._index_rows(json.loads(data))),
+                    )
+                else:
+                    config_id = self._conn.execute("SELECT id FROM configs WHERE hash = ?", (digest,)).fetchone()[0]
+                ids.append(config_id)
+        log.debug("Stored %d configs in %s" % (len(ids), self.path))
+        return ids
+
+    @staticmethod
+    def encode(cfg: BaseConfig) -> Tuple[str, str]:
+        """
+        Content hash of `cfg` and its compact JSON. The hash covers the class and the full
+        fingerprint (nothing excluded), configs of different classes with equal fields
+        are different rows.
+        """
+        key = f"{_class_name(type(cfg))}:{cfg.fingerprint(exclude=())}"
+        return hashlib.sha256(key.encode()).hexdigest(), cfg.serializer(compact=True).dumps(cfg)
+
+    # reading
+    def get_dict(self, key: ConfigKey) -> Dict[str, Any]:
+        row = self._row(key)
+        if row is None:
+            raise KeyError(f"No config with {'id' if isinstance(key, int) else 'hash'} {key} in {self.path}")
+        return json.loads(row[1])
+
+    def get(self, key: ConfigKey, config_class: Type[TConfig]) -> TConfig:
+        return config_class.from_dict(self.get_dict(key))
+
+    def get_hash(self, config_id: int) -> str:
+        row = self._conn.execute("SELECT hash FROM configs WHERE id = ?", (config_id,)).fetchone()
+        if row is None:
+            raise KeyError(f"No config with id {config_id} in {self.path}")
+        return row[0]
+
+    def query(
+        self,
+        equals: Optional[Dict[str, Any]] = None,
+        ranges: Optional[Dict[str, Tuple[Any, Any]]] = None,
+    ) -> List[int]:
+        """
+        Ids of all configs matching every condition. `equals` maps dotted paths to values,
+        `ranges` maps them to inclusive (low, high) bounds where None leaves a side open.
+        """
+        selects = []
+        params: List[Any] = []
+        for path, value in (equals or {}).items():
+            self._check_indexed(path)
+            # `= NULL` never matches, IS compares NULL like any other value.
+            op = "IS" if value is None else "="
+            selects.append(f"SELECT config_id FROM fields WHERE path = ? AND value {op} ?")
+            params += [path, value]
+        for path, (low, high) in (ranges or {}).items():
+            self._check_indexed(path)
+            sql = "SELECT config_id FROM fields WHERE path = ?"
+            params.append(path)
+            if low is not None:
+                sql += " AND value >= ?"
+                params.append(low)
+            if high is not None:
+                sql += " AND value <= ?"
+                params.append(high)
+            selects.append(sql)
+
+        if not selects:
+            rows = self._conn.execute("SELECT id FROM configs ORDER BY id")
+        else:
+            rows = self._conn.execute(" INTERSECT ".join(selects) + " ORDER BY config_id", params)
+        return [row[0] for row in rows]
+
+    def _row(self, key: ConfigKey) -> Optional[Tuple[int, str]]:
+        if isinstance(key, int):
+            return self._conn.execute("SELECT id, data FROM configs WHERE id = ?", (key,)).fetchone()
+        return self._conn.execute("SELECT id, data FROM configs WHERE hash = ?", (key,)).fetchone()
+
+    def _check_indexed(self, path: str) -> None:
+        if self.indexed_paths is not None and path not in self.indexed_paths:
+            raise KeyError(f"Path {path} is not indexed in {self.path}")
+
+    def _index_rows(self, data: Dict[str, Any], prefix: str = "") -> Iterable[Tuple[str, Any]]:
+        for key, value in data.items():
+            path = prefix + str(key)
+            if isinstance(value, dict):
+                yield from self._index_rows(value, path + ".")
+            elif isinstance(value, list):
+                continue
+            elif self.indexed_paths is None or path in self.indexed_paths:
+                yield path, value
+
+
+def _class_name(cls: Type) -> str:
+    return f"{cls.__module__}.{cls.__qualname__}"
@@ -0,0 +1,158 @@
+import logging
+import random
+from pathlib import Path
+from typing import Any, Callable, Dict, Generic, Iterator, List, Optional, Sequence, Tuple, TypeVar, Union
+
+from .config import BaseConfig
+from .utils.filesystem import atomic_write, ensure_parents_exist
+from .utils.overlay import build_tree, overlay
+from .utils.validation import Violation
+
+log = logging.getLogger(__name__)
+
+TConfig = TypeVar("TConfig", bound="BaseConfig")
+Sampler = Callable[[random.Random], Any]
+
+
+class _Group:
+    """A set of axes that vary together. Re-iterable, so groups can be nested in a product."""
+
+    def __init__(self, keys: List[str], rows: Callable[[], Iterator[Tuple]], size: int) -> None:
+        self.keys = keys
+        self.rows = rows
+        self.size = size
+
+
+class Sweep(Generic[TConfig]):
+    """
+    Lazily expands a base config along axes of dotted-key overrides.
+    Groups added with `grid`, `zip` and `random` are combined as a cartesian product.
+
+    Every config equals `from_dict` of the base dict with its overrides set: the copied
+    sub-configs run `__post_init__` again. They share every sub-config (and dict) that
+    none of their overrides touch with `base` and with each other, so treat them as
+    read-only or copy before mutating.
+    """
+
+    def __init__(self, base: TConfig) -> None:
+        self.base = base
+        self.schema = type(base).get_schema()
+        self._groups: List[_Group] = []
+
+    def grid(self, axes: Dict[str, Sequence[Any]]) -> "Sweep[TConfig]":
+        """Every combination of the given axis values."""
+        keys = self._check_keys(axes)
+        values = [list(axes[k]) for k in keys]
+
+        def rows() -> Iterator[Tuple]:
+            return _product(values)
+
+        size = 1
+        for v in values:
+            size *= len(v)
+        self._groups.append(_Group(keys, rows, size))
+        return self
+
+    def zip(self, axes: Dict[str, Sequence[Any]]) -> "Sweep[TConfig]":
+        """The i-th values of all axes together. All axes need the same length."""
+        keys = self._check_keys(axes)
+        values = [list(axes[k]) for k in keys]
+        lengths = {len(v) for v in values}
+        if len(lengths) > 1:
+            raise ValueError(f"Zipped axes must have equal lengths, got {dict(zip(keys, map(len, values)))}")
+
+        def rows() -> Iterator[Tuple]:
+            return zip(*values)
+
+        self._groups.append(_Group(keys, rows, lengths.pop() if lengths else 0))
+        return self
+
+    def random(self, axes: Dict[str, Union[Sequence[Any], Sampler]], n: int, seed: Optional[int] = None) -> "Sweep[TConfig]":
+        """
+        `n` random samples. An axis is either a sequence to choose from or a callable
+        drawing a value from a `random.Random`. The same seed yields the same samples.
+        """
+        keys = self._check_keys(axes)
+        samplers = [axes[k] if callable(axes[k]) else _choice(list(axes[k])) for k in keys]  # type: ignore
+
+        def rows() -> Iterator[Tuple]:
+            rng = random.Random(seed)
+            for _ in range(n):
+                yield tuple(sample(rng) for sample in samplers)
+
+        self._groups.append(_Group(keys, rows, n))
+        return self
+
+    def __len__(self) -> int:
+        size = 1
+        for group in self._groups:
+            size *= group.size
+        return size
+
+    def iter_overrides(self) -> Iterator[Dict[str, Any]]:
+        keys = [k for group in self._groups for k in group.keys]
+        for values in _product_groups(self._groups):
+            yield dict(zip(keys, values))
+
+    def __iter__(self) -> Iterator[TConfig]:
+        keys = [k for group in self._groups for k in group.keys]
+        tree = build_tree(keys, self.schema)
+        for values in _product_groups(self._groups):
+            yield overlay(self.base, tree, values)
+
+    def validate(self) -> List[Violation]:
+        """Check all configs of the sweep against the constraints of the config class at once."""
+        keys = [k for group in self._groups for k in group.keys]
+        converters = [self.schema.fields[k].converter if k in self.schema.fields else None for k in keys]
+        columns: List[List[Any]] = [[] for _ in keys]
+        for values in _product_groups(self._groups):
+            for column, converter, value in zip(columns, converters, values):
+                column.append(converter(value) if converter is not None else value)
+        return type(self.base).validate_batch(dict(zip(keys, columns)), base=self.base)
+
+    def save_jsonl(self, path: Path) -> int:
+        """
+        Stream all configs into one JSON-lines file, one config per line.
+        Returns the number of configs written.
+        """
+        ensure_parents_exist(path)
+        serializer = self.base.serializer(compact=True)
+        count = 0
+        with atomic_write(path) as f:
+            for cfg in self:
+                serializer.dump(cfg, f)
+                f.write("\n")
+                count += 1
+        log.info("Saved %d sweep configs to %s" % (count, path))
+        return count
+
+    def _check_keys(self, axes: Dict[str, Any]) -> List[str]:
+        taken = {k for group in self._groups for k in group.keys}
+        for key in axes:
+            self.schema.resolve(key)
+            if key in taken:
+                raise ValueError(f"Sweep axis '{key}' is used twice")
+        return list(axes)
+
+
+def _choice(values: List[Any]) -> Sampler:
+    if not values:
+        raise ValueError("Cannot sample from an empty axis")
+    return lambda rng: rng.choice(values)
+
+
+def _product(values: List[List[Any]], prefix: Tuple = ()) -> Iterator[Tuple]:
+    if not values:
+        yield prefix
+        return
+    for v in values[0]:
+        yield from _product(values[1:], prefix + (v,))
+
+
+def _product_groups(groups: List[_Group], prefix: Tuple = ()) -> Iterator[Tuple]:
+    # Unlike itertools.product, groups are re-iterated instead of materialised.
+    if not groups:
+        yield prefix
+        return
+    for row in groups[0].rows():
+        yield from _product_groups(groups[1:], prefix + tuple(row))
@@ -1,4 +1,32 @@
-from .filesystem import ensure_dir_exists, maybe_ensure_dir_exists, safe_ensure_dir_exists, remove_if_exists, ensure_parents_exist
-from .parsing import str2bool, is_dataclass_type
-from .configuration import deep_merge, apply_overwrite
-from .git import get_git_commit_hash
\ No newline at end of file
+TYPE_CHECKING = False  # see foundation._lazy
+
+from .._lazy import attach
+
+__getattr__, __dir__, __all__ = attach(__name__, {
+    ".filesystem": ["ensure_dir_exists", "maybe_ensure_dir_exists", "safe_ensure_dir_exists", "remove_if_exists", "ensure_parents_exist", "atomic_write", "FsyncBatch", "allocate_run_dir"],
+    ".parsing": ["str2bool", "is_dataclass_type", "LiteralParser"],
+    ".configuration": ["deep_merge", "merge", "MergeReport", "apply_overwrite", "set_nested"],
+    ".git": ["get_git_commit_hash"],
+    ".decoder": ["compile_decoder", "DataclassDecoder"],
+    ".schema": ["ConfigSchema", "SchemaField"],
+    ".hashing": ["fingerprint", "CanonicalJSONEncoder"],
+    ".serializer": ["ConfigSerializer", "get_serializer"],
+    ".patch": ["ConfigPatch"],
+    ".load_cache": ["ConfigCache"],
+    ".compact": ["ConfigInterner", "slotted"],
+    ".validation": ["constraint", "Check", "Violation", "ValidationError", "Validator"],
+})
+
+if TYPE_CHECKING:
+    from .filesystem import ensure_dir_exists, maybe_ensure_dir_exists, safe_ensure_dir_exists, remove_if_exists, ensure_parents_exist, atomic_write, FsyncBatch, allocate_run_dir
+    from .parsing import str2bool, is_dataclass_type, LiteralParser
+    from .configuration import deep_merge, merge, MergeReport, apply_overwrite, set_nested
+    from .git import get_git_commit_hash
+    from .decoder import compile_decoder, DataclassDecoder
+    from .schema import ConfigSchema, SchemaField
+    from .hashing import fingerprint, CanonicalJSONEncoder
+    from .serializer import ConfigSerializer, get_serializer
+    from .patch import ConfigPatch
+    from .load_cache import ConfigCache
+    from .compact import ConfigInterner, slotted
+    from .validation import constraint, Check, Violation, ValidationError, Validator
@@ -0,0 +1,154 @@
+import copy
+import inspect
+import itertools
+from dataclasses import fields, is_dataclass
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from enum import Enum
+from pathlib import PurePath
+from typing import Any, Dict, Hashable, Tuple, Type, TypeVar
+from uuid import UUID
+
+import logging
+log = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Values that can be shared between configs without anyone noticing.
+_IMMUTABLE = (str, bytes, int, float, complex, Decimal, UUID, PurePath, date, datetime, time, timedelta, Enum)
+# Types whose equal values can still differ (-0.0 and 0.0, Decimal("1.0") and Decimal("1.00"),
+# the same instant in other time zones, case-insensitive Windows paths), keyed by repr.
+_REPR_KEYED = (float, complex, Decimal, datetime, time, PurePath)
+
+
+def slotted(cls: Type[T]) -> Type[T]:
+    """
+    Class decorator (above `@dataclass`) storing the fields of a dataclass in `__slots__`
+    instead of a per-instance `__dict__`, like `dataclass(slots=True)` on Python 3.10+.
+    Defaults are no longer readable as class attributes. Fields inherited from a base
+    without slots (e.g. BaseConfig) keep living in that base's `__dict__`. Instances
+    stay weak-referenceable and zero-argument `super()` keeps working in the methods.
+    """
+    if not is_dataclass(cls):
+        raise TypeError(f"{cls.__name__} is not a dataclass, apply @slotted above @dataclass")
+    if "__slots__" in cls.__dict__:
+        return cls
+    inherited = {name for base in cls.__mro__[1:] for name in getattr(base, "__slots__", ())}
+    names = tuple(f.name for f in fields(cls) if f.name not in inherited)
+
+    namespace = dict(cls.__dict__)
+    for name in names + ("__dict__", "__weakref__"):
+        namespace.pop(name, None)
+    # A base without slots (or with a __weakref__ slot) already provides it, repeating it is an error.
+    if not any(hasattr(base, "__weakref__") for base in cls.__bases__):
+        names += ("__weakref__",)
+    namespace["__slots__"] = names
+    if cls.__dataclass_params__.frozen:  # type: ignore
+        # copy and pickle restore slots with setattr, which frozen classes refuse.
+        namespace["__getstate__"] = _getstate
+        namespace["__setstate__"] = _setstate
+    new_cls = type(cls)(cls.__name__, cls.__bases__, namespace)
+    for value in namespace.values():
+        _rebind_class_cell(value, cls, new_cls)
+    return new_cls
+
+
+def _rebind_class_cell(value: Any, old: type, new: type) -> None:
+    """Point the `__class__` cell zero-argument `super()` reads in the function(s) of `value` at `new`."""
+    if isinstance(value, (classmethod, staticmethod)):
+        funcs = [value.__func__]
+    elif isinstance(value, property):
+        funcs = [value.fget, value.fset, value.fdel]
+    else:
+        funcs = [value]
+    for func in funcs:
+        func = inspect.unwrap(func) if callable(func) else func
+        code = getattr(func, "__code__", None)
+        if code is None or not func.__closure__:
+            continue
+        for name, cell in zip(code.co_freevars, func.__closure__):
+            if name == "__class__" and cell.cell_contents is old:
+                cell.cell_contents = new
+
+
+def _getstate(self) -> Tuple[Any, ...]:
+    return tuple(getattr(self, f.name) for f in fields(self))
+
+
+def _setstate(self, state: Tuple[Any, ...]) -> None:
+    for f, value in zip(fields(self), state):
+        object.__setattr__(self, f.name, value)
+
+
+class ConfigInterner:
+    """
+    Shrinks large populations of configs (e.g. sweep bookkeeping) by sharing equal
+    values between them: strings, Paths, numbers and other immutable values are
+    interned, and equal frozen dataclasses (sub-configs as well as whole configs)
+    become one instance. Configs are rebuilt copy-on-write, the inputs are not changed.
+
+    With `share_mutable`, equal non-frozen sub-configs, dicts and lists are shared as
+    well. That saves the most, but the results must then be treated as read-only.
+    """
+
+    def __init__(self, share_mutable: bool = False) -> None:
+        self.share_mutable = share_mutable
+        # Every canonical object gets a serial, composite keys are tuples of serials so
+        # they only reference ints that already exist.
+        self._values: Dict[Hashable, Tuple[Any, int]] = {}
+        self._containers: Dict[Hashable, Tuple[Any, int]] = {}
+        self._serials = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._values) + len(self._containers)
+
+    def __call__(self, cfg: T) -> T:
+        return self._intern(cfg, root=True)[0]
+
+    def _intern(self, value: Any, root: bool = False) -> Tuple[Any, int]:
+        """Interned value and a serial that is equal for equal values."""
+        if value is None or value is True or value is False:
+            return value, _CONSTANTS[value]
+        if isinstance(value, _IMMUTABLE):
+            if isinstance(value, _REPR_KEYED):
+                key = (type(value), repr(value), getattr(value, "tzinfo", None))
+            else:
+                key = (type(value), value)
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = (value, next(self._serials))
+            return entry
+        if is_dataclass(value) and not isinstance(value, type):
+            new = copy.copy(value)
+            serials = []
+            for f in fields(value):
+                field_value, serial = self._intern(getattr(value, f.name))
+                object.__setattr__(new, f.name, field_value)
+                serials.append(serial)
+            frozen = value.__dataclass_params__.frozen
+            # A whole config is usually unique, only remember it if it may be shared.
+            return self._share(new, (type(value), *serials), frozen, frozen or not root)
+        if type(value) in (tuple, frozenset):
+            items = [self._intern(v) for v in value]
+            serials = tuple(s for _, s in items) if isinstance(value, tuple) else frozenset(s for _, s in items)
+            return self._share(type(value)(v for v, _ in items), (type(value), serials), True)
+        if type(value) is dict:
+            items = [(self._intern(k), self._intern(v)) for k, v in value.items()]
+            new = {k: v for (k, _), (v, _) in items}
+            return self._share(new, (dict, *(s for (_, ks), (_, vs) in items for s in (ks, vs))), False)
+        if type(value) is list:
+            items = [self._intern(v) for v in value]
+            return self._share([v for v, _ in items], (list, *(s for _, s in items)), False)
+        # Unknown (possibly mutable) types are kept as they are and never shared.
+        return value, next(self._serials)
+
+    def _share(self, value: Any, key: Hashable, immutable: bool, remember: bool = True) -> Tuple[Any, int]:
+        if not (immutable or self.share_mutable) or not remember:
+            return value, next(self._serials)
+        entry = self._containers.get(key)
+        if entry is None:
+            entry = self._containers[key] = (value, next(self._serials))
+        return entry
+
+
+_CONSTANTS = {None: -1, False: -2, True: -3}
@@ -1,5 +1,6 @@
-from typing import Dict, Any, Type, List
+from typing import Dict, Any, Type, List, Optional, Tuple, TYPE_CHECKING
 import json
+from dataclasses import dataclass, field
 from datetime import date, datetime
 from pathlib import Path
 from decimal import Decimal
@@ -9,6 +10,9 @@ from enum import Enum
 import logging
 log = logging.getLogger(__name__)
 
+if TYPE_CHECKING:
+    from .schema import ConfigSchema
+
 
 class CustomJSONEncoder(json.JSONEncoder):
     def default(self, o):
@@ -41,36 +45,108 @@ DEFAULT_CONVERTERS: Dict[Type, Any] = {
 DEFAULT_CAST: List[Type] = [list, tuple, set]
 
 
-def deep_merge(original: Dict, new: Dict) -> Dict:
+_MISSING = object()
+
+
+@dataclass
+class MergeReport:
+    """Dotted paths touched by a merge, in traversal order."""
+    added: List[str] = field(default_factory=list)
+    overwritten: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.added or self.overwritten)
+
+    def __str__(self) -> str:
+        parts = [f"{len(self.added)} added", f"{len(self.overwritten)} overwritten", f"{len(self.unchanged)} unchanged"]
+        if self.added:
+            parts.append(f"added: {', '.join(self.added)}")
+        if self.overwritten:
+            parts.append(f"overwritten: {', '.join(self.overwritten)}")
+        return ", ".join(parts)
+
+    def log(self, prefix: str = "DEEPMERGE") -> None:
+        # The summary is only built if someone will see it.
+        if self.changed and log.isEnabledFor(logging.INFO):
+            log.info("%s: %s", prefix, self)
+        elif log.isEnabledFor(logging.DEBUG):
+            log.debug("%s: %s", prefix, self)
+
+
+def merge(original: Dict, new: Dict, copy: bool = False, report: Optional[MergeReport] = None, prefix: str = "") -> Tuple[Dict, MergeReport]:
     """
-    Recursively merge `new` into `original`.
-    Values in `new` overwrite those in `original`.
+    Recursively merge `new` into `original` in a single traversal and report which paths
+    were added, overwritten or left unchanged. Nothing is logged.
+    With `copy`, `original` is left untouched: only the dicts along changed paths are
+    copied, unchanged subtrees are shared with the result.
     """
+    report = MergeReport() if report is None else report
+    return _merge(original, new, copy, report, prefix), report
+
+
+def _merge(original: Dict, new: Dict, copy: bool, report: MergeReport, prefix: str) -> Dict:
+    target = original
     for key, value in new.items():
-        if (
-            key in original
-            and isinstance(original[key], dict)
-            and isinstance(value, dict)
-        ):
-            deep_merge(original[key], value)
+        path = f"{prefix}{key}"
+        current = original.get(key, _MISSING)
+        if current is _MISSING:
+            report.added.append(path)
+        elif isinstance(current, dict) and isinstance(value, dict):
+            value = _merge(current, value, copy, report, path + ".")
+            if value is current:
+                continue
+        elif value != current:
+            report.overwritten.append(path)
         else:
-            if key not in original.keys():
-                log.info(f"DEEPMERGE: Adding key {key} with value {value}")
-                original[key] = value
-            elif value != original[key]:
-                log.info(f"DEEPMERGE: Overwriting key {key} with value {value}")
-                original[key] = value
-            else:
-                log.debug(f"DEEPMERGE: {value} for {key} already exists.")
-    return original
-
-
-def apply_overwrite(config_dict: dict, key: str, value: Any):
+            report.unchanged.append(path)
+            continue
+        if copy and target is original:
+            target = dict(original)
+        target[key] = value
+    return target
+
+
+def deep_merge(original: Dict, new: Dict, copy: bool = False) -> Dict:
+    """
+    Recursively merge `new` into `original`.
+    Values in `new` overwrite those in `original`.
+    With `copy`, a merged copy is returned and `original` is not mutated.
+    """
+    merged, report = merge(original, new, copy=copy)
+    report.log()
+    return merged
+
+
+def set_nested(d: dict, key: str, value: Any):
+    """
+    Set a dotted `key` in a nested dictionary, creating intermediate dictionaries.
+    """
+    keys = key.split(".")
+    for k in keys[:-1]:
+        d = d.setdefault(k, {})
+        if not isinstance(d, dict):
+            raise TypeError(f"Cannot descend into non-dict key: '{k}'")
+    d[keys[-1]] = value
+
+
+def apply_overwrite(
+    config_dict: dict,
+    key: str,
+    value: Any,
+    schema: Optional["ConfigSchema"] = None,
+    report: Optional[MergeReport] = None,
+) -> MergeReport:
     """
     Apply a nested dataclass overwrite into a nested dictionary.
     Creates missing intermediate dictionaries automatically.
     Performs deep merge if both existing and new values are dicts.
+    If a `schema` is given, unknown keys raise a KeyError.
+    Changes are recorded in `report` (a new one if None), which is returned and not logged.
     """
+    if schema is not None:
+        schema.resolve(key)
     keys = key.split(".")
     d = config_dict
 
@@ -83,23 +159,6 @@ def apply_overwrite(config_dict: dict, key: str, value: Any):
             raise TypeError(f"Cannot descend into non-dict key: '{k}'")
         d = d[k]
 
-    final_key = keys[-1]
-
-    # If both existing and new values are dicts use deep merge, else just overwrite.
-    if (
-        final_key in d
-        and isinstance(d[final_key], dict)
-        and isinstance(value, dict)
-    ):
-        deep_merge(d[final_key], value)
-    else: # Handle wrong types while initializing config?
-        if final_key not in d.keys():
-                log.info(f"DEEPMERGE: Adding key {key} with value {value}")
-                d[final_key] = value
-        elif value != d[final_key]:
-            log.info(f"Overwriting key {key} with value {value}")
-            d[final_key] = value
-        else:
-            log.debug(f"Value {value} for key {key} already exists.")
-
-
+    # Same rules as deep_merge: dicts are merged, everything else overwritten.
+    parent = key[:-len(keys[-1])]
+    return merge(d, {keys[-1]: value}, report=report, prefix=parent)[1]
@@ -0,0 +1,270 @@
+from collections.abc import Mapping, Collection
+from dataclasses import MISSING, Field, is_dataclass
+from itertools import zip_longest
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Type
+
+from dacite.dataclasses import get_fields, is_frozen
+from dacite.exceptions import DaciteError, DaciteFieldError, MissingValueError, UnionMatchError, WrongTypeError
+from dacite.generics import get_concrete_type_hints, orig
+from dacite.types import (
+    extract_generic,
+    extract_init_var,
+    extract_origin_collection,
+    is_generic_collection,
+    is_init_var,
+    is_instance,
+    is_optional,
+    is_subclass,
+    is_union,
+)
+
+import logging
+log = logging.getLogger(__name__)
+
+
+Builder = Callable[[Any], Any]
+Checker = Callable[[Any], bool]
+
+# How a missing key is filled in, resolved once per field.
+_DEFAULT_VALUE = 0
+_DEFAULT_FACTORY = 1
+_DEFAULT_NONE = 2
+_DEFAULT_MISSING = 3
+
+
+class DataclassDecoder:
+    """
+    Decoder for a single dataclass, compiled once from its fields and type hints.
+    Mirrors `dacite.from_dict` (with `check_types=True`) but resolves hooks, casts,
+    Optional/Union handling and nested decoders ahead of time.
+    """
+
+    __slots__ = ("data_class", "fields", "children", "frozen")
+
+    def __init__(self, data_class: Type) -> None:
+        self.data_class = data_class
+        self.fields: List[Tuple[str, bool, Optional[Builder], Optional[Checker], Any, int, Any]] = []
+        self.children: Dict[str, "DataclassDecoder"] = {}  # decoders of nested dataclass fields
+        self.frozen = is_frozen(data_class)
+
+    def __call__(self, data: Mapping) -> Any:
+        init_values = {}
+        post_init_values = {}
+
+        for name, init, build, check, field_type, default_kind, default in self.fields:
+            if name in data:
+                value = data[name]
+                if build is not None:
+                    try:
+                        value = build(value)
+                    except DaciteFieldError as error:
+                        error.update_path(name)
+                        raise
+                if check is not None and not check(value):
+                    raise WrongTypeError(field_path=name, field_type=field_type, value=value)
+            elif default_kind == _DEFAULT_VALUE:
+                value = default
+            elif default_kind == _DEFAULT_FACTORY:
+                value = default()
+            elif default_kind == _DEFAULT_NONE:
+                value = None
+            elif not init:
+                continue
+            else:
+                raise MissingValueError(name)
+
+            if init:
+                init_values[name] = value
+            elif not self.frozen:
+                post_init_values[name] = value
+
+        instance = self.data_class(**init_values)
+        for name, value in post_init_values.items():
+            setattr(instance, name, value)
+        return instance
+
+
+def compile_decoder(data_class: Type, type_hooks: Dict[Type, Any], cast: Iterable[Type]) -> DataclassDecoder:
+    """
+    Build a `DataclassDecoder` for `data_class`. The same hooks and casts are applied to
+    every nested dataclass, exactly like a single `dacite.from_dict` call would.
+    """
+    return _Compiler(type_hooks, list(cast)).decoder(data_class)
+
+
+class _Compiler:
+    def __init__(self, type_hooks: Dict[Type, Any], cast: List[Type]) -> None:
+        self.type_hooks = type_hooks
+        self.cast = cast
+        self.decoders: Dict[Any, DataclassDecoder] = {}
+
+    def decoder(self, data_class: Type) -> DataclassDecoder:
+        if data_class in self.decoders:
+            return self.decoders[data_class]
+
+        # Register before compiling the fields, so self-referencing dataclasses terminate.
+        decoder = self.decoders[data_class] = DataclassDecoder(data_class)
+        hints = get_concrete_type_hints(data_class)
+
+        for f in get_fields(data_class):
+            field_type = hints[f.name]
+            default_kind, default = _default_for_field(f, field_type)
+            decoder.fields.append((
+                f.name,
+                f.init,
+                self.builder(field_type),
+                _checker(field_type),
+                field_type,
+                default_kind,
+                default,
+            ))
+            nested = nested_dataclass(field_type)
+            if nested is not None:
+                decoder.children[f.name] = self.decoder(nested)
+        return decoder
+
+    def builder(self, type_: Any) -> Optional[Builder]:
+        """Returns a callable converting raw data into `type_`, or None if data passes unchanged."""
+        if is_init_var(type_):
+            type_ = extract_init_var(type_)
+
+        try:
+            hook = self.type_hooks.get(type_)
+        except TypeError:  # unhashable type hint
+            hook = None
+        optional = is_optional(type_)
+
+        if is_union(type_):
+            inner = self.union_builder(type_)
+        elif is_generic_collection(type_):
+            inner = self.collection_builder(type_)
+        elif is_dataclass(orig(type_)):
+            inner = self.nested_builder(type_)
+        else:
+            inner = None
+
+        cast_to = None
+        for cast_type in self.cast:
+            if is_subclass(type_, cast_type):
+                cast_to = extract_origin_collection(type_) if is_generic_collection(type_) else type_
+                break
+
+        if hook is None and inner is None and cast_to is None:
+            return None
+
+        def build(data: Any) -> Any:
+            if hook is not None:
+                data = hook(data)
+            if optional and data is None:
+                return data
+            if inner is not None:
+                data = inner(data)
+            if cast_to is not None:
+                data = cast_to(data)
+            return data
+
+        return build
+
+    def nested_builder(self, type_: Any) -> Builder:
+        decoder = self.decoder(type_)
+
+        def build(data: Any) -> Any:
+            if isinstance(data, Mapping):
+                return decoder(data)
+            return data
+
+        return build
+
+    def union_builder(self, union: Any) -> Optional[Builder]:
+        types = extract_generic(union)
+        if is_optional(union) and len(types) == 2:
+            return self.builder(types[0])
+
+        candidates = [(inner_type, self.builder(inner_type) or _identity, _checker(inner_type) or _always)
+                      for inner_type in types]
+
+        def build(data: Any) -> Any:
+            for _, inner_build, inner_check in candidates:
+                try:
+                    try:
+                        value = inner_build(data)
+                    except Exception:
+                        continue
+                    if inner_check(value):
+                        return value
+                except DaciteError:
+                    pass
+            raise UnionMatchError(field_type=union, value=data)
+
+        return build
+
+    def collection_builder(self, collection: Any) -> Builder:
+        is_mapping = is_subclass(collection, Mapping)
+        is_tuple = is_subclass(collection, tuple)
+        is_collection = is_subclass(collection, Collection)
+
+        value_build = (self.builder(extract_generic(collection, defaults=(Any, Any))[1]) or _identity) if is_mapping else None
+        item_build = (self.builder(extract_generic(collection, defaults=(Any,))[0]) or _identity) if is_collection else None
+
+        variadic = False
+        tuple_builds: List[Builder] = []
+        if is_tuple:
+            types = extract_generic(collection)
+            variadic = len(types) == 2 and types[1] == Ellipsis
+            if not variadic:
+                tuple_builds = [self.builder(t) or _identity for t in types]
+
+        def build(data: Any) -> Any:
+            data_type = data.__class__
+            if is_mapping and isinstance(data, Mapping):
+                return data_type((key, value_build(value)) for key, value in data.items())
+            elif is_tuple and isinstance(data, tuple):
+                if not data:
+                    return data_type()
+                if variadic:
+                    return data_type(item_build(item) for item in data)
+                return data_type((b or _identity)(item) for item, b in zip_longest(data, tuple_builds))
+            elif is_collection and isinstance(data, Collection):
+                return data_type(item_build(item) for item in data)
+            return data
+
+        return build
+
+
+def nested_dataclass(type_: Any) -> Optional[Type]:
+    """Returns the dataclass behind a field type (plain or Optional), else None."""
+    if is_optional(type_) and len(extract_generic(type_)) == 2:
+        type_ = extract_generic(type_)[0]
+    if is_dataclass(orig(type_)) and isinstance(orig(type_), type):
+        return type_
+    return None
+
+
+def _identity(data: Any) -> Any:
+    return data
+
+
+def _always(value: Any) -> bool:
+    return True
+
+
+def _checker(type_: Any) -> Optional[Checker]:
+    """Returns a type check for `type_`, or None if every value is accepted."""
+    if type_ is Any:
+        return None
+    if isinstance(type_, type) and not hasattr(type_, "__origin__"):
+        # Plain classes are decided by isinstance alone (PEP 484 numeric tower included).
+        if type_ in (float, complex):
+            return lambda value: isinstance(value, (int, float)) or isinstance(value, type_)
+        return lambda value: isinstance(value, type_)
+    return lambda value: is_instance(value, type_)
+
+
+def _default_for_field(f: Field, type_: Any) -> Tuple[int, Any]:
+    if f.default != MISSING:
+        return _DEFAULT_VALUE, f.default
+    if f.default_factory != MISSING:  # type: ignore
+        return _DEFAULT_FACTORY, f.default_factory  # type: ignore
+    if is_optional(type_):
+        return _DEFAULT_NONE, None
+    return _DEFAULT_MISSING, None
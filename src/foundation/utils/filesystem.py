@@ -1,12 +1,15 @@
+import contextlib
 import logging
-import argparse
-from dataclasses import is_dataclass
-from typing import get_origin, get_args
-
+import os
+import threading
+from datetime import datetime
 from pathlib import Path
+from typing import IO, Iterator, List, Optional, Tuple
 
 log = logging.getLogger(__name__)
 
+_batches = threading.local()
+
 
 # working with filesystem
 def ensure_dir_exists(path:Path) -> Path:
@@ -48,4 +51,116 @@ def remove_if_exists(file: Path):
         log.error("You don't have permission to delete this file %s." % str(file))
 
 
+# atomic writes
+@contextlib.contextmanager
+def atomic_write(path: Path, mode: str = "w", fsync: bool = True, encoding: Optional[str] = None) -> Iterator[IO]:
+    """
+    Open a temporary file next to `path` and rename it over `path` once the block
+    completes, so readers see the old or the new content, never a partial file. With
+    `fsync` the data (and the rename) are on disk when the block exits. On errors the
+    temporary file is removed and `path` stays untouched.
+
+    Inside `FsyncBatch()` files are fsynced and renamed together when the batch ends.
+    """
+    if mode not in ("w", "wb"):
+        raise ValueError(f"atomic_write only supports the modes 'w' and 'wb', got {mode}")
+    path = Path(path)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{os.urandom(4).hex()}.tmp")
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        with open(fd, mode, encoding=encoding) as f:
+            yield f
+            f.flush()
+            batch = getattr(_batches, "current", None)
+            if fsync and batch is None:
+                os.fsync(f.fileno())
+        if batch is not None:
+            batch.add(tmp, path)
+            return
+        os.replace(tmp, path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(tmp)
+        raise
+    if fsync:
+        _fsync_dir(path.parent)
+
+
+class FsyncBatch:
+    """
+    Groups `atomic_write`s of the current thread: nothing is renamed into place until
+    the batch exits, then every file is fsynced, renamed, and each directory is synced
+    once instead of once per file. If the block raises, none of the files are written.
+    """
+
+    def __init__(self, fsync: bool = True) -> None:
+        self.fsync = fsync
+        self._pending: List[Tuple[Path, Path]] = []  # (temporary file, destination)
+        self._outer: Optional[FsyncBatch] = None
+
+    def add(self, tmp: Path, path: Path) -> None:
+        self._pending.append((tmp, path))
 
+    def __enter__(self) -> "FsyncBatch":
+        self._outer = getattr(_batches, "current", None)
+        _batches.current = self
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        _batches.current = self._outer
+        pending, self._pending = self._pending, []
+        if exc_type is not None:
+            for tmp, _ in pending:
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(tmp)
+            return
+        if self._outer is not None:  # nested, the outermost batch commits
+            self._outer._pending.extend(pending)
+            return
+        if self.fsync:
+            for tmp, _ in pending:
+                fd = os.open(tmp, os.O_RDONLY)
+                try:
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+        for tmp, path in pending:
+            os.replace(tmp, path)
+        if self.fsync:
+            for directory in dict.fromkeys(path.parent for _, path in pending):
+                _fsync_dir(directory)
+
+
+def _fsync_dir(path: Path) -> None:
+    # Makes the rename durable, not supported on every platform (e.g. Windows).
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+# run directories
+def allocate_run_dir(parent: Path, prefix: str = "run", max_attempts: int = 100) -> Path:
+    """
+    Create a new, unique directory `<prefix>_<date>_<time>_<random>` in `parent`. The
+    name is unique by construction, so concurrent workers (also on other hosts sharing
+    the file system) neither wait on a lock nor retry each other's numbers. `mkdir`
+    itself is the arbiter for the practically impossible collision.
+    """
+    parent = Path(parent)
+    parent.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    for _ in range(max_attempts):
+        path = parent / f"{prefix}_{stamp}_{os.urandom(4).hex()}"
+        try:
+            path.mkdir()
+        except FileExistsError:
+            continue
+        return path
+    raise FileExistsError(f"Could not allocate a run directory in {parent} after {max_attempts} attempts")
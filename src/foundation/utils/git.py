@@ -1,15 +1,193 @@
 import os
-import shutil
-from subprocess import check_output, SubprocessError
-from typing import Tuple
+import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional, Tuple
 
 import logging
 log = logging.getLogger(__name__)
 
 
-def get_git_commit_hash() -> Tuple[str, str]:
-    git_hash = "unknown"
-    git_repo_name = "not a git repository"
+UNKNOWN_HASH = "unknown"
+NO_REPOSITORY = "not a git repository"
+
+# Background lookups per start path, see get_git_commit_hash_future
+_futures: Dict[Path, "Future[Tuple[str, str]]"] = {}
+_futures_lock = threading.Lock()
+_executor: Optional[ThreadPoolExecutor] = None
+
+_SHA = re.compile(r"^[0-9a-f]{40}([0-9a-f]{24})?$")
+_SECTION = re.compile(r'^\[\s*([^\s\]"]+)(?:\s+"((?:[^"\\]|\\.)*)")?\s*\]')
+
+
+def get_git_commit_hash(path: Optional[Path] = None) -> Tuple[str, str]:
+    """
+    Commit hash of HEAD and the origin url of the repository containing `path` (default cwd).
+    Reads .git directly (loose refs, packed-refs, worktrees, detached HEAD) and only falls
+    back to the git binary if that fails. Results are memoized per process and repo root.
+    """
+    start = Path(path) if path is not None else Path.cwd()
+    root = find_git_root(start.resolve())
+    if root is None:
+        return UNKNOWN_HASH, NO_REPOSITORY
+    return _read_git_metadata(root)
+
+
+def get_git_commit_hash_future(path: Optional[Path] = None) -> "Future[Tuple[str, str]]":
+    """
+    Start get_git_commit_hash in a background thread and return its future, without
+    touching the filesystem in the calling thread. One lookup per path and process.
+    """
+    global _executor
+    start = Path(path) if path is not None else Path.cwd()
+    with _futures_lock:
+        future = _futures.get(start)
+        if future is None:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="git-metadata")
+            future = _futures[start] = _executor.submit(get_git_commit_hash, start)
+    return future
+
+
+async def get_git_commit_hash_async(path: Optional[Path] = None) -> Tuple[str, str]:
+    """Awaitable get_git_commit_hash for asyncio callers, shares the background lookup."""
+    import asyncio
+    return await asyncio.wrap_future(get_git_commit_hash_future(path))
+
+
+def _after_fork_in_child() -> None:
+    # The worker thread did not survive the fork, lookups it had not finished never will.
+    global _executor, _futures_lock
+    _executor = None
+    _futures_lock = threading.Lock()
+    for start, future in list(_futures.items()):
+        if not future.done():
+            del _futures[start]
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+@lru_cache(maxsize=None)
+def find_git_root(start: Path) -> Optional[Path]:
+    for directory in (start, *start.parents):
+        if (directory / ".git").exists():
+            return directory
+    return None
+
+
+@lru_cache(maxsize=None)
+def _read_git_metadata(root: Path) -> Tuple[str, str]:
+    try:
+        git_dir = _resolve_git_dir(root)
+        common_dir = _resolve_common_dir(git_dir)
+        git_hash = _resolve_head(git_dir, common_dir)
+        git_repo_name = _read_origin_url(common_dir / "config")
+    except (OSError, ValueError) as e:
+        log.debug("Reading .git of %s failed (%s), asking git" % (root, e))
+        return _get_git_commit_hash_subprocess(root)
+    return git_hash, git_repo_name if git_repo_name is not None else NO_REPOSITORY
+
+
+def _resolve_git_dir(root: Path) -> Path:
+    dot_git = root / ".git"
+    if dot_git.is_dir():
+        return dot_git
+    # Worktrees and submodules: ".git" is a file containing "gitdir: <path>"
+    content = dot_git.read_text().strip()
+    if not content.startswith("gitdir:"):
+        raise ValueError(f"Unexpected content in {dot_git}")
+    git_dir = Path(content[len("gitdir:"):].strip())
+    return git_dir if git_dir.is_absolute() else (root / git_dir).resolve()
+
+
+def _resolve_common_dir(git_dir: Path) -> Path:
+    # Linked worktrees keep HEAD in their own git dir, but refs and config in the common dir.
+    commondir = git_dir / "commondir"
+    if not commondir.is_file():
+        return git_dir
+    common = Path(commondir.read_text().strip())
+    return common if common.is_absolute() else (git_dir / common).resolve()
+
+
+def _resolve_head(git_dir: Path, common_dir: Path) -> str:
+    content = (git_dir / "HEAD").read_text().strip()
+    for _ in range(10):  # symbolic refs may point to further symbolic refs
+        if not content.startswith("ref:"):
+            if not _SHA.match(content):
+                raise ValueError(f"Unexpected HEAD content {content!r}")
+            return content  # detached HEAD or resolved ref
+        ref = content[len("ref:"):].strip()
+        content = _read_ref(ref, git_dir, common_dir)
+    raise ValueError("Too many levels of symbolic refs")
+
+
+def _read_ref(ref: str, git_dir: Path, common_dir: Path) -> str:
+    for base in (git_dir, common_dir):
+        loose = base / ref
+        if loose.is_file():
+            return loose.read_text().strip()
+    packed = common_dir / "packed-refs"
+    if packed.is_file():
+        for line in packed.read_text().splitlines():
+            if not line or line[0] in "#^":
+                continue
+            sha, _, name = line.partition(" ")
+            if name == ref:
+                return sha
+    raise ValueError(f"Ref {ref} not found")
+
+
+def _read_origin_url(config: Path) -> Optional[str]:
+    if not config.is_file():
+        return None
+    in_origin = False
+    url = None
+    for raw in config.read_text().splitlines():
+        line = raw.strip()
+        if not line or line[0] in "#;":
+            continue
+        section = _SECTION.match(line)
+        if section:
+            in_origin = section.group(1).lower() == "remote" and section.group(2) == "origin"
+            line = line[section.end():].strip()
+            if not line:
+                continue
+        if in_origin:
+            key, sep, value = line.partition("=")
+            if sep and key.strip().lower() == "url":
+                url = _unquote(value.strip())  # like `git config --get`, the last value wins
+    return url
+
+
+def _unquote(value: str) -> str:
+    """Strip quotes, escapes and trailing comments from a git config value."""
+    out = []
+    quoted = False
+    chars = iter(value)
+    for c in chars:
+        if c == '"':
+            quoted = not quoted
+        elif c == "\\":
+            escaped = next(chars, "")
+            out.append({"n": "\n", "t": "\t", "b": "\b"}.get(escaped, escaped))
+        elif c in "#;" and not quoted:
+            break
+        else:
+            out.append(c)
+    return "".join(out).strip()
+
+
+def _get_git_commit_hash_subprocess(cwd: Optional[Path] = None) -> Tuple[str, str]:
+    # Only needed when .git cannot be read directly, so not imported with the module.
+    import shutil
+    from subprocess import check_output, SubprocessError
+
+    git_hash = UNKNOWN_HASH
+    git_repo_name = NO_REPOSITORY
 
     git_bin = shutil.which("git") # Vulnerable to Path hijacking...
     if not git_bin:
@@ -18,6 +196,7 @@ def get_git_commit_hash() -> Tuple[str, str]:
     try:
         git_root = check_output(
             [git_bin, "rev-parse", "--show-toplevel"],
+            cwd=cwd,
             timeout=1,
             env={"PATH": os.environ.get("PATH", "")},
         ).strip().decode()
@@ -0,0 +1,95 @@
+import hashlib
+import json
+from dataclasses import fields, is_dataclass
+from datetime import date, time, timedelta
+from decimal import Decimal
+from enum import Enum
+from pathlib import PurePath
+from typing import Any, Dict, FrozenSet, Iterable, List, Tuple
+from uuid import UUID
+
+from .configuration import CustomJSONEncoder
+
+import logging
+log = logging.getLogger(__name__)
+
+
+# Instance attribute holding {excluded paths: (field values, field state, digest)} of a dataclass.
+_CACHE_ATTR = "__fingerprint_cache__"
+
+# Leaves that cannot change in place: if the field still holds the same object, its
+# canonical form is still the cached one.
+_IMMUTABLE = (str, bytes, int, float, complex, Decimal, UUID, PurePath, date, time, timedelta, Enum, type(None))
+
+
+class CanonicalJSONEncoder(CustomJSONEncoder):
+    """Like CustomJSONEncoder, but sets are sorted and nested dataclasses are encoded as dicts."""
+
+    def default(self, o):
+        if isinstance(o, (set, frozenset)):
+            return sorted(o, key=_canonical)
+        if is_dataclass(o) and not isinstance(o, type):
+            return {f.name: getattr(o, f.name) for f in fields(o)}
+        return super().default(o)
+
+
+def fingerprint(obj: Any, exclude: Iterable[str] = ()) -> str:
+    """
+    Stable sha256 of a dataclass tree, leaving out the dotted paths in `exclude`.
+    Every nested dataclass caches its own digest together with the field values it was
+    computed from. Fields still holding the same immutable object are not serialized
+    again, so after an override only the changed branch and its parents do real work.
+    Dicts, lists and sets can change in place and are always re-serialized.
+    """
+    return _digest(obj, frozenset(exclude))
+
+
+def _digest(obj: Any, exclude: FrozenSet[str]) -> str:
+    cache: Dict[FrozenSet[str], Tuple[tuple, tuple, str]] = getattr(obj, _CACHE_ATTR, None) or {}
+    cached = cache.get(exclude)
+    values: List[Any] = []
+    state = []
+    for f in fields(obj):
+        if f.name in exclude:
+            continue
+        value = getattr(obj, f.name)
+        i = len(values)
+        values.append(value)
+        if is_dataclass(value) and not isinstance(value, type):
+            state.append((f.name, True, _digest(value, _sub_paths(exclude, f.name))))
+        elif cached is not None and cached[0][i] is value and isinstance(value, _IMMUTABLE):
+            state.append(cached[1][i])
+        else:
+            state.append((f.name, False, _canonical(value, _sub_paths(exclude, f.name))))
+    state_key = tuple(state)
+
+    if cached is not None and cached[1] == state_key:
+        digest = cached[2]
+        if all(a is b for a, b in zip(cached[0], values)):
+            return digest
+    else:
+        digest = hashlib.sha256(json.dumps(state, separators=(",", ":")).encode()).hexdigest()
+    try:
+        # Replace rather than update, copies made with copy.copy share the old dict.
+        object.__setattr__(obj, _CACHE_ATTR, {**cache, exclude: (tuple(values), state_key, digest)})
+    except AttributeError:  # __slots__ without __dict__, nothing to cache on
+        pass
+    return digest
+
+
+def _canonical(value: Any, exclude: FrozenSet[str] = frozenset()) -> str:
+    return json.dumps(_without(value, exclude), cls=CanonicalJSONEncoder, sort_keys=True, separators=(",", ":"))
+
+
+def _without(value: Any, exclude: FrozenSet[str]) -> Any:
+    """Drop excluded keys from (nested) dicts."""
+    if not exclude or not isinstance(value, dict):
+        return value
+    return {k: _without(v, _sub_paths(exclude, str(k))) for k, v in value.items() if str(k) not in exclude}
+
+
+def _sub_paths(exclude: FrozenSet[str], name: str) -> FrozenSet[str]:
+    if not exclude:
+        return exclude
+    prefix = name + "."
+    return frozenset(p[len(prefix):] for p in exclude if p.startswith(prefix))
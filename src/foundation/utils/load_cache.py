@@ -0,0 +1,135 @@
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import logging
+log = logging.getLogger(__name__)
+
+# (config class, resolved path, mtime_ns, size, content digest, overwrite)
+CacheKey = Tuple[str, str, int, int, str, str]
+
+SIDECAR_SUFFIX = ".cache"
+_SIDECAR_ENTRIES = 16  # per config file, one per config class and overwrite combination
+
+
+class ConfigCache:
+    """
+    Cache of decoded configs for `BaseConfig.cfg_load(..., cache=...)`, keyed by the file's
+    path, mtime, size and content hash plus the overwrite dict. Any change to the file
+    gives a new key, so stale entries are never returned, they just age out of the LRU.
+
+    Entries are kept pickled: every hit unpickles an independent instance, which is far
+    cheaper than parsing and decoding the JSON again. With `sidecar`, entries are also
+    written to `<file>.cache` next to the config so other processes reuse them. Sidecars
+    are pickles, only enable them for directories you trust as much as your code.
+    """
+
+    def __init__(self, maxsize: int = 256, sidecar: bool = False) -> None:
+        self.maxsize = maxsize
+        self.sidecar = sidecar
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[CacheKey, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def key(self, config_class: type, path: Path, data: bytes, overwrite: Optional[Dict[str, Any]]) -> CacheKey:
+        """Key for the config file content `data` read from `path`."""
+        stat = os.stat(path)
+        return (
+            f"{config_class.__module__}.{config_class.__qualname__}",
+            str(Path(path).resolve()),
+            stat.st_mtime_ns,
+            stat.st_size,
+            hashlib.blake2b(data, digest_size=16).hexdigest(),
+            _overwrite_key(overwrite),
+        )
+
+    def get(self, key: CacheKey) -> Optional[Any]:
+        with self._lock:
+            blob = self._entries.get(key)
+            if blob is not None:
+                self._entries.move_to_end(key)
+        if blob is None and self.sidecar:
+            blob = self._read_sidecar(key)
+            if blob is not None:
+                self._remember(key, blob)
+        if blob is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return pickle.loads(blob)
+
+    def put(self, key: CacheKey, cfg: Any) -> None:
+        blob = pickle.dumps(cfg, protocol=pickle.HIGHEST_PROTOCOL)
+        self._remember(key, blob)
+        if self.sidecar:
+            self._write_sidecar(key, blob)
+
+    def _remember(self, key: CacheKey, blob: bytes) -> None:
+        with self._lock:
+            self._entries[key] = blob
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    # sidecar: {"source": (mtime_ns, size, digest), "entries": {(class, overwrite): blob}}
+    def _read_sidecar(self, key: CacheKey) -> Optional[bytes]:
+        content = _load_sidecar(Path(key[1] + SIDECAR_SUFFIX))
+        if content is None or content["source"] != key[2:5]:
+            return None
+        return content["entries"].get((key[0], key[5]))
+
+    def _write_sidecar(self, key: CacheKey, blob: bytes) -> None:
+        path = Path(key[1] + SIDECAR_SUFFIX)
+        content = _load_sidecar(path)
+        if content is None or content["source"] != key[2:5]:
+            content = {"source": key[2:5], "entries": {}}
+        entries = content["entries"]
+        entries.pop((key[0], key[5]), None)
+        entries[(key[0], key[5])] = blob
+        while len(entries) > _SIDECAR_ENTRIES:
+            del entries[next(iter(entries))]
+        tmp = None
+        try:
+            # Readers only ever see a complete sidecar.
+            fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(content, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+        except OSError as e:
+            log.debug("Could not write config cache %s: %s" % (path, e))
+            if tmp is not None and os.path.exists(tmp):
+                os.remove(tmp)
+
+
+def _load_sidecar(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, "rb") as f:
+            content = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        log.debug("Ignoring unreadable config cache %s: %s" % (path, e))
+        return None
+    if not isinstance(content, dict) or "source" not in content or "entries" not in content:
+        return None
+    return content
+
+
+def _overwrite_key(overwrite: Optional[Dict[str, Any]]) -> str:
+    if overwrite is None:
+        return ""
+    return json.dumps(overwrite, sort_keys=True, separators=(",", ":"), default=repr)
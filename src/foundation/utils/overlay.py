@@ -0,0 +1,91 @@
+import copy
+from dataclasses import is_dataclass
+from typing import Any, Callable, Dict, List, Tuple
+
+from dacite.exceptions import DaciteFieldError, WrongTypeError
+
+from .schema import ConfigSchema
+
+
+class _Leaf:
+    __slots__ = ("index", "converter")
+
+    def __init__(self, index: int, converter: Callable[[Any], Any]) -> None:
+        self.index = index
+        self.converter = converter
+
+
+def build_tree(keys: List[str], schema: ConfigSchema, check_types: bool = False) -> Dict[str, Any]:
+    """
+    Nested dict of path parts, with a `_Leaf` pointing into the value tuple at each key.
+    With `check_types` every value is type checked like `from_dict` does (nested
+    dataclasses are decoded by their decoder), a mismatch raises a dacite error.
+    """
+    tree: Dict[str, Any] = {}
+    for index, key in enumerate(keys):
+        converter = _converter(key, schema, check_types)
+        *parents, last = key.split(".")
+        node = tree
+        for part in parents:
+            node = node.setdefault(part, {})
+            if isinstance(node, _Leaf):
+                raise ValueError(f"Key '{key}' lies below another key")
+        if last in node:
+            raise ValueError(f"Key '{key}' overlaps another key")
+        node[last] = _Leaf(index, converter)
+    return tree
+
+
+def overlay(node: Any, tree: Dict[str, Any], values: Tuple) -> Any:
+    """
+    Shallow-copy `node` and the branches named in `tree`, everything else stays shared.
+    Every copied dataclass runs its `__post_init__` again, innermost first like the
+    decoder does, so derived fields match a config decoded from the changed dict.
+    """
+    if is_dataclass(node):
+        new = copy.copy(node)
+        for key, sub in tree.items():
+            if isinstance(sub, _Leaf):
+                value = sub.converter(values[sub.index])
+            else:
+                value = overlay(getattr(node, key), sub, values)
+            object.__setattr__(new, key, value)
+        post_init = getattr(new, "__post_init__", None)
+        if post_init is not None:
+            post_init()
+        return new
+
+    if node is not None and not isinstance(node, dict):
+        raise TypeError(f"Cannot override keys {list(tree)} below a {type(node).__name__}")
+    new = dict(node) if node is not None else {}
+    for key, sub in tree.items():
+        if isinstance(sub, _Leaf):
+            new[key] = sub.converter(values[sub.index])
+        else:
+            new[key] = overlay(new.get(key), sub, values)
+    return new
+
+
+def _converter(key: str, schema: ConfigSchema, check_types: bool) -> Callable[[Any], Any]:
+    entry = schema.fields.get(key)
+    if entry is None:  # below a free-form dict
+        return _identity
+    if not check_types or entry.check is None:
+        return entry.converter
+    build, check, field_type = entry.converter, entry.check, entry.type
+
+    def convert(value: Any) -> Any:
+        try:
+            value = build(value)
+        except DaciteFieldError as error:
+            error.update_path(key)
+            raise
+        if not check(value):
+            raise WrongTypeError(field_path=key, field_type=field_type, value=value)
+        return value
+
+    return convert
+
+
+def _identity(value: Any) -> Any:
+    return value
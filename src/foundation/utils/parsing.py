@@ -1,7 +1,10 @@
 import logging
 import argparse
+import copy
+import json
+import re
 from dataclasses import is_dataclass
-from typing import get_origin, get_args
+from typing import Any, Dict, Optional, Union, get_origin, get_args
 
 from pathlib import Path
 
@@ -32,3 +35,62 @@ def is_dataclass_type(tp):
     return any(is_dataclass(arg) for arg in get_args(tp))
 
 
+# Literal values of --extras
+_JSON_NUMBER = re.compile(r"-?(?:0|[1-9]\d*)(\.\d+)?([eE][-+]?\d+)?")
+_CONSTANTS: Dict[str, Any] = {
+    "true": True,
+    "false": False,
+    "null": None,
+    "NaN": float("nan"),
+    "Infinity": float("inf"),
+    "-Infinity": float("-inf"),
+}
+
+
+class LiteralParser:
+    """
+    Parses command line values like `json.loads` would, but numbers, true/false/null and
+    bare strings are recognised without JSON, and anything that is not valid JSON is
+    kept as a string. `@file.json` is replaced by the content of that file (relative to
+    `base_dir`, default cwd). Each file is read once, every reference gets its own copy.
+    """
+
+    def __init__(self, base_dir: Optional[Path] = None) -> None:
+        self.base_dir = base_dir
+        self._files: Dict[Path, Any] = {}
+
+    def __call__(self, text: str) -> Any:
+        value = text.strip()
+        if not value:
+            return text
+        first = value[0]
+        if first.isdigit() or first == "-":
+            number = _JSON_NUMBER.fullmatch(value)
+            if number is not None:
+                return float(value) if number.group(1) or number.group(2) else int(value)
+        constant = _CONSTANTS.get(value, text)
+        if constant is not text:
+            return constant
+        if first in "[{\"":
+            try:
+                return json.loads(value)
+            except ValueError as e:
+                log.warning("Value %r is not valid JSON (%s), using it as a string" % (text, e))
+                return text
+        if first == "@" and value.endswith(".json"):
+            return self.load(value[1:])
+        return text
+
+    def load(self, path: Union[str, Path]) -> Any:
+        path = Path(path)
+        if self.base_dir is not None and not path.is_absolute():
+            path = self.base_dir / path
+        path = path.resolve()
+        if path not in self._files:
+            try:
+                with open(path, "r") as f:
+                    self._files[path] = json.load(f)
+            except (OSError, ValueError) as e:
+                raise ValueError(f"Could not load referenced file @{path}: {e}") from e
+            log.debug("Loaded %s for a command line value" % path)
+        return copy.deepcopy(self._files[path])
@@ -0,0 +1,116 @@
+import json
+from dataclasses import fields, is_dataclass
+from typing import Any, Callable, Dict, Optional, TypeVar, TYPE_CHECKING
+
+from .overlay import build_tree, overlay
+
+if TYPE_CHECKING:
+    from ..config import BaseConfig
+
+TConfig = TypeVar("TConfig", bound="BaseConfig")
+
+_SCALARS = (str, int, float, bool, type(None))
+
+
+class ConfigPatch:
+    """
+    Changes between two configs of the same class as dotted paths (the keys `apply_overwrite`
+    and `cfg_load(overwrite=...)` accept) mapped to JSON-ready values. A dict that lost
+    keys is replaced as a whole, every other path only names what changed.
+    `base_hash` is the fingerprint of the config the patch was computed against.
+    """
+
+    __slots__ = ("changes", "base_hash")
+
+    def __init__(self, changes: Dict[str, Any], base_hash: Optional[str] = None) -> None:
+        self.changes = changes
+        self.base_hash = base_hash
+
+    def __len__(self) -> int:
+        return len(self.changes)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ConfigPatch):
+            return NotImplemented
+        return self.changes == other.changes and self.base_hash == other.base_hash
+
+    def __repr__(self) -> str:
+        return f"ConfigPatch({self.changes!r}, base_hash={self.base_hash!r})"
+
+    def apply(self, base: TConfig) -> TConfig:
+        """
+        New config with the changes applied to `base`, equal to `from_dict` of the patched
+        dict. Only the branches along changed paths are copied and decoded (running their
+        `__post_init__` again), all others are shared with `base`. Values are type checked
+        like `from_dict` does, a mismatch raises a dacite error.
+        """
+        if self.base_hash is not None:
+            base_hash = base.fingerprint()
+            if base_hash != self.base_hash:
+                raise ValueError(f"Patch was computed against config {self.base_hash}, got {base_hash}")
+        if not self.changes:
+            return base
+        schema = type(base).get_schema()
+        keys = list(self.changes)
+        for key in keys:
+            schema.resolve(key)
+        return overlay(base, build_tree(keys, schema, check_types=True), tuple(self.changes.values()))
+
+    def dumps(self) -> str:
+        return json.dumps({"base": self.base_hash, "set": self.changes}, separators=(",", ":"))
+
+    @classmethod
+    def loads(cls, s: str) -> "ConfigPatch":
+        data = json.loads(s)
+        return cls(data["set"], data.get("base"))
+
+
+def diff(base: "BaseConfig", other: "BaseConfig") -> ConfigPatch:
+    """Minimal patch turning `base` into `other`, see BaseConfig.diff."""
+    if type(base) is not type(other):
+        raise TypeError(f"Cannot diff a {type(base).__name__} against a {type(other).__name__}")
+    serializer = type(base).serializer(compact=True)
+
+    def encode(value: Any) -> Any:
+        if type(value) in _SCALARS:
+            return value
+        return json.loads(serializer.dumps(value))
+
+    changes: Dict[str, Any] = {}
+    _diff(base, other, "", changes, encode)
+    return ConfigPatch(changes, base.fingerprint())
+
+
+def diff_dicts(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """Changed dotted paths between two plain (e.g. JSON) dicts, with the same rules as `diff`."""
+    changes: Dict[str, Any] = {}
+    _diff(old, new, "", changes, _identity)
+    return changes
+
+
+def _diff(old: Any, new: Any, path: str, changes: Dict[str, Any], encode: Callable[[Any], Any]) -> None:
+    if old is new:
+        return  # shared branches, e.g. from Sweep or an earlier patch
+    prefix = path + "." if path else ""
+    if is_dataclass(old) and type(old) is type(new):
+        for f in fields(old):
+            _diff(getattr(old, f.name), getattr(new, f.name), prefix + f.name, changes, encode)
+        return
+    if isinstance(old, dict) and isinstance(new, dict) and _patchable(old, new):
+        for key, value in new.items():
+            if key in old:
+                _diff(old[key], value, prefix + key, changes, encode)
+            else:
+                changes[prefix + key] = encode(value)
+        return
+    if old != new:
+        changes[path] = encode(new)
+
+
+def _patchable(old: dict, new: dict) -> bool:
+    # Patches can add and change dict keys, removing one means replacing the whole dict.
+    return all(isinstance(k, str) and "." not in k for k in new) and all(k in new for k in old)
+
+
+def _identity(value: Any) -> Any:
+    return value
@@ -0,0 +1,101 @@
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Type
+
+from dacite.types import extract_generic, is_optional, is_subclass
+
+from .decoder import DataclassDecoder
+
+import logging
+log = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SchemaField:
+    path: str
+    type: Any
+    converter: Callable[[Any], Any]
+    check: Optional[Callable[[Any], bool]]  # the decoder's type check, None if anything goes
+    nested: bool     # field holds a dataclass, its own fields are listed under `path.`
+    free_form: bool  # field holds a dict or Any, arbitrary deeper keys are accepted
+
+
+class ConfigSchema:
+    """
+    Flat index of every field path of a config class (`nested.inner.x`) to its type
+    and converter. Built once per class from its compiled decoder.
+    """
+
+    def __init__(self, data_class: Type, fields: Dict[str, SchemaField]) -> None:
+        self.data_class = data_class
+        self.fields = fields
+        self.nested_names: List[str] = [p for p, f in fields.items() if f.nested and "." not in p]
+
+    def __contains__(self, path: str) -> bool:
+        return self.find(path) is not None
+
+    def __len__(self) -> int:
+        return len(self.fields)
+
+    def find(self, path: str) -> Optional[SchemaField]:
+        """
+        Returns the field for `path`, or for keys below a dict/Any field the field holding them.
+        Returns None for unknown paths.
+        """
+        entry = self.fields.get(path)
+        if entry is not None:
+            return entry
+
+        # Only keys reaching into free-form dicts end up here, walk back to the container.
+        prefix = path
+        while "." in prefix:
+            prefix = prefix.rsplit(".", 1)[0]
+            entry = self.fields.get(prefix)
+            if entry is not None:
+                return entry if entry.free_form else None
+        return None
+
+    def resolve(self, path: str) -> SchemaField:
+        """Like `find`, but raises a KeyError naming the closest known paths."""
+        entry = self.find(path)
+        if entry is None:
+            from difflib import get_close_matches
+            hint = get_close_matches(path, self.fields.keys(), n=3)
+            raise KeyError(
+                f"Unknown config path '{path}' for {self.data_class.__name__}"
+                + (f", did you mean {', '.join(hint)}?" if hint else "")
+            )
+        return entry
+
+
+def build_schema(decoder: DataclassDecoder) -> ConfigSchema:
+    fields: Dict[str, SchemaField] = {}
+    _collect(decoder, "", fields, (decoder.data_class,))
+    return ConfigSchema(decoder.data_class, fields)
+
+
+def _collect(decoder: DataclassDecoder, prefix: str, fields: Dict[str, SchemaField], chain: tuple) -> None:
+    for name, _, build, check, field_type, _, _ in decoder.fields:
+        path = prefix + name
+        child = decoder.children.get(name)
+        fields[path] = SchemaField(
+            path=path,
+            type=field_type,
+            converter=build or _identity,
+            check=check,
+            nested=child is not None,
+            free_form=_is_free_form(field_type),
+        )
+        # Self-referencing dataclasses would flatten forever, only descend into new classes.
+        if child is not None and child.data_class not in chain:
+            _collect(child, path + ".", fields, chain + (child.data_class,))
+
+
+def _is_free_form(type_: Any) -> bool:
+    if is_optional(type_) and len(extract_generic(type_)) == 2:
+        type_ = extract_generic(type_)[0]
+    return type_ is Any or is_subclass(type_, Mapping)
+
+
+def _identity(value: Any) -> Any:
+    return value
@@ -0,0 +1,226 @@
+import json
+from dataclasses import fields, is_dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from functools import lru_cache
+from json.encoder import encode_basestring_ascii  # type: ignore
+from pathlib import Path
+from typing import IO, Any, Callable, Dict, List, Optional, Type
+from uuid import UUID
+
+from .configuration import CustomJSONEncoder
+
+import logging
+log = logging.getLogger(__name__)
+
+
+INFINITY = float("inf")
+_FLUSH_CHUNKS = 4096  # pending chunks before they are written out
+
+
+class ConfigSerializer:
+    """
+    Writes dataclasses as JSON by walking the live objects, without the intermediate
+    `asdict` copy. Output is identical to
+    `json.dump(asdict(obj), fp, indent=indent, cls=json_encoder)`, `indent=None` gives
+    compact output. Handlers are looked up per exact type and resolved once per type.
+    """
+
+    def __init__(self, json_encoder: Type[json.JSONEncoder] = CustomJSONEncoder, indent: Optional[int] = 2) -> None:
+        self.indent = indent
+        self.item_separator = ","
+        self.key_separator = ": " if indent is not None else ":"
+        self._default = json_encoder().default
+        self._custom_default = json_encoder is CustomJSONEncoder
+        self._handlers: Dict[type, Callable[[Any, int, List[str]], None]] = {
+            str: self._encode_str,
+            int: self._encode_int,
+            bool: self._encode_bool,
+            float: self._encode_float,
+            type(None): self._encode_none,
+            list: self._encode_list,
+            tuple: self._encode_list,
+            dict: self._encode_dict,
+        }
+
+    def dumps(self, obj: Any) -> str:
+        parts: List[str] = []
+        self.dump(obj, _Collector(parts))
+        return "".join(parts)
+
+    def dump(self, obj: Any, fp: IO[str]) -> None:
+        """Stream `obj` into `fp`, writing whenever enough chunks are pending."""
+        chunks = _ChunkBuffer(fp.write)
+        self._encode(obj, 0, chunks)
+        chunks.flush()
+
+    def _encode(self, o: Any, level: int, chunks: List[str]) -> None:
+        handler = self._handlers.get(type(o))
+        if handler is None:
+            handler = self._handlers[type(o)] = self._resolve(type(o))
+        handler(o, level, chunks)
+
+    def _resolve(self, tp: type) -> Callable[[Any, int, List[str]], None]:
+        # Same precedence as json's encoder, so subclasses (IntEnum, StrEnum, ...) behave identically.
+        if issubclass(tp, str):
+            return self._encode_str
+        if issubclass(tp, bool):
+            return self._encode_bool
+        if issubclass(tp, int):
+            return self._encode_int
+        if issubclass(tp, float):
+            return self._encode_float
+        if issubclass(tp, (list, tuple)):
+            return self._encode_list
+        if issubclass(tp, dict):
+            return self._encode_dict
+        if is_dataclass(tp):
+            return self._encode_dataclass
+        convert = _custom_converter(tp) if self._custom_default else None
+        if convert is None:
+            convert = self._default
+
+        def encode_default(o: Any, level: int, chunks: List[str]) -> None:
+            self._encode(convert(o), level, chunks)
+
+        return encode_default
+
+    # scalars
+    def _encode_str(self, o: str, level: int, chunks: List[str]) -> None:
+        chunks.append(encode_basestring_ascii(o))
+
+    def _encode_int(self, o: int, level: int, chunks: List[str]) -> None:
+        chunks.append(int.__repr__(o))
+
+    def _encode_bool(self, o: bool, level: int, chunks: List[str]) -> None:
+        chunks.append("true" if o else "false")
+
+    def _encode_none(self, o: None, level: int, chunks: List[str]) -> None:
+        chunks.append("null")
+
+    def _encode_float(self, o: float, level: int, chunks: List[str]) -> None:
+        chunks.append(_floatstr(o))
+
+    # containers
+    def _encode_list(self, o: Any, level: int, chunks: List[str]) -> None:
+        if not o:
+            chunks.append("[]")
+            return
+        newline_indent, closing = self._newlines(level + 1)
+        separator = self.item_separator + newline_indent
+        chunks.append("[" + newline_indent)
+        first = True
+        for value in o:
+            if not first:
+                chunks.append(separator)
+            first = False
+            self._encode(value, level + 1, chunks)
+            if len(chunks) >= _FLUSH_CHUNKS:
+                chunks.flush()
+        chunks.append(closing + "]")
+
+    def _encode_dict(self, o: dict, level: int, chunks: List[str]) -> None:
+        if not o:
+            chunks.append("{}")
+            return
+        self._encode_items(o.items(), level, chunks)
+
+    def _encode_dataclass(self, o: Any, level: int, chunks: List[str]) -> None:
+        names = _field_names(type(o))
+        if not names:
+            chunks.append("{}")
+            return
+        self._encode_items(((name, getattr(o, name)) for name in names), level, chunks)
+
+    def _encode_items(self, items, level: int, chunks: List[str]) -> None:
+        newline_indent, closing = self._newlines(level + 1)
+        separator = self.item_separator + newline_indent
+        key_separator = self.key_separator
+        chunks.append("{" + newline_indent)
+        first = True
+        for key, value in items:
+            if not first:
+                chunks.append(separator)
+            first = False
+            chunks.append(_encode_key(key) + key_separator)
+            self._encode(value, level + 1, chunks)
+            if len(chunks) >= _FLUSH_CHUNKS:
+                chunks.flush()
+        chunks.append(closing + "}")
+
+    def _newlines(self, level: int):
+        if self.indent is None:
+            return "", ""
+        return "\n" + " " * (self.indent * level), "\n" + " " * (self.indent * (level - 1))
+
+
+@lru_cache(maxsize=None)
+def get_serializer(json_encoder: Type[json.JSONEncoder] = CustomJSONEncoder, indent: Optional[int] = 2) -> ConfigSerializer:
+    return ConfigSerializer(json_encoder, indent)
+
+
+class _ChunkBuffer(list):
+    """Pending output chunks, containers flush them once enough have piled up."""
+
+    def __init__(self, write: Callable[[str], Any]) -> None:
+        super().__init__()
+        self.write = write
+
+    def flush(self) -> None:
+        if self:
+            self.write("".join(self))
+            self.clear()
+
+
+class _Collector:
+    def __init__(self, parts: List[str]) -> None:
+        self.write = parts.append
+
+
+@lru_cache(maxsize=None)
+def _field_names(data_class: type) -> tuple:
+    return tuple(f.name for f in fields(data_class))
+
+
+def _custom_converter(tp: type) -> Optional[Callable[[Any], Any]]:
+    """The branch CustomJSONEncoder.default takes for instances of `tp`, decided once."""
+    if issubclass(tp, (datetime, date)):
+        return lambda o: o.isoformat()
+    if issubclass(tp, (Decimal, UUID)):
+        return str
+    if issubclass(tp, Enum):
+        return lambda o: o.value
+    if issubclass(tp, (set, frozenset)):
+        return list
+    if issubclass(tp, Path):
+        return str
+    if issubclass(tp, type):
+        return str
+    return None
+
+
+def _floatstr(o: float) -> str:
+    if o != o:
+        return "NaN"
+    if o == INFINITY:
+        return "Infinity"
+    if o == -INFINITY:
+        return "-Infinity"
+    return float.__repr__(o)
+
+
+def _encode_key(key: Any) -> str:
+    if isinstance(key, str):
+        return encode_basestring_ascii(key)
+    if isinstance(key, float):
+        return '"' + _floatstr(key) + '"'
+    if key is True:
+        return '"true"'
+    if key is False:
+        return '"false"'
+    if key is None:
+        return '"null"'
+    if isinstance(key, int):
+        return '"' + int.__repr__(key) + '"'
+    raise TypeError(f"keys must be str, int, float, bool or None, not {key.__class__.__name__}")
@@ -0,0 +1,227 @@
+import itertools
+import re
+from dataclasses import dataclass, fields
+from typing import Any, Callable, Collection, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from .decoder import DataclassDecoder
+
+import logging
+log = logging.getLogger(__name__)
+
+# Key in `dataclasses.field(metadata=...)` holding the constraints of a field.
+METADATA_KEY = "foundation.constraints"
+
+
+@dataclass(frozen=True)
+class Violation:
+    path: str
+    message: str
+    index: Optional[int] = None  # row of a batch, None for single configs and shared values
+
+    def __str__(self) -> str:
+        row = f"[{self.index}] " if self.index is not None else ""
+        return f"{row}{self.path}: {self.message}"
+
+
+class ValidationError(ValueError):
+    def __init__(self, violations: List[Violation]) -> None:
+        self.violations = violations
+        super().__init__(f"{len(violations)} constraint violation(s):\n" + "\n".join(f"  {v}" for v in violations))
+
+
+@dataclass(frozen=True)
+class Check:
+    """Cross-field constraint: `predicate` is called with the values at `paths`."""
+    paths: Tuple[str, ...]
+    predicate: Callable[..., bool]
+    message: str
+
+
+def constraint(
+    ge: Any = None,
+    gt: Any = None,
+    le: Any = None,
+    lt: Any = None,
+    choices: Optional[Collection[Any]] = None,
+    regex: Optional[str] = None,
+    required: bool = False,
+) -> Dict[str, Any]:
+    """
+    Field metadata declaring constraints, e.g. `lr: float = field(default=0.1, metadata=constraint(gt=0))`.
+    Only `required` rejects None, the other constraints skip it.
+    """
+    spec = {"ge": ge, "gt": gt, "le": le, "lt": lt, "choices": choices, "regex": regex, "required": required}
+    return {METADATA_KEY: {k: v for k, v in spec.items() if v is not None and v is not False}}
+
+
+class _FieldChecker:
+    """All constraints of one field, compiled into a single pass over a column."""
+
+    def __init__(self, path: str, spec: Dict[str, Any]) -> None:
+        self.path = path
+        self.required = spec.get("required", False)
+        self.conditions: List[Tuple[str, str]] = []  # (expression on `v`, message)
+        names: Dict[str, Any] = {}
+        for op, symbol in (("ge", ">="), ("gt", ">"), ("le", "<="), ("lt", "<")):
+            if op in spec:
+                names[f"_{op}"] = spec[op]
+                self.conditions.append((f"v {symbol} _{op}", f"must be {symbol} {spec[op]!r}"))
+        if "choices" in spec:
+            names["_choices"] = frozenset(spec["choices"]) if _hashable(spec["choices"]) else list(spec["choices"])
+            self.conditions.append(("v in _choices", f"must be one of {sorted(spec['choices'], key=repr)}"))
+        if "regex" in spec:
+            names["_match"] = re.compile(spec["regex"]).fullmatch
+            self.conditions.append(("_match(v) is not None", f"must match {spec['regex']!r}"))
+
+        # One comprehension with all conditions finds the bad rows, messages are only
+        # worked out for those.
+        test = " and ".join(f"({expr})" for expr, _ in self.conditions) or "True"
+        none_rows = "v is None" if self.required else "False"
+        source = (
+            "def bad_rows(column):\n"
+            f"    return [i for i, v in enumerate(column) if ({none_rows}) or (v is not None and not ({test}))]\n"
+        )
+        exec(compile(source, f"<constraints {path}>", "exec"), names)
+        self._bad_rows: Callable[[Iterable[Any]], List[int]] = names["bad_rows"]
+        self._single = [(eval(f"lambda v: {expr}", dict(names)), message) for expr, message in self.conditions]
+
+    def check(self, column: Sequence[Any], index: Callable[[int], Optional[int]]) -> List[Violation]:
+        try:
+            rows = self._bad_rows(column)
+        except TypeError:  # e.g. comparing a str with a number, find out row by row
+            rows = list(range(len(column)))
+        violations = []
+        for i in rows:
+            for message in self.messages(column[i]):
+                violations.append(Violation(self.path, message, index(i)))
+        return violations
+
+    def messages(self, value: Any) -> List[str]:
+        if value is None:
+            return ["is required"] if self.required else []
+        messages = []
+        for test, message in self._single:
+            try:
+                ok = test(value)
+            except TypeError:
+                ok = False
+                message = f"{message}, got {type(value).__name__}"
+            if not ok:
+                messages.append(message)
+        return messages
+
+
+class Validator:
+    """
+    Constraints of a config class compiled once: field checks per dotted path, plus the
+    cross-field `checks` of the class. Works on configs and on column-oriented batches.
+    """
+
+    def __init__(self, data_class: type, field_checkers: List[_FieldChecker], checks: Sequence[Check]) -> None:
+        self.data_class = data_class
+        self.field_checkers = field_checkers
+        self.checks = tuple(checks)
+        self.paths = sorted({c.path for c in field_checkers} | {p for c in checks for p in c.paths})
+
+    def __bool__(self) -> bool:
+        return bool(self.field_checkers or self.checks)
+
+    def check(self, cfg: Any) -> List[Violation]:
+        return self.check_columns({path: [get_path(cfg, path)] for path in self.paths}, rows=1, index=_no_index)
+
+    def check_batch(self, columns: Mapping[str, Sequence[Any]], base: Any = None) -> List[Violation]:
+        """
+        Validate many configs at once. `columns` maps dotted paths to one value per config,
+        paths without a column take their value from `base` (default: the class defaults).
+        Violations of such shared values are reported once, without an index.
+        """
+        lengths = {len(c) for c in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"All columns need the same length, got {sorted(lengths)}")
+        rows = lengths.pop() if lengths else 1
+        if base is None and any(path not in columns for path in self.paths):
+            base = self.data_class()
+        full = {path: columns[path] if path in columns else _Broadcast(get_path(base, path), rows) for path in self.paths}
+        return self.check_columns(full, rows, _row_index)
+
+    def check_columns(self, columns: Mapping[str, Sequence[Any]], rows: int, index: Callable[[int], Optional[int]]) -> List[Violation]:
+        violations: List[Violation] = []
+        for checker in self.field_checkers:
+            column = columns[checker.path]
+            if isinstance(column, _Broadcast):
+                violations.extend(checker.check([column.value], _no_index))
+            else:
+                violations.extend(checker.check(column, index))
+        for check in self.checks:
+            cols = [columns[p] for p in check.paths]
+            if all(isinstance(c, _Broadcast) for c in cols):
+                cols, row_index = [[c.value] for c in cols], _no_index  # type: ignore
+            else:
+                row_index = index
+            for i, values in enumerate(zip(*cols)):
+                try:
+                    ok = check.predicate(*values)
+                    message = check.message
+                except Exception as e:
+                    ok, message = False, f"{check.message} ({type(e).__name__}: {e})"
+                if not ok:
+                    violations.append(Violation(", ".join(check.paths), message, row_index(i)))
+        return violations
+
+
+class _Broadcast(Sequence):
+    """The same value for every row of a batch."""
+
+    def __init__(self, value: Any, rows: int) -> None:
+        self.value = value
+        self.rows = rows
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def __getitem__(self, i):  # type: ignore
+        return self.value
+
+    def __iter__(self):
+        return itertools.repeat(self.value, self.rows)
+
+
+def compile_validator(decoder: DataclassDecoder, checks: Sequence[Check] = ()) -> Validator:
+    checkers: List[_FieldChecker] = []
+    _collect(decoder, "", checkers, (decoder.data_class,))
+    return Validator(decoder.data_class, checkers, checks)
+
+
+def _collect(decoder: DataclassDecoder, prefix: str, checkers: List[_FieldChecker], chain: tuple) -> None:
+    for f in fields(decoder.data_class):
+        spec = f.metadata.get(METADATA_KEY)
+        if spec:
+            checkers.append(_FieldChecker(prefix + f.name, spec))
+        child = decoder.children.get(f.name)
+        if child is not None and child.data_class not in chain:
+            _collect(child, prefix + f.name + ".", checkers, chain + (child.data_class,))
+
+
+def get_path(obj: Any, path: str) -> Any:
+    """Value at a dotted path through dataclasses and dicts, None if a parent is None or missing."""
+    for part in path.split("."):
+        if obj is None:
+            return None
+        obj = obj.get(part) if isinstance(obj, dict) else getattr(obj, part, None)
+    return obj
+
+
+def _hashable(values: Collection[Any]) -> bool:
+    try:
+        frozenset(values)
+    except TypeError:
+        return False
+    return True
+
+
+def _no_index(i: int) -> None:
+    return None
+
+
+def _row_index(i: int) -> int:
+    return i
@@ -0,0 +1,215 @@
+import json
+import logging
+import os
+import select
+import struct
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Generic, List, Optional, Tuple, TypeVar
+
+from .config import BaseConfig
+from .utils.overlay import build_tree, overlay
+from .utils.patch import diff_dicts
+
+log = logging.getLogger(__name__)
+
+TConfig = TypeVar("TConfig", bound="BaseConfig")
+Callback = Callable[[List[str], Any], None]
+
+# inotify(7) constants, there is no binding in the standard library.
+_IN_MODIFY = 0x002
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_IN_EVENT = struct.Struct("iIII")
+
+
+class ConfigWatcher(Generic[TConfig]):
+    """
+    Reloads a config when its file changes, by default the file of
+    `cfg.get_cfg_file_path("load")`. The new JSON is diffed against the previous
+    version of the file and only the changed sub-trees are decoded and swapped in,
+    every other branch stays shared with the previous config. Writes arriving within
+    `debounce` seconds of each other are handled as one reload.
+
+    Callbacks get the changed dotted paths and the new config. `config` is replaced,
+    never mutated, so references to an older config stay consistent. Fields that
+    differ from the file (e.g. command line overrides) are kept until the file changes
+    them. Uses inotify on Linux and checks the file every `interval` seconds elsewhere.
+    """
+
+    def __init__(
+        self,
+        cfg: TConfig,
+        path: Optional[Path] = None,
+        interval: float = 1.0,
+        debounce: float = 0.1,
+        use_inotify: Optional[bool] = None,
+    ) -> None:
+        self.path = Path(path) if path is not None else cfg.get_cfg_file_path("load")
+        self.interval = interval
+        self.debounce = debounce
+        self.config = cfg
+        self.reloads = 0
+        self._schema = type(cfg).get_schema()
+        self._callbacks: List[Callback] = []
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._data, self._raw = self._read()
+        self._stat = _stat(self.path)
+        self._inotify = _Inotify.open(self.path) if use_inotify is not False else None
+        if use_inotify and self._inotify is None:
+            raise OSError("inotify is not available on this system")
+
+    def __enter__(self) -> "ConfigWatcher[TConfig]":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def subscribe(self, callback: Callback) -> None:
+        self._callbacks.append(callback)
+
+    def start(self) -> "ConfigWatcher[TConfig]":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="config-watcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+    def reload(self) -> List[str]:
+        """Apply the current file content now. Returns the changed paths."""
+        with self._lock:
+            data, raw = self._read()
+            if data == self._data or raw is None:
+                return []
+            changes = {path: value for path, value in diff_dicts(self._raw or {}, raw).items() if self._known(path)}
+            if changes:
+                try:
+                    self.config = self._apply(changes)
+                except Exception as e:
+                    log.warning("Keeping the current config, %s does not decode: %s" % (self.path, e))
+                    return []
+            self._data, self._raw = data, raw
+            self.reloads += 1
+        paths = list(changes)
+        if paths:
+            log.info("Reloaded %s, changed: %s" % (self.path, ", ".join(paths)))
+            for callback in list(self._callbacks):
+                try:
+                    callback(paths, self.config)
+                except Exception:
+                    log.exception("Config reload callback %r failed" % (callback,))
+        return paths
+
+    def _apply(self, changes: Dict[str, Any]) -> TConfig:
+        if "" in changes:  # the top level lost keys, nothing to share
+            return type(self.config).from_dict(changes[""])
+        keys = list(changes)
+        return overlay(self.config, build_tree(keys, self._schema, check_types=True), tuple(changes.values()))
+
+    def _known(self, path: str) -> bool:
+        # Like from_dict, keys that are not fields are ignored.
+        return path == "" or path in self._schema
+
+    def _read(self) -> Tuple[Optional[bytes], Optional[Dict[str, Any]]]:
+        try:
+            data = self.path.read_bytes()
+        except FileNotFoundError:
+            return None, None
+        try:
+            raw = json.loads(data)
+        except ValueError as e:
+            # Most likely caught mid-write, the write completing triggers another reload.
+            log.debug("Could not parse %s: %s" % (self.path, e))
+            return data, None
+        return data, raw if isinstance(raw, dict) else None
+
+    # change detection
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            if not self._wait(self.interval):
+                continue
+            while self._wait(self.debounce):  # coalesce bursts of writes
+                pass
+            try:
+                self.reload()
+            except Exception:
+                log.exception("Reloading %s failed" % self.path)
+
+    def _wait(self, timeout: float) -> bool:
+        """Whether the file changed within `timeout` seconds."""
+        if self._inotify is not None:
+            return self._inotify.wait(timeout)
+        if self._stopping.wait(timeout):
+            return False
+        stat = _stat(self.path)
+        changed = stat != self._stat
+        self._stat = stat
+        return changed
+
+
+def _stat(path: Path) -> Optional[Tuple[int, int, int]]:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_ino, st.st_mtime_ns, st.st_size
+
+
+class _Inotify:
+    """Watches the directory of a file, so atomic replaces by editors are seen too."""
+
+    def __init__(self, libc: Any, fd: int, name: bytes) -> None:
+        self._libc = libc
+        self.fd = fd
+        self.name = name
+
+    @classmethod
+    def open(cls, path: Path) -> Optional["_Inotify"]:
+        if not sys.platform.startswith("linux"):
+            return None
+        import ctypes
+        import ctypes.util
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        except (OSError, AttributeError):
+            return None
+        if fd < 0:
+            return None
+        mask = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE
+        if libc.inotify_add_watch(fd, os.fsencode(path.parent), mask) < 0:
+            os.close(fd)
+            return None
+        return cls(libc, fd, os.fsencode(path.name))
+
+    def wait(self, timeout: float) -> bool:
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return False
+        try:
+            buffer = os.read(self.fd, 65536)
+        except BlockingIOError:
+            return False
+        offset = 0
+        changed = False
+        while offset + _IN_EVENT.size <= len(buffer):
+            _, _, _, length = _IN_EVENT.unpack_from(buffer, offset)
+            name = buffer[offset + _IN_EVENT.size:offset + _IN_EVENT.size + length].rstrip(b"\0")
+            changed = changed or name == self.name
+            offset += _IN_EVENT.size + length
+        return changed
+
+    def close(self) -> None:
+        os.close(self.fd)
@@ -0,0 +1,74 @@
+import logging
+import multiprocessing
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict
+
+from foundation import BaseConfig, ConfigBroadcast, ConfigSubscriber
+
+
+@dataclass
+class Model:
+    layers: int = 12
+    hidden: int = 768
+    dropout: float = 0.1
+
+
+@dataclass
+class BenchConfig(BaseConfig):
+    model: Model = field(default_factory=Model)
+    tables: Dict[str, Dict[str, float]] = field(default_factory=dict)
+
+
+OVERWRITE = {"model.layers": 24, "model.dropout": 0.2}
+
+
+def worker_cfg_load(path, queue):
+    start = time.perf_counter()
+    BenchConfig.cfg_load(path, overwrite=OVERWRITE)
+    queue.put(time.perf_counter() - start)
+
+
+def worker_broadcast(name, queue):
+    start = time.perf_counter()
+    with ConfigSubscriber(name, BenchConfig) as sub:
+        sub.get()
+    queue.put(time.perf_counter() - start)
+
+
+def run(ctx, target, arg, workers: int) -> float:
+    queue = ctx.Queue()
+    procs = [ctx.Process(target=target, args=(arg, queue)) for _ in range(workers)]
+    for p in procs:
+        p.start()
+    times = [queue.get() for _ in procs]
+    for p in procs:
+        p.join()
+    return sum(times) / len(times)
+
+
+def main(workers: int = 8) -> None:
+    logging.disable(logging.WARNING)  # cfg_load warns once per worker
+    ctx = multiprocessing.get_context("fork")
+    tables = {f"t{i}": {f"k{j}": j / 7 for j in range(200)} for i in range(50)}
+    cfg = BenchConfig(tables=tables, overwrite_from_cmd=True)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "config.json"
+        cfg.save(path)
+        # What the parent publishes is the config after overrides were applied.
+        resolved = BenchConfig.cfg_load(path, overwrite=OVERWRITE)
+
+        load = run(ctx, worker_cfg_load, path, workers)
+        with ConfigBroadcast(resolved) as broadcast:
+            shared = run(ctx, worker_broadcast, broadcast.name, workers)
+
+    print(f"{workers} workers, {path.name} of {len(cfg.serializer().dumps(cfg)) / 1024:.0f} KiB")
+    print(f"cfg_load per worker   {load * 1000:8.2f} ms")
+    print(f"broadcast per worker  {shared * 1000:8.2f} ms   x{load / shared:.2f}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
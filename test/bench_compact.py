@@ -0,0 +1,97 @@
+import gc
+import sys
+import tracemalloc
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, List
+
+from foundation import BaseConfig
+from foundation.utils import ConfigInterner, slotted
+
+
+@dataclass
+class Optimizer:
+    name: str = "adam"
+    lr: float = 1e-3
+    betas: tuple = (0.9, 0.999)
+
+
+@dataclass
+class Data:
+    root: Path = Path("/data/imagenet")
+    batch_size: int = 256
+
+
+@dataclass
+class BenchConfig(BaseConfig):
+    optimizer: Optimizer = field(default_factory=Optimizer)
+    data: Data = field(default_factory=Data)
+    seed: int = 0
+
+
+@slotted
+@dataclass(frozen=True)
+class SlottedOptimizer:
+    name: str = "adam"
+    lr: float = 1e-3
+    betas: tuple = (0.9, 0.999)
+
+
+@slotted
+@dataclass(frozen=True)
+class SlottedData:
+    root: Path = Path("/data/imagenet")
+    batch_size: int = 256
+
+
+@dataclass
+class SlottedBenchConfig(BaseConfig):
+    optimizer: SlottedOptimizer = field(default_factory=SlottedOptimizer)
+    data: SlottedData = field(default_factory=SlottedData)
+    seed: int = 0
+
+
+def rows(n: int) -> List[dict]:
+    # What a sweep log or a ConfigStore hands back: one decoded dict per run.
+    base = BenchConfig(git_hash="3f1c2a9d8e7b6c5d4e3f2a1b0c9d8e7f6a5b4c3d", current_run_dir=Path("/runs"))
+    template = base.serializer(compact=True).dumps(base)
+    import json
+    out = []
+    for i in range(n):
+        d = json.loads(template)
+        d["seed"] = i
+        d["optimizer"]["lr"] = [1e-3, 3e-4, 1e-4][i % 3]
+        out.append(d)
+    return out
+
+
+def measure(build: Callable[[], list]) -> float:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    configs = build()
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return used / len(configs)
+
+
+def main(n: int = 20_000) -> None:
+    data = rows(n)
+    plain = measure(lambda: [BenchConfig.from_dict(d) for d in data])
+    slots = measure(lambda: [SlottedBenchConfig.from_dict(d) for d in data])
+
+    def interned(config_class, share_mutable):
+        interner = ConfigInterner(share_mutable=share_mutable)
+        return lambda: [interner(config_class.from_dict(d)) for d in data]
+
+    print(f"{n} configs, bytes per config under tracemalloc")
+    print(f"from_dict                          {plain:8.0f}")
+    print(f"slotted frozen nested classes      {slots:8.0f}")
+    print(f"interned                           {measure(interned(BenchConfig, False)):8.0f}")
+    print(f"interned, slotted nested           {measure(interned(SlottedBenchConfig, False)):8.0f}")
+    print(f"interned, shared mutable           {measure(interned(BenchConfig, True)):8.0f}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,35 @@
+import logging
+import sys
+import time
+
+from foundation.log import create_formatter
+
+
+def records_per_second(formatter: logging.Formatter, records, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for record in records:
+            formatter.format(record)
+        best = min(best, time.perf_counter() - start)
+    return len(records) / best
+
+
+def bench(n: int = 100_000):
+    now = time.time()
+    records = [
+        logging.LogRecord("bench", logging.INFO, "/src/train_loop.py", i % 500, "step %d loss %.4f", (i, 0.5), None)
+        for i in range(n)
+    ]
+    for i, record in enumerate(records):  # spread over a few seconds like a real run
+        record.created = now + i / 20_000
+        record.msecs = (record.created - int(record.created)) * 1000
+
+    for colour in (False, True):
+        current = records_per_second(create_formatter(colour), records)
+        fast = records_per_second(create_formatter(colour, fast=True), records)
+        print(f"colour={colour!s:<5}  current {current:>12,.0f} rec/s   fast {fast:>12,.0f} rec/s   x{fast / current:.2f}")
+
+
+if __name__ == "__main__":
+    sys.exit(bench())
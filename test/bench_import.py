@@ -0,0 +1,48 @@
+import os
+import re
+import subprocess
+import sys
+from typing import Optional
+
+# Budget for `import foundation` in microseconds, unset means no check (timing depends on the machine).
+BUDGET_ENV = "FOUNDATION_IMPORT_BUDGET_US"
+
+
+def import_time_us(module: str = "foundation", repeat: int = 5) -> int:
+    """Best cumulative import time of `module` in a fresh interpreter, as reported by -X importtime."""
+    best = None
+    for _ in range(repeat):
+        stderr = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"], capture_output=True, text=True, check=True
+        ).stderr
+        match = re.search(rf"^import time:\s+\d+ \|\s+(\d+) \| {re.escape(module)}$", stderr, re.MULTILINE)
+        assert match, stderr
+        us = int(match.group(1))
+        best = us if best is None else min(best, us)
+    return best  # type: ignore
+
+
+def import_budget_us() -> Optional[int]:
+    budget = os.environ.get(BUDGET_ENV)
+    return int(budget) if budget else None
+
+
+def bench():
+    for module in ("foundation", "foundation.utils", "foundation.log"):
+        print(f"import {module:<18} {import_time_us(module):>8,} us")
+    # For comparison, what the lazy namespaces avoid on import.
+    for module in ("typing", "json", "dacite", "colorlog"):
+        print(f"import {module:<18} {import_time_us(module):>8,} us")
+
+    budget = import_budget_us()
+    if budget is not None:
+        us = import_time_us("foundation")
+        if us > budget:
+            print(f"import foundation took {us:,} us, over the budget of {budget:,} us ({BUDGET_ENV})")
+            return 1
+        print(f"import foundation took {us:,} us, within the budget of {budget:,} us")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(bench())
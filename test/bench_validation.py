@@ -0,0 +1,44 @@
+import sys
+import time
+from dataclasses import dataclass, field
+from itertools import islice
+
+from foundation import BaseConfig, Sweep
+from foundation.utils import Check, constraint
+
+
+@dataclass
+class Optimizer:
+    name: str = field(default="adam", metadata=constraint(choices=("adam", "sgd")))
+    lr: float = field(default=0.1, metadata=constraint(gt=0, le=1))
+
+
+@dataclass
+class BenchConfig(BaseConfig):
+    optimizer: Optimizer = field(default_factory=Optimizer)
+    warmup: int = field(default=0, metadata=constraint(ge=0))
+    steps: int = 100
+    checks = (Check(("warmup", "steps"), lambda warmup, steps: warmup < steps, "warmup must be shorter than steps"),)
+
+
+def bench(n_lr: int = 100, n_warmup: int = 1000):
+    sweep = Sweep(BenchConfig()).grid({"optimizer.lr": [i / n_lr for i in range(n_lr)], "warmup": list(range(0, 2 * n_warmup, 2))})
+
+    start = time.perf_counter()
+    violations = sweep.validate()
+    batch = time.perf_counter() - start
+
+    validator = BenchConfig.get_validator()
+    sample = list(islice(sweep, 1000))
+    start = time.perf_counter()
+    for cfg in sample:
+        validator.check(cfg)
+    single = (time.perf_counter() - start) / len(sample) * len(sweep)
+
+    print(f"{len(sweep):,} configs, {len(violations):,} violations")
+    print(f"validate_batch        {batch:8.3f} s")
+    print(f"validate one by one   {single:8.3f} s (extrapolated)   x{single / batch:.1f}")
+
+
+if __name__ == "__main__":
+    sys.exit(bench())
@@ -0,0 +1,47 @@
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import pytest
+
+from foundation import BaseConfig
+from foundation.utils.configuration import set_nested
+
+
+@dataclass
+class Inner:
+    x: int = 1
+    path: Path = Path("data")
+
+
+@dataclass
+class SampleConfig(BaseConfig):
+    lr: float = 0.1
+    inner: Inner = field(default_factory=Inner)
+    other: Inner = field(default_factory=Inner)
+
+
+@pytest.fixture
+def saved(tmp_path):
+    """A SampleConfig saved as `run` in tmp_path, load and save paths are the same file."""
+    cfg = SampleConfig(current_run_dir=tmp_path, cfg_file_name_load="run", cfg_file_name_save="run", overwrite_from_cmd=True, extras={"a": {"b": 1}})
+    cfg.save()
+    return cfg
+
+
+@dataclass
+class DerivedConfig(BaseConfig):
+    """`area` is derived from `width` in __post_init__."""
+    width: int = 2
+    area: int = 0
+
+    def __post_init__(self):
+        super().__post_init__()
+        self.area = self.width * self.width
+
+
+def decoded(base, changes):
+    """`base` decoded from its dict with the dotted `changes` set, what Sweep and patch must match."""
+    data = base.to_dict()
+    for key, value in changes.items():
+        set_nested(data, key, value)
+    return type(base).from_dict(data)
@@ -0,0 +1,54 @@
+import multiprocessing
+import sys
+
+import pytest
+
+from conftest import Inner, SampleConfig
+from foundation import BaseConfig, ConfigBroadcast, ConfigSubscriber
+
+
+def read_in_worker(name, queue):
+    with ConfigSubscriber(name, SampleConfig) as sub:
+        cfg = sub.get()
+        queue.put((sub.version, cfg.lr, cfg.inner.x, str(cfg.inner.path)))
+
+
+def test_subscriber_materializes_config():
+    cfg = SampleConfig(lr=0.5, extras={"a": [1, 2]})
+    with ConfigBroadcast(cfg) as broadcast, ConfigSubscriber(broadcast.name, SampleConfig) as sub:
+        assert sub.version == broadcast.version == 1
+        loaded = sub.get()
+        assert loaded == cfg
+        assert sub.get() is loaded
+        assert not sub.changed()
+
+
+def test_update_bumps_version():
+    with ConfigBroadcast(SampleConfig()) as broadcast, ConfigSubscriber(broadcast.name, SampleConfig) as sub:
+        first = sub.get()
+        assert broadcast.update(SampleConfig(lr=0.9)) == 2
+        assert sub.changed()
+        assert sub.get().lr == 0.9 and first.lr == 0.1
+        assert sub.version == 2
+
+
+def test_update_checks_capacity_and_type():
+    with ConfigBroadcast(SampleConfig(), capacity=1024) as broadcast:
+        with pytest.raises(ValueError):
+            broadcast.update(SampleConfig(extras={"big": "x" * 2048}))
+        with pytest.raises(TypeError):
+            broadcast.update(BaseConfig())  # type: ignore
+        assert broadcast.version == 1
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="fork start method needed")
+def test_workers_read_without_unlinking():
+    ctx = multiprocessing.get_context("fork")
+    with ConfigBroadcast(SampleConfig(lr=0.25, inner=Inner(x=3))) as broadcast:
+        queue = ctx.Queue()
+        for _ in range(2):
+            worker = ctx.Process(target=read_in_worker, args=(broadcast.name, queue))
+            worker.start()
+            worker.join(10)
+            assert worker.exitcode == 0
+            assert queue.get(timeout=1) == (1, 0.25, 3, "data")
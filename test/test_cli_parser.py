@@ -0,0 +1,94 @@
+from dataclasses import dataclass, field
+from enum import Enum
+from pathlib import Path
+from typing import List, Optional
+
+import pytest
+
+from foundation import BaseCLIParser, BaseConfig
+
+
+class Mode(Enum):
+    TRAIN = "train"
+    EVAL = "eval"
+
+
+class Level(Enum):
+    LOW = 1
+    HIGH = 2
+
+
+@dataclass
+class Inner:
+    x: int = 1
+    path: Optional[Path] = None
+
+
+@dataclass
+class Model:
+    depth: int = 4
+    dropout: float = 0.1
+    use_bias: bool = False
+    inner: Inner = field(default_factory=Inner)
+
+
+@dataclass
+class CLIConfig(BaseConfig):
+    mode: Mode = Mode.TRAIN
+    level: Level = Level.LOW
+    model: Model = field(default_factory=Model)
+    tags: List[str] = field(default_factory=list)
+
+
+def test_flags_are_generated_for_nested_fields():
+    cfg = BaseCLIParser(CLIConfig).parse_args([
+        "--model.depth", "8",
+        "--model.inner.path", "/data",
+        "--model.use_bias",
+        "--mode", "eval",
+        "--level", "2",
+        "--tags", "a", "b",
+        "--debug", "false",
+        "--log_level", "10",
+    ])
+    assert cfg.model.depth == 8 and cfg.model.dropout == 0.1
+    assert cfg.model.inner.path == Path("/data")
+    assert cfg.model.use_bias is True
+    assert cfg.mode is Mode.EVAL and cfg.level is Level.HIGH
+    assert cfg.tags == ["a", "b"]
+    assert cfg.debug is False and cfg.log_level == 10
+    assert cfg.cmd_args == {
+        "model": {"depth": 8, "inner": {"path": Path("/data")}, "use_bias": True},
+        "mode": "eval", "level": 2, "tags": ["a", "b"], "debug": False, "log_level": 10, "extras": {},
+    }
+
+
+def test_invalid_choices_are_rejected():
+    with pytest.raises(SystemExit):
+        BaseCLIParser(CLIConfig).parse_args(["--mode", "bogus"])
+
+
+def test_parser_is_built_once_per_class():
+    first, second = BaseCLIParser(CLIConfig), BaseCLIParser(CLIConfig)
+    assert first.get_parser() is second.get_parser()
+    assert first.get_parser() is not BaseCLIParser(BaseConfig).get_parser()
+
+
+def test_param_funcs_can_redefine_flags():
+    parser = BaseCLIParser(CLIConfig)
+    parser.append_param_func(lambda p: p.add_argument("--model.depth", dest="model.depth", type=lambda v: int(v) * 2, default=None))
+    assert parser.parse_args(["--model.depth", "3"]).model.depth == 6
+
+
+def test_parse_many():
+    configs = BaseCLIParser(CLIConfig).parse_many([["--model.depth", str(i)] for i in range(100)])
+    assert [c.model.depth for c in configs] == list(range(100))
+
+
+def test_parser_cache_is_bounded():
+    from foundation.cli_parser import _build_parser
+    for _ in range(100):
+        parser = BaseCLIParser(CLIConfig)
+        parser.append_param_func(lambda p: None)
+        parser.get_parser()
+    assert _build_parser.cache_info().currsize <= 32
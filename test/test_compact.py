@@ -0,0 +1,131 @@
+import copy
+import pickle
+import weakref
+from dataclasses import FrozenInstanceError, dataclass, field
+from datetime import datetime, time, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path, PureWindowsPath
+
+import pytest
+
+from foundation import BaseConfig
+from foundation.utils import ConfigInterner, slotted
+
+
+@slotted
+@dataclass(frozen=True)
+class Frozen:
+    x: int = 1
+    path: Path = Path("data")
+
+
+@slotted
+@dataclass
+class Mutable:
+    y: int = 2
+
+
+@dataclass
+class CompactConfig(BaseConfig):
+    frozen: Frozen = field(default_factory=Frozen)
+    mutable: Mutable = field(default_factory=Mutable)
+    seed: int = 0
+
+
+def test_slotted_classes_have_no_dict():
+    for obj in (Frozen(), Mutable()):
+        assert not hasattr(obj, "__dict__")
+    with pytest.raises(FrozenInstanceError):
+        Frozen().x = 2  # type: ignore
+    frozen = Frozen(3, Path("p"))
+    assert copy.copy(frozen) == pickle.loads(pickle.dumps(frozen)) == frozen
+
+
+@dataclass
+class Counted:
+    calls: int = 0
+
+    def __post_init__(self):
+        self.calls += 1
+
+
+@slotted
+@dataclass
+class Derived(Counted):
+    z: int = 3
+
+    def __post_init__(self):
+        super().__post_init__()
+        self.z *= 2
+
+    @classmethod
+    def make(cls):
+        return super().__new__(cls)
+
+    @property
+    def base_repr(self):
+        return super().__repr__()
+
+
+def test_slotted_methods_can_use_super():
+    derived = Derived()
+    assert (derived.calls, derived.z) == (1, 6)
+    assert isinstance(Derived.make(), Derived)
+    assert derived.base_repr == Counted.__repr__(derived)
+
+
+def test_slotted_instances_are_weak_referenceable():
+    for obj in (Frozen(), Mutable(), Derived()):
+        assert weakref.ref(obj)() is obj
+    assert "__weakref__" in Mutable.__slots__ and "__weakref__" not in Derived.__slots__
+
+
+def test_slotted_classes_decode_and_roundtrip():
+    cfg = CompactConfig(frozen=Frozen(5), mutable=Mutable(6))
+    loaded = CompactConfig.from_dict(pickle.loads(pickle.dumps(cfg)).to_dict())
+    assert loaded == cfg
+    assert isinstance(loaded.frozen, Frozen)
+
+
+def test_interner_shares_equal_immutable_values():
+    interner = ConfigInterner()
+    rows = [CompactConfig.from_dict({"seed": i, "frozen": {"x": 1, "path": "data"}, "git_hash": "abc" * 10}) for i in range(3)]
+    configs = [interner(cfg) for cfg in rows]
+    assert configs == rows
+    assert configs[0].frozen is configs[1].frozen is configs[2].frozen
+    assert configs[0].git_hash is configs[1].git_hash
+    assert configs[0].cfg_save_dir is configs[2].cfg_save_dir
+    # Mutable parts stay private to every config.
+    assert configs[0].mutable is not configs[1].mutable
+    assert configs[0].extras is not configs[1].extras
+    assert rows[0].frozen is not configs[0].frozen
+
+
+def test_equal_values_of_different_types_are_not_merged():
+    interner = ConfigInterner()
+    a, b = interner(Frozen(1)), interner(Frozen(True))  # type: ignore
+    assert type(a.x) is int and type(b.x) is bool
+
+
+@pytest.mark.parametrize("first, second", [
+    (0.0, -0.0),
+    (Decimal("1.0"), Decimal("1.00")),
+    (datetime(2024, 1, 1, tzinfo=timezone.utc), datetime(2024, 1, 1, 1, tzinfo=timezone(timedelta(hours=1)))),
+    (time(12, tzinfo=timezone.utc), time(13, tzinfo=timezone(timedelta(hours=1)))),
+    (PureWindowsPath("Data"), PureWindowsPath("data")),
+])
+def test_equal_but_different_values_are_kept(first, second):
+    assert first == second
+    interner = ConfigInterner()
+    a, b = interner(Frozen(first)), interner(Frozen(second))  # type: ignore
+    assert repr(a.x) == repr(first) and repr(b.x) == repr(second)
+    assert getattr(b.x, "tzinfo", None) == getattr(second, "tzinfo", None)
+    assert interner(Frozen(copy.deepcopy(second))).x is b.x  # type: ignore
+
+
+def test_share_mutable():
+    interner = ConfigInterner(share_mutable=True)
+    first, second = interner(CompactConfig(seed=1)), interner(CompactConfig(seed=2))
+    assert first.mutable is second.mutable
+    assert first.extras is second.extras
+    assert first is not second
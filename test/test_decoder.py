@@ -0,0 +1,133 @@
+from dataclasses import dataclass, field
+from datetime import datetime, date
+from decimal import Decimal
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
+from uuid import UUID
+
+import pytest
+from dacite import from_dict as dacite_from_dict, Config as DaciteConfig
+from dacite.exceptions import DaciteError
+
+from foundation import BaseConfig, DEFAULT_CAST
+
+
+class Colour(Enum):
+    RED = "red"
+    BLUE = "blue"
+
+
+@dataclass
+class Inner:
+    x: int = 1
+    tags: List[str] = field(default_factory=list)
+
+
+@dataclass
+class Nested:
+    test_value_int: int = 5
+    test_value_str: str = "Hello World"
+    test_dict: dict = field(default_factory=dict)
+    inner: Inner = field(default_factory=Inner)
+    maybe_inner: Optional[Inner] = None
+
+
+@dataclass
+class SampleConfig(BaseConfig):
+    test_value_int: int = 10
+    test_value_float: float = 0.5
+    test_date: datetime = datetime(2026, 12, 1)
+    test_day: date = date(2026, 1, 1)
+    test_decimal: Decimal = Decimal("1.5")
+    test_uuid: Optional[UUID] = None
+    colour: Colour = Colour.RED
+    path_list: List[Path] = field(default_factory=list)
+    int_tuple: Tuple[int, ...] = ()
+    pair: Tuple[int, str] = (0, "")
+    ids: Set[int] = field(default_factory=set)
+    choice: Union[int, str] = 0
+    inners: List[Inner] = field(default_factory=list)
+    inner_map: Dict[str, Inner] = field(default_factory=dict)
+    anything: Any = None
+
+    nested: Nested = field(default_factory=Nested)
+    nested2: Nested = field(default_factory=Nested)
+
+
+@dataclass
+class Required:
+    value: int
+    maybe: Optional[int]
+
+
+def dacite_reference(cls, data):
+    """The decoding path `BaseConfig.from_dict` used before the compiled decoder."""
+    hooks = {}
+    for base in reversed(cls.__mro__):
+        if hasattr(base, "build_type_hooks"):
+            hooks.update(base.build_type_hooks())
+    return dacite_from_dict(data_class=cls, data=data, config=DaciteConfig(type_hooks=hooks, cast=DEFAULT_CAST))
+
+
+PARITY_CASES = [
+    {},
+    {"test_value_int": 3, "test_value_float": 2, "log_level": 10, "debug": False},
+    {"current_run_dir": "/tmp/run", "cfg_save_dir": "cfgs", "cfg_file_name_load": "x"},
+    {"test_date": "2026-01-02T03:04:05", "test_day": "2025-05-05", "test_decimal": "3.25"},
+    {"test_uuid": "12345678-1234-5678-1234-567812345678"},
+    {"test_uuid": None},
+    {"colour": "blue"},
+    {"path_list": ["a", "b/c"], "int_tuple": [1, 2, 3], "pair": [1, "one"], "ids": [1, 2, 2]},
+    {"choice": 3},
+    {"choice": "three"},
+    {"inners": [{"x": 2}, {"tags": ["a"]}], "inner_map": {"k": {"x": 7}}},
+    {"anything": {"deep": [1, {"x": 2}]}},
+    {"nested": {"test_value_int": 7, "inner": {"x": 3, "tags": ("t",)}}, "nested2": {"maybe_inner": {"x": 4}}},
+    {"nested": {"test_dict": {"malerisch": {}}}, "extras": {"a": 1, "b": [1, 2]}, "cmd_args": {"debug": True}},
+]
+
+
+@pytest.mark.parametrize("data", PARITY_CASES)
+def test_parity_with_dacite(data):
+    assert SampleConfig.from_dict(data) == dacite_reference(SampleConfig, data)
+
+
+def test_decoder_is_cached_per_class():
+    assert SampleConfig.get_decoder() is SampleConfig.get_decoder()
+    assert BaseConfig.get_decoder() is not SampleConfig.get_decoder()
+
+
+def test_nested_types_are_decoded():
+    cfg = SampleConfig.from_dict(PARITY_CASES[12])
+    assert isinstance(cfg.nested, Nested)
+    assert isinstance(cfg.nested.inner, Inner)
+    assert cfg.nested.inner.tags == ["t"]
+    assert cfg.nested2.maybe_inner == Inner(x=4)
+
+
+@pytest.mark.parametrize("data", [
+    {"test_value_int": "ten"},
+    {"colour": "green"},
+    {"nested": {"inner": {"x": "one"}}},
+    {"inners": [{"x": 1}, {"x": "two"}]},
+    {"choice": 1.5},
+    {"pair": [1, 2]},
+])
+def test_errors_match_dacite(data):
+    with pytest.raises(Exception) as expected:
+        dacite_reference(SampleConfig, data)
+    with pytest.raises(type(expected.value)) as actual:
+        SampleConfig.from_dict(data)
+    assert str(actual.value) == str(expected.value)
+    if isinstance(expected.value, DaciteError):
+        assert getattr(actual.value, "field_path", None) == getattr(expected.value, "field_path", None)
+
+
+def test_missing_values_match_dacite():
+    from foundation.utils import compile_decoder
+
+    decoder = compile_decoder(Required, {}, DEFAULT_CAST)
+    assert decoder({"value": 1}) == dacite_from_dict(Required, {"value": 1}, DaciteConfig(cast=DEFAULT_CAST))
+    with pytest.raises(DaciteError, match='missing value for field "value"'):
+        decoder({})
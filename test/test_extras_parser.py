@@ -0,0 +1,59 @@
+import json
+import logging
+import math
+
+import pytest
+
+from foundation import BaseCLIParser, BaseConfig
+from foundation.utils import LiteralParser
+
+
+@pytest.mark.parametrize("text", [
+    "1", "-3", "0", "1.5", "-0.25", "1e5", "2E-3", "1.5e+2", "true", "false", "null",
+    "[1, 2]", '{"a": {"b": 1}}', '"quoted"', " 7 ", "-Infinity", "Infinity",
+])
+def test_matches_json(text):
+    value = LiteralParser()(text)
+    assert value == json.loads(text) and type(value) is type(json.loads(text))
+
+
+@pytest.mark.parametrize("text", ["foo", "007", "+5", "1.", ".5", "True", "None", "1.2.3", "-x", "", "a=b", "@user", "[1,"])
+def test_everything_else_is_a_string(text):
+    assert LiteralParser()(text) == text
+
+
+def test_nan():
+    assert math.isnan(LiteralParser()("NaN"))
+
+
+def test_bare_strings_do_not_warn(caplog):
+    with caplog.at_level(logging.WARNING):
+        LiteralParser()("foo")
+    assert not caplog.records
+
+
+def test_file_references_load_once(tmp_path, monkeypatch):
+    (tmp_path / "model.json").write_text('{"depth": 3, "widths": [1, 2]}')
+    parser = LiteralParser(base_dir=tmp_path)
+    first = parser("@model.json")
+    (tmp_path / "model.json").write_text("{}")
+    second = parser("@model.json")
+    assert first == second == {"depth": 3, "widths": [1, 2]}
+    first["widths"].append(3)
+    assert second["widths"] == [1, 2]
+    with pytest.raises(ValueError):
+        parser("@missing.json")
+
+
+def test_extras_from_command_line(tmp_path):
+    (tmp_path / "model.json").write_text('{"depth": 3}')
+    parser = BaseCLIParser(BaseConfig)
+    parser.literal_parser = LiteralParser(base_dir=tmp_path)
+    cfg = parser.parse_args([
+        "--extras", "name=foo",
+        "--extras", "lr=0.1",
+        "--extras", "model=@model.json",
+        "--extras", "model.width=8",
+        "--extras", "data.train.path=/data",
+    ])
+    assert cfg.extras == {"name": "foo", "lr": 0.1, "model": {"depth": 3, "width": 8}, "data": {"train": {"path": "/data"}}}
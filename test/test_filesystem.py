@@ -0,0 +1,83 @@
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import List
+
+import pytest
+
+from foundation import BaseConfig
+from foundation.utils import FsyncBatch, allocate_run_dir, atomic_write
+
+
+@dataclass
+class SaveConfig(BaseConfig):
+    values: List[int] = field(default_factory=list)
+
+
+def test_atomic_write_replaces_or_keeps(tmp_path):
+    path = tmp_path / "out.json"
+    path.write_text("old")
+    with pytest.raises(RuntimeError):
+        with atomic_write(path) as f:
+            f.write("partial")
+            raise RuntimeError("interrupted")
+    assert path.read_text() == "old"
+
+    with atomic_write(path) as f:
+        f.write("new")
+    assert path.read_text() == "new"
+    assert [p.name for p in tmp_path.iterdir()] == ["out.json"]
+
+
+def test_fsync_batch_renames_at_exit(tmp_path):
+    with FsyncBatch():
+        for i in range(3):
+            with atomic_write(tmp_path / f"{i}.txt") as f:
+                f.write(str(i))
+        with FsyncBatch():  # nested batches commit with the outer one
+            with atomic_write(tmp_path / "nested.txt") as f:
+                f.write("n")
+        assert not any(p.suffix == ".txt" and not p.name.startswith(".") for p in tmp_path.iterdir())
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["0.txt", "1.txt", "2.txt", "nested.txt"]
+
+    with pytest.raises(RuntimeError):
+        with FsyncBatch():
+            with atomic_write(tmp_path / "lost.txt") as f:
+                f.write("x")
+            raise RuntimeError("abort")
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["0.txt", "1.txt", "2.txt", "nested.txt"]
+
+
+def test_concurrent_saves_are_never_partial(tmp_path):
+    path = tmp_path / "cfg.json"
+    SaveConfig().save(path)
+    stop = threading.Event()
+    errors = []
+
+    def read():
+        while not stop.is_set():
+            try:
+                json.loads(path.read_text())
+            except ValueError as e:
+                errors.append(e)
+
+    reader = threading.Thread(target=read)
+    reader.start()
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(lambda i: SaveConfig(values=list(range(i * 100))).save(path, fsync=False), range(50)))
+    stop.set()
+    reader.join()
+    assert errors == []
+    assert [p.name for p in tmp_path.iterdir()] == ["cfg.json"]
+
+
+def test_allocate_run_dir_is_unique(tmp_path):
+    with ThreadPoolExecutor(32) as pool:
+        dirs = list(pool.map(lambda _: allocate_run_dir(tmp_path / "runs", prefix="sweep"), range(200)))
+    assert len(set(dirs)) == 200
+    assert all(d.is_dir() and d.name.startswith("sweep_") for d in dirs)
+
+    cfg = SaveConfig(current_run_dir=tmp_path)
+    run_dir = cfg.allocate_run_dir()
+    assert cfg.current_run_dir == run_dir and run_dir.parent == tmp_path
@@ -0,0 +1,76 @@
+import copy
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum
+from pathlib import Path
+from typing import Set
+
+from foundation import BaseConfig, Sweep
+from foundation.utils import fingerprint
+
+
+class Mode(Enum):
+    FAST = "fast"
+
+
+@dataclass
+class Nested:
+    test_value_int: int = 5
+    test_dict: dict = field(default_factory=dict)
+
+
+@dataclass
+class FingerprintConfig(BaseConfig):
+    when: datetime = datetime(2026, 12, 1)
+    mode: Mode = Mode.FAST
+    path: Path = Path("data")
+    tags: Set[str] = field(default_factory=set)
+    nested: Nested = field(default_factory=Nested)
+    nested2: Nested = field(default_factory=Nested)
+
+
+def test_stable_and_canonical():
+    a = FingerprintConfig(tags={"x", "y", "z"}, extras={"b": 1, "a": 2})
+    b = FingerprintConfig(tags={"z", "y", "x"}, extras={"a": 2, "b": 1})
+    assert a.fingerprint() == b.fingerprint()
+    assert a.fingerprint() != FingerprintConfig(mode=Mode.FAST, path=Path("other")).fingerprint()
+
+
+def test_volatile_fields_are_excluded():
+    a = FingerprintConfig(current_run_dir=Path("/a"), git_hash="1", cmd_args={"x": 1})
+    b = FingerprintConfig(current_run_dir=Path("/b"), git_hash="2")
+    assert a.fingerprint() == b.fingerprint()
+    assert a.fingerprint(exclude=()) != b.fingerprint(exclude=())
+    only_int = ["nested.test_value_int"]
+    assert FingerprintConfig().fingerprint(exclude=only_int) == FingerprintConfig(
+        nested=Nested(test_value_int=1)).fingerprint(exclude=only_int)
+
+
+def test_mutation_changes_fingerprint():
+    cfg = FingerprintConfig()
+    before = cfg.fingerprint()
+    cfg.nested.test_value_int = 6
+    assert cfg.fingerprint() != before
+    cfg.nested.test_value_int = 5
+    cfg.nested.test_dict["k"] = 1
+    assert cfg.fingerprint() != before
+    del cfg.nested.test_dict["k"]
+    assert cfg.fingerprint() == before
+    assert copy.deepcopy(cfg).fingerprint() == before
+
+
+def test_unchanged_branches_reuse_their_digest(monkeypatch):
+    base = FingerprintConfig()
+    base.fingerprint()
+    configs = list(Sweep(base).grid({"nested.test_value_int": [1, 2]}))
+
+    canonicalized = []
+    import foundation.utils.hashing as module
+    original = module._canonical
+    monkeypatch.setattr(module, "_canonical", lambda value, *args: canonicalized.append(value) or original(value, *args))
+    digests = {cfg.fingerprint() for cfg in configs}
+    assert len(digests) == 2
+    # Only the changed leaf is serialized again, plus the containers that could have
+    # changed in place. Every other leaf of the root and of `nested2` is reused.
+    assert sorted(map(repr, canonicalized)) == sorted(["1", "2"] + ["set()"] * 2 + ["{}"] * 6)
+    assert fingerprint(configs[0].nested2) == fingerprint(base.nested2)
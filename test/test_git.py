@@ -0,0 +1,69 @@
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from foundation.utils import get_git_commit_hash
+from foundation.utils.git import _get_git_commit_hash_subprocess, _read_git_metadata, find_git_root
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git binary needed as reference")
+
+
+def git(cwd: Path, *args: str) -> str:
+    return subprocess.check_output(["git", *args], cwd=cwd, text=True).strip()
+
+
+def read(path: Path):
+    find_git_root.cache_clear()
+    _read_git_metadata.cache_clear()
+    return get_git_commit_hash(path)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    root = tmp_path / "repo"
+    root.mkdir()
+    git(root, "init", "-q", "-b", "main")
+    git(root, "-c", "user.name=t", "-c", "user.email=t@t", "commit", "-q", "--allow-empty", "-m", "one")
+    git(root, "remote", "add", "origin", "git@example.com:team/repo.git")
+    (root / "sub").mkdir()
+    return root
+
+
+def test_matches_git_binary(repo):
+    assert read(repo / "sub") == _get_git_commit_hash_subprocess(repo)
+    assert read(repo)[1] == "git@example.com:team/repo.git"
+
+
+def test_packed_refs_and_detached_head(repo):
+    git(repo, "pack-refs", "--all")
+    assert not (repo / ".git" / "refs" / "heads" / "main").exists()
+    assert read(repo) == _get_git_commit_hash_subprocess(repo)
+
+    git(repo, "-c", "user.name=t", "-c", "user.email=t@t", "commit", "-q", "--allow-empty", "-m", "two")
+    git(repo, "checkout", "-q", "--detach", "HEAD~1")
+    assert read(repo) == _get_git_commit_hash_subprocess(repo)
+
+
+def test_worktree(repo, tmp_path):
+    git(repo, "-c", "user.name=t", "-c", "user.email=t@t", "commit", "-q", "--allow-empty", "-m", "two")
+    git(repo, "worktree", "add", "-q", "-b", "other", str(tmp_path / "wt"), "HEAD~1")
+    assert read(tmp_path / "wt") == _get_git_commit_hash_subprocess(tmp_path / "wt")
+    assert read(tmp_path / "wt")[0] != read(repo)[0]
+
+
+def test_no_repository_and_no_remote(tmp_path, repo):
+    plain = tmp_path / "plain"
+    plain.mkdir()
+    if find_git_root(plain.resolve()) is None:
+        assert read(plain) == ("unknown", "not a git repository")
+    git(repo, "remote", "remove", "origin")
+    assert read(repo) == (git(repo, "rev-parse", "HEAD"), "not a git repository")
+
+
+def test_memoized_without_subprocess(repo, monkeypatch):
+    read(repo)
+    monkeypatch.setattr(subprocess, "check_output", None)
+    for _ in range(1000):
+        get_git_commit_hash(repo)
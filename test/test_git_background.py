@@ -0,0 +1,78 @@
+import asyncio
+import json
+import pickle
+import threading
+
+import pytest
+
+from foundation import BaseConfig
+from foundation.utils import git
+
+
+@pytest.fixture
+def slow_git(monkeypatch):
+    release = threading.Event()
+    calls = []
+
+    def lookup(path=None):
+        calls.append(path)
+        release.wait(5)
+        return "abc123", "git@example.com:team/repo.git"
+
+    monkeypatch.setattr(git, "_futures", {})
+    monkeypatch.setattr(git, "get_git_commit_hash", lookup)
+    yield release, calls
+    release.set()
+
+
+def test_construction_does_not_wait_for_git(slow_git, tmp_path):
+    release, calls = slow_git
+    configs = [BaseConfig(debug=True) for _ in range(100)]
+    # The lookup blocks until `release` is set, construction returned without it.
+    assert not configs[0].git_metadata().done()
+    assert len(calls) <= 1
+    assert "git_hash" not in vars(configs[0])
+
+    # Copies made before the lookup finished resolve it themselves, no sentinel leaks.
+    pickled = pickle.dumps(configs[2])
+    release.set()
+    assert pickle.loads(pickled).git_hash == "abc123"
+    assert "pending" not in configs[3].serializer().dumps(configs[3])
+    configs[0].save(tmp_path / "cfg.json")
+    saved = json.loads((tmp_path / "cfg.json").read_text())
+    assert (saved["git_hash"], saved["git_repo_name"]) == ("abc123", "git@example.com:team/repo.git")
+    assert configs[0].git_hash == "abc123"
+    assert configs[1].to_dict()["git_hash"] == "abc123"
+    assert len(calls) == 1
+
+
+def test_fingerprint_only_waits_when_git_is_included(slow_git):
+    release, _ = slow_git
+    cfg = BaseConfig(debug=True)
+    cfg.fingerprint()
+    assert "git_hash" not in vars(cfg)
+    release.set()
+    cfg.fingerprint(exclude=())
+    assert vars(cfg)["git_hash"] == "abc123"
+
+
+def test_async_accessor(slow_git):
+    release, calls = slow_git
+    release.set()
+    assert asyncio.run(git.get_git_commit_hash_async()) == ("abc123", "git@example.com:team/repo.git")
+    assert git.get_git_commit_hash_future() is git.get_git_commit_hash_future()
+    assert len(calls) == 1
+
+
+def test_resolved_configs_return_their_values():
+    cfg = BaseConfig(git_hash="h", git_repo_name="r")
+    assert cfg.git_metadata().result(timeout=0) == ("h", "r")
+
+
+def test_assigned_values_win(slow_git):
+    release, _ = slow_git
+    cfg = BaseConfig(debug=True)
+    cfg.git_hash = "manual"
+    release.set()
+    assert (cfg.git_hash, cfg.git_repo_name) == ("manual", "git@example.com:team/repo.git")
+    assert BaseConfig().git_hash == BaseConfig.git_hash == "empty"
@@ -0,0 +1,41 @@
+import subprocess
+import sys
+
+import pytest
+
+import foundation
+import foundation.log
+import foundation.utils
+from bench_import import BUDGET_ENV, import_budget_us, import_time_us
+
+# Timing is machine dependent, the budget check only runs where BUDGET_ENV is set
+# (e.g. on a dedicated benchmark runner). The other tests check what keeps it low.
+HEAVY_MODULES = ("dacite", "colorlog", "subprocess", "argparse", "sqlite3", "json", "uuid", "decimal", "typing")
+
+
+def run(code):
+    return subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+
+
+def test_heavy_dependencies_not_imported():
+    code = "import sys, foundation, foundation.utils, foundation.log; print(' '.join(sorted(sys.modules)))"
+    loaded = set(run(code).stdout.split())
+    assert not loaded & set(HEAVY_MODULES)
+
+
+def test_infov_installed_without_log_setup():
+    code = "import logging, sys, foundation.log; print(hasattr(logging.Logger, 'infov'), 'foundation.log.log_setup' in sys.modules)"
+    assert run(code).stdout.split() == ["True", "False"]
+
+
+def test_public_names_resolve():
+    for module in (foundation, foundation.utils, foundation.log):
+        for name in module.__all__:
+            assert getattr(module, name) is not None
+            assert name in dir(module)
+    assert foundation.BaseConfig.__module__ == "foundation.config"
+
+
+@pytest.mark.skipif(import_budget_us() is None, reason=f"set {BUDGET_ENV} to check the import time")
+def test_import_within_budget():
+    assert import_time_us("foundation") <= import_budget_us()  # type: ignore
@@ -0,0 +1,78 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from conftest import SampleConfig
+from foundation import ConfigCache
+
+
+@pytest.fixture
+def path(saved):
+    return saved.get_cfg_file_path("load")
+
+
+def count_decodes(monkeypatch):
+    calls = []
+    original = SampleConfig.from_dict.__func__
+    monkeypatch.setattr(SampleConfig, "from_dict", classmethod(lambda cls, data: calls.append(1) or original(cls, data)))
+    return calls
+
+
+def test_hit_returns_independent_instance(path, monkeypatch):
+    cache = ConfigCache()
+    decodes = count_decodes(monkeypatch)
+    first = SampleConfig.cfg_load(path, cache=cache)
+    first.extras["a"]["c"] = 2
+    second = SampleConfig.cfg_load(path, cache=cache)
+    assert len(decodes) == 1 and cache.hits == 1
+    assert second.extras == {"a": {"b": 1}} and second is not first
+    assert second.lr == 0.1 and isinstance(second.inner.path, Path)
+
+
+def test_overwrite_is_part_of_the_key(path):
+    cache = ConfigCache()
+    assert SampleConfig.cfg_load(path, overwrite={"inner.x": 3}, cache=cache).inner.x == 3
+    assert SampleConfig.cfg_load(path, overwrite={"inner.x": 4}, cache=cache).inner.x == 4
+    assert SampleConfig.cfg_load(path, cache=cache).inner.x == 1
+    assert SampleConfig.cfg_load(path, overwrite={"inner.x": 3}, cache=cache).inner.x == 3
+    assert cache.hits == 1 and cache.misses == 3
+
+
+def test_file_change_invalidates(path):
+    cache = ConfigCache()
+    SampleConfig.cfg_load(path, cache=cache)
+    stat = os.stat(path)
+    # Same size and mtime, only the content hash tells the versions apart.
+    path.write_text(path.read_text().replace('"lr": 0.1', '"lr": 0.7'))
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert SampleConfig.cfg_load(path, cache=cache).lr == 0.7
+
+
+def test_lru_eviction(tmp_path):
+    cache = ConfigCache(maxsize=2)
+    paths = []
+    for i in range(3):
+        paths.append(tmp_path / f"{i}.json")
+        SampleConfig(lr=i).save(paths[-1])
+        SampleConfig.cfg_load(paths[-1], cache=cache)
+    assert len(cache) == 2
+    SampleConfig.cfg_load(paths[0], cache=cache)
+    assert cache.hits == 0
+
+
+def test_sidecar_shared_between_caches(path, monkeypatch):
+    SampleConfig.cfg_load(path, cache=ConfigCache(sidecar=True))
+    assert path.with_name(path.name + ".cache").is_file()
+    decodes = count_decodes(monkeypatch)
+    cfg = SampleConfig.cfg_load(path, cache=ConfigCache(sidecar=True))
+    assert cfg.lr == 0.1 and not decodes
+
+    path.write_text(path.read_text().replace('"lr": 0.1', '"lr": 0.25'))
+    assert SampleConfig.cfg_load(path, cache=ConfigCache(sidecar=True)).lr == 0.25
+    assert len(decodes) == 1
+
+
+def test_corrupt_sidecar_is_ignored(path):
+    path.with_name(path.name + ".cache").write_bytes(b"not a pickle")
+    assert SampleConfig.cfg_load(path, cache=ConfigCache(sidecar=True)).lr == 0.1
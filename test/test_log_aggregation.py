@@ -0,0 +1,74 @@
+import json
+import logging
+import multiprocessing
+import os
+import pickle
+import socket
+import struct
+
+from foundation.log import init_log_collector
+
+
+def worker(index):
+    logging.getLogger("aggregation_test").info("worker %d pid %d", index, os.getpid())
+
+
+def test_forked_workers_write_through_collector(tmp_path):
+    log = logging.getLogger("aggregation_test")
+    log.setLevel(logging.DEBUG)
+    log.propagate = False
+    path = tmp_path / "run.log"
+    collector = init_log_collector(path, log=log)
+    try:
+        log.info("parent pid %d", os.getpid())
+        ctx = multiprocessing.get_context("fork")
+        with ctx.Pool(3) as pool:
+            pool.map(worker, range(12))
+
+        # A worker dying mid-record leaves half a frame behind, which is dropped.
+        payload = json.dumps({"msg": "lost", "levelno": 20, "levelname": "INFO"}).encode()
+        raw = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        raw.connect(collector.address[0])
+        raw.sendall(struct.pack(">L", len(payload)) + payload[:10])
+        raw.close()
+
+        log.info("after crash")
+    finally:
+        collector.close()
+        for handler in list(log.handlers):
+            log.removeHandler(handler)
+
+    lines = path.read_text().splitlines()
+    assert any(f"parent pid {os.getpid()}" in line for line in lines)
+    workers = [line for line in lines if "] worker " in line]
+    assert len(workers) == 12
+    for line in workers:
+        pid = int(line.rsplit(" ", 1)[1])
+        assert pid != os.getpid()
+        assert f"[{pid:05d}]" in line
+    assert collector.dropped_bytes > 0
+    assert any("after crash" in line for line in lines)
+    assert not any("lost" in line for line in lines)
+
+
+def test_pickles_are_not_loaded(tmp_path):
+    log = logging.getLogger("aggregation_pickle_test")
+    log.setLevel(logging.DEBUG)
+    log.propagate = False
+    collector = init_log_collector(tmp_path / "run.log", log=log)
+    try:
+        payload = pickle.dumps(logging.makeLogRecord({"msg": "pickled", "levelno": 20}).__dict__)
+        odd = json.dumps({"msg": "odd", "levelno": 20, "getMessage": "x"}).encode()
+        raw = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        raw.connect(collector.address[0])
+        for frame in (payload, odd):
+            raw.sendall(struct.pack(">L", len(frame)) + frame)
+        raw.close()
+        log.info("local")
+    finally:
+        collector.close()
+        for handler in list(log.handlers):
+            log.removeHandler(handler)
+    text = (tmp_path / "run.log").read_text()
+    assert "pickled" not in text
+    assert "odd" in text and "local" in text
@@ -0,0 +1,85 @@
+import logging
+import threading
+
+from foundation.log import (
+    AsyncQueueHandler, DROP_NEW, DROP_OLDEST, add_file_handler, create_file_handler,
+    get_async_handler, has_file_handler, init_root_logger, shutdown_logging,
+)
+
+
+class GatedHandler(logging.Handler):
+    """Blocks the listener thread until `gate` is set, so the queue fills up."""
+
+    def __init__(self):
+        super().__init__()
+        self.gate = threading.Event()
+        self.messages = []
+
+    def emit(self, record):
+        self.gate.wait()
+        self.messages.append(record.getMessage())
+
+
+def make_logger(name, **kwargs):
+    log = logging.getLogger(name)
+    log.setLevel(logging.DEBUG)
+    log.propagate = False
+    log.addHandler(AsyncQueueHandler(**kwargs))
+    return log
+
+
+def test_file_output_matches_sync_handler(tmp_path):
+    log = make_logger("async_file")
+    add_file_handler(log, tmp_path / "async.log")
+    assert has_file_handler(log)
+    assert get_async_handler(log).handlers
+
+    sync = create_file_handler(tmp_path / "sync.log", logging.DEBUG)
+    for i in range(100):
+        record = log.makeRecord(log.name, logging.INFO, __file__, 10, "message %d", (i,), None)
+        log.handle(record)
+        sync.handle(record)
+    sync.close()
+    shutdown_logging(log)
+
+    assert get_async_handler(log) is None
+    assert (tmp_path / "async.log").read_text() == (tmp_path / "sync.log").read_text()
+
+
+def test_drop_new_and_drop_oldest():
+    for overflow, expected in ((DROP_NEW, ["0", "1", "2"]), (DROP_OLDEST, ["0", "8", "9"])):
+        log = make_logger("async_" + overflow, maxsize=2, overflow=overflow)
+        handler = get_async_handler(log)
+        gated = GatedHandler()
+        handler.add_handler(gated)
+
+        log.info("0")
+        while handler.queue.qsize():  # listener picked up "0" and waits at the gate
+            pass
+        for i in range(1, 10):
+            log.info(str(i))
+        assert handler.dropped == 7
+
+        gated.gate.set()
+        handler.flush()
+        assert gated.messages == expected
+        shutdown_logging(log)
+
+
+def test_init_root_logger_twice_keeps_one_async_handler(tmp_path):
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    try:
+        init_root_logger(async_mode=True)
+        first = get_async_handler(root)
+        init_root_logger(async_mode=True)
+        assert [h for h in root.handlers if isinstance(h, AsyncQueueHandler)] == [first]
+
+        add_file_handler(root, tmp_path / "root.log")
+        logging.getLogger("async_root").info("once")
+        first.flush()
+        assert (tmp_path / "root.log").read_text().count("once") == 1
+    finally:
+        shutdown_logging(root)
+        root.handlers[:] = handlers
+        root.setLevel(level)
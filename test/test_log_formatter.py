@@ -0,0 +1,41 @@
+import logging
+import sys
+
+import pytest
+
+from foundation.log import FastFormatter, create_formatter
+from foundation.log.log_setup import INFOV_LEVEL
+
+
+def make_records():
+    yield logging.makeLogRecord({"msg": "plain", "levelno": logging.INFO, "levelname": "INFO",
+                                 "module": "config", "lineno": 7})
+    yield logging.LogRecord("x", logging.DEBUG, "/a/very_long_module_name.py", 1234, "value %s and %d", ("a", 5), None)
+    yield logging.LogRecord("x", INFOV_LEVEL, __file__, 1, "infov", (), None)
+    yield logging.LogRecord("x", 42, __file__, 1, "custom level", (), None)
+    try:
+        raise RuntimeError("boom")
+    except RuntimeError:
+        yield logging.LogRecord("x", logging.ERROR, __file__, 3, "failed", (), sys.exc_info())
+    yield logging.LogRecord("x", logging.WARNING, __file__, 3, "stack", (), None, sinfo="Stack (most recent call last):\n  here")
+
+
+@pytest.mark.parametrize("colour", [False, True])
+@pytest.mark.parametrize("fmt", [None, "{levelname}|{name!r}|{message}", "{{literal}} {msecs:.1f} '{message}'"])
+def test_matches_current_formatter(colour, fmt):
+    reference = create_formatter(colour, fmt)
+    fast = create_formatter(colour, fmt, fast=True)
+    assert isinstance(fast, FastFormatter)
+    for record in make_records():
+        expected = reference.format(record)
+        record.exc_text = None
+        assert fast.format(record) == expected
+
+
+def test_timestamp_cache_follows_seconds():
+    fast = FastFormatter()
+    reference = create_formatter(False)
+    record = logging.makeLogRecord({"msg": "t"})
+    for created in (1000.5, 1000.9, 1001.1, 999.0):
+        record.created, record.msecs = created, (created - int(created)) * 1000
+        assert fast.format(record) == reference.format(record)
@@ -0,0 +1,86 @@
+import logging
+
+from foundation.log import RateLimitFilter, add_stream_handler
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+class Unformattable:
+    def __str__(self):
+        raise AssertionError("formatted")
+
+
+def make_handler(**kwargs):
+    handler = ListHandler()
+    RateLimitFilter(**kwargs).attach(handler)
+    return handler, handler.filters[0]
+
+
+def record(msg, *args, lineno=10, level=logging.WARNING, created=0.0):
+    rec = logging.LogRecord("test", level, "/src/module.py", lineno, msg, args, None)
+    rec.created = created
+    return rec
+
+
+def messages(handler):
+    return [r.getMessage() for r in handler.records]
+
+
+def test_collapses_repeats():
+    handler, _ = make_handler(rates={})
+    for i in range(5):
+        handler.handle(record("same %d", 1, created=i * 0.01))
+    handler.handle(record("other", created=1.0))
+    assert messages(handler) == ["same 1", "Last message repeated 4 times", "other"]
+
+
+def test_periodic_repeat_summary():
+    handler, limiter = make_handler(rates={}, summary_interval=1.0)
+    for i in range(25):
+        handler.handle(record("tick", created=i * 0.1))
+    assert messages(handler) == ["tick", "Last message repeated 10 times", "Last message repeated 10 times"]
+    limiter.flush()
+    assert messages(handler)[-1] == "Last message repeated 4 times"
+
+
+def test_token_bucket_per_call_site():
+    handler, limiter = make_handler(rates={logging.WARNING: (1.0, 3)})
+    for i in range(10):
+        handler.handle(record("step %d", i, created=0.0))
+        handler.handle(record("other %d", i, lineno=20, created=0.0))
+    assert messages(handler) == ["step 0", "other 0", "step 1", "other 1", "step 2", "other 2"]
+
+    # After two seconds the bucket has two tokens again, the first record reports the drops.
+    handler.handle(record("step %d", 99, created=2.0))
+    assert messages(handler)[-2:] == ["7 records from this line suppressed by the rate limit", "step 99"]
+    assert handler.records[-2].lineno == 10
+    limiter.flush()
+    assert messages(handler)[-1] == "7 records from this line suppressed by the rate limit"
+    assert handler.records[-1].lineno == 20
+
+
+def test_unlimited_levels_and_no_formatting():
+    handler, _ = make_handler(rates={logging.WARNING: (0.0, 0)})
+    handler.handle(record("warning %s", Unformattable()))
+    for i in range(3):
+        handler.handle(record("error %d", i, lineno=11, level=logging.ERROR))
+    assert [r.msg for r in handler.records] == ["error %d"] * 3
+
+
+def test_add_stream_handler():
+    logger = logging.getLogger("test_log_rate_limit")
+    logger.propagate = False
+    limiter = RateLimitFilter()
+    try:
+        add_stream_handler(logger, None, rate_limit=limiter)
+        assert logger.handlers[-1].filters == [limiter]
+        assert limiter.handler is logger.handlers[-1]
+    finally:
+        logger.handlers.clear()
@@ -0,0 +1,133 @@
+import gc
+import logging
+import sys
+import threading
+import weakref
+
+import pytest
+
+from foundation.log import RingBufferHandler, add_ring_buffer_handler
+from foundation.log import ring_buffer
+
+
+class CountingArg:
+    def __init__(self):
+        self.formatted = 0
+
+    def __str__(self):
+        self.formatted += 1
+        return "arg"
+
+
+@pytest.fixture
+def logger():
+    log = logging.getLogger("ring_buffer_test")
+    log.setLevel(logging.DEBUG)
+    log.propagate = False
+    yield log
+    for handler in list(log.handlers):
+        log.removeHandler(handler)
+        handler.close()
+
+
+def lines(path):
+    return path.read_text().splitlines()
+
+
+def record(level, msg, *args):
+    return logging.LogRecord("ring_buffer_test", level, __file__, 1, msg, args, None)
+
+
+def test_keeps_last_records_until_trigger(tmp_path):
+    path = tmp_path / "crash.log"
+    handler = RingBufferHandler(path, capacity=3, dump_at_exit=False)
+    arg = CountingArg()
+    for i in range(5):
+        handler.handle(record(logging.DEBUG, "step %d %s", i, arg))
+    assert not path.exists()
+    assert arg.formatted == 0
+    assert [r.args[0] for r in handler.records()] == [2, 3, 4]
+
+    handler.handle(record(logging.ERROR, "failed"))
+    assert [line.split("] ", 1)[1] for line in lines(path)] == ["step 3 arg", "step 4 arg", "failed"]
+    assert len(handler) == 0 and handler.dumps == 1
+
+    handler.handle(record(logging.INFO, "after"))
+    handler.handle(record(logging.CRITICAL, "again"))
+    handler.close()
+    assert lines(path)[-2:][1].endswith("again")
+    assert len(lines(path)) == 5
+
+
+def test_path_is_resolved_on_first_dump(tmp_path, logger):
+    calls = []
+
+    def get_path():
+        calls.append(1)
+        return tmp_path / "lazy.log"
+
+    handler = add_ring_buffer_handler(logger, get_path, capacity=10)
+    logger.info("quiet")
+    assert calls == [] and handler.path is None
+    handler.dump()
+    handler.dump()  # nothing buffered
+    logger.info("more")
+    handler.close()
+    assert calls == [1]
+    assert handler.path == tmp_path / "lazy.log"
+    assert len(lines(handler.path)) == 2
+
+
+def test_unhandled_thread_exception_dumps(tmp_path, logger, monkeypatch):
+    first = RingBufferHandler(tmp_path / "first.log", dump_at_exit=False)
+    second = RingBufferHandler(tmp_path / "second.log", dump_at_exit=False)
+    # One process-wide hook serves every handler, silence the default output behind it.
+    assert threading.excepthook is ring_buffer._thread_excepthook
+    monkeypatch.setattr(ring_buffer, "_previous_hooks", (sys.excepthook, lambda args: None))
+    logger.addHandler(first)
+    logger.addHandler(second)
+    logger.debug("context")
+    first.close()
+
+    def fail():
+        raise RuntimeError("boom")
+
+    thread = threading.Thread(target=fail, name="worker")
+    thread.start()
+    thread.join()
+    assert not (tmp_path / "first.log").exists()
+    text = (tmp_path / "second.log").read_text()
+    assert "context" in text
+    assert "Unhandled exception in thread worker" in text
+    assert "RuntimeError: boom" in text
+
+
+def test_hooks_do_not_keep_handlers_alive(tmp_path):
+    handler = RingBufferHandler(tmp_path / "gone.log")
+    ref = weakref.ref(handler)
+    del handler
+    gc.collect()
+    assert ref() is None
+    assert ref not in list(ring_buffer._handlers)
+
+
+def test_dump_writes_outside_the_handler_lock(tmp_path, monkeypatch):
+    handler = RingBufferHandler(tmp_path / "slow.log", dump_at_exit=False)
+    entered, release = threading.Event(), threading.Event()
+    original = handler.format
+
+    def slow_format(record):
+        entered.set()
+        release.wait(5)
+        return original(record)
+
+    monkeypatch.setattr(handler, "format", slow_format)
+    dumping = threading.Thread(target=handler.handle, args=(record(logging.ERROR, "failed"),))
+    dumping.start()
+    assert entered.wait(5)
+    # While the dump is being written, other threads can still buffer records.
+    handler.handle(record(logging.DEBUG, "meanwhile"))
+    assert [r.msg for r in handler.records()] == ["meanwhile"]
+    release.set()
+    dumping.join()
+    handler.close()
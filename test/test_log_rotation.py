@@ -0,0 +1,113 @@
+import gzip
+import json
+import logging
+import os
+
+import pytest
+
+from foundation.log import RotatingLogHandler, create_file_handler, log_segments
+
+
+def record(msg, created):
+    rec = logging.LogRecord("rotation_test", logging.INFO, __file__, 1, msg, (), None)
+    rec.created = created
+    return rec
+
+
+def read(path):
+    if path.suffix == ".gz":
+        with gzip.open(path, "rt") as f:
+            return f.read()
+    return path.read_text()
+
+
+@pytest.fixture
+def path(tmp_path):
+    return tmp_path / "log_2024-01-01_00-00-00.log"
+
+
+def test_size_rotation_compression_and_retention(path):
+    handler = RotatingLogHandler(path, max_bytes=200, backup_count=2)
+    handler.setFormatter(logging.Formatter("{message}", style="{"))
+    for i in range(40):
+        handler.handle(record(f"message {i:02d} " + "x" * 20, created=1000.0 + i))
+    handler.wait()
+
+    segments = log_segments(path)
+    assert [p.name for p in segments] == [
+        "log_2024-01-01_00-00-00.0004.log.gz",
+        "log_2024-01-01_00-00-00.0005.log.gz",
+        "log_2024-01-01_00-00-00.log",
+    ]
+    assert not any(p.suffix == ".log" and p != path for p in path.parent.iterdir())
+    text = "".join(read(p) for p in segments)
+    assert text.splitlines()[-1].startswith("message 39")
+    assert "message 24" in read(segments[0])
+    index = [json.loads(line) for line in handler.index_path.read_text().splitlines()]
+    assert [entry["file"] for entry in index] == [p.name for p in segments[:-1]]
+    handler.close()
+
+
+def test_time_rotation_and_index(path):
+    handler = RotatingLogHandler(path, interval=60, compress=False)
+    handler.setFormatter(logging.Formatter("{message}", style="{"))
+    for created in (10.0, 50.0, 61.0, 100.0, 250.0):
+        handler.handle(record(f"at {created:.0f}", created))
+    handler.close()
+
+    assert [read(p).split() for p in log_segments(path)] == [["at", "10", "at", "50"], ["at", "61", "at", "100"], ["at", "250"]]
+    assert [p.name for p in log_segments(path, start=55, end=90)] == ["log_2024-01-01_00-00-00.0002.log"]
+    # The active file may hold anything after the last closed segment.
+    assert log_segments(path, start=55, end=120)[-1] == path
+    assert log_segments(path, start=200) == [path]
+
+
+def test_numbering_continues(path):
+    for _ in range(2):
+        handler = create_file_handler(path, logging.INFO, max_bytes=10)
+        handler.handle(record("long enough to rotate", 1.0))
+        handler.close()
+    assert sorted(p.name for p in path.parent.glob("*.gz")) == [
+        "log_2024-01-01_00-00-00.0001.log.gz",
+        "log_2024-01-01_00-00-00.0002.log.gz",
+    ]
+    assert path.read_text() == ""
+
+
+def test_leftover_file_keeps_its_time_range(path):
+    path.write_text("from an earlier run\n")
+    os.utime(path, (70.0, 70.0))
+    handler = RotatingLogHandler(path, interval=60, compress=False)
+    handler.setFormatter(logging.Formatter("{message}", style="{"))
+    handler.handle(record("next interval", 130.0))
+    handler.close()
+
+    old, active = log_segments(path, end=100)
+    assert read(old) == "from an earlier run\n"
+    assert active == path and read(path) == "next interval\n"
+    entry = json.loads(handler.index_path.read_text())
+    assert (entry["start"], entry["end"]) == (70.0, 70.0)
+
+
+@pytest.mark.parametrize("raise_exceptions", [True, False])
+def test_failed_compression_keeps_segment(path, monkeypatch, capsys, raise_exceptions):
+    import foundation.log.rotation as rotation
+
+    def broken_open(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(rotation.gzip, "open", broken_open)
+    monkeypatch.setattr(logging, "raiseExceptions", raise_exceptions)
+    handler = RotatingLogHandler(path, max_bytes=10)
+    handler.setFormatter(logging.Formatter("{message}", style="{"))
+    handler.handle(record("long enough to rotate", 1.0))
+    handler.close()
+
+    segment = path.with_name("log_2024-01-01_00-00-00.0001.log")
+    assert log_segments(path)[0] == segment and read(segment) == "long enough to rotate\n"
+    assert not list(path.parent.glob("*.tmp"))
+    err = capsys.readouterr().err
+    if raise_exceptions:
+        assert "Compressing" in err and "OSError: disk full" in err
+    else:
+        assert err == ""
@@ -0,0 +1,64 @@
+import copy
+import logging
+
+from foundation.utils import MergeReport, apply_overwrite, deep_merge, merge
+
+
+def original():
+    return {"a": 1, "nested": {"x": 1, "inner": {"y": 2}}, "other": {"z": 3}, "none": None}
+
+
+def test_merge_reports_paths():
+    merged, report = merge(original(), {"a": 1, "nested": {"x": 5, "inner": {"new": 1}}, "none": None, "b": {"c": 1}})
+    assert report.added == ["nested.inner.new", "b"]
+    assert report.overwritten == ["nested.x"]
+    assert report.unchanged == ["a", "none"]
+    assert report.changed
+    assert merged["nested"] == {"x": 5, "inner": {"y": 2, "new": 1}}
+
+
+def test_merge_matches_in_place_result_without_mutating_in_copy_mode():
+    new = {"nested": {"inner": {"y": 3}}, "a": [1]}
+    before = original()
+    expected, _ = merge(copy.deepcopy(before), new)
+
+    source = original()
+    merged, _ = merge(source, new, copy=True)
+    assert merged == expected
+    assert source == before
+    # Untouched subtrees are shared, changed ones are new dicts.
+    assert merged["other"] is source["other"]
+    assert merged["nested"] is not source["nested"]
+
+
+def test_copy_mode_returns_original_when_nothing_changes():
+    source = original()
+    merged, report = merge(source, {"a": 1, "nested": {"x": 1}}, copy=True)
+    assert merged is source
+    assert not report.changed
+
+
+def test_apply_overwrite_accumulates_report():
+    d = original()
+    report = MergeReport()
+    apply_overwrite(d, "nested.inner.y", 7, report=report)
+    apply_overwrite(d, "nested.inner", {"k": 1}, report=report)
+    apply_overwrite(d, "a", 1, report=report)
+    assert d["nested"]["inner"] == {"y": 7, "k": 1}
+    assert report == MergeReport(added=["nested.inner.k"], overwritten=["nested.inner.y"], unchanged=["a"])
+
+
+def test_deep_merge_logs_one_summary(caplog):
+    with caplog.at_level(logging.INFO, logger="foundation.utils.configuration"):
+        deep_merge(original(), {f"k{i}": i for i in range(100)})
+    assert len(caplog.records) == 1
+    assert "100 added" in caplog.text
+
+
+def test_disabled_logging_skips_summary(monkeypatch):
+    monkeypatch.setattr(MergeReport, "__str__", lambda self: 1 / 0)
+    logging.getLogger("foundation.utils.configuration").setLevel(logging.WARNING)
+    try:
+        deep_merge(original(), {"a": 2})
+    finally:
+        logging.getLogger("foundation.utils.configuration").setLevel(logging.NOTSET)
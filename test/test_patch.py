@@ -0,0 +1,98 @@
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+import pytest
+from dacite import WrongTypeError
+
+from conftest import DerivedConfig, Inner, SampleConfig, decoded
+from foundation import ConfigPatch, Sweep
+
+
+@dataclass
+class Nested:
+    test_value_int: int = 5
+    inner: Inner = field(default_factory=Inner)
+    table: dict = field(default_factory=dict)
+
+
+@dataclass
+class PatchConfig(SampleConfig):
+    nested: Nested = field(default_factory=Nested)
+    nested2: Nested = field(default_factory=Nested)
+    maybe: Optional[Inner] = None
+
+
+def test_diff_lists_only_changed_paths():
+    base = PatchConfig(extras={"a": {"b": 1}, "keep": 2})
+    other = PatchConfig(lr=0.2, extras={"a": {"b": 3, "c": 4}, "keep": 2})
+    other.nested.inner.path = Path("other")
+    patch = base.diff(other)
+    assert patch.changes == {"lr": 0.2, "nested.inner.path": "other", "extras.a.b": 3, "extras.a.c": 4}
+    assert base.diff(base).changes == {}
+
+
+def test_removed_dict_keys_replace_the_dict():
+    base = PatchConfig(extras={"a": 1, "b": 2})
+    other = PatchConfig(extras={"a": 1})
+    patch = base.diff(other)
+    assert patch.changes == {"extras": {"a": 1}}
+    assert base.patch(patch).extras == {"a": 1}
+
+
+def test_patch_roundtrip_shares_untouched_branches():
+    base = PatchConfig(extras={"a": {"b": 1}})
+    other = PatchConfig(lr=0.3, maybe=Inner(x=3), extras={"a": {"b": 1, "c": 2}})
+    other.nested.inner.x = 9
+
+    patch = ConfigPatch.loads(base.diff(other).dumps())
+    rebuilt = base.patch(patch)
+    assert rebuilt == other
+    assert isinstance(rebuilt.maybe, Inner) and isinstance(rebuilt.nested.inner.path, Path)
+    assert rebuilt.nested2 is base.nested2
+    assert rebuilt.nested.inner is not base.nested.inner
+    assert base == PatchConfig(extras={"a": {"b": 1}})
+
+
+def test_patch_accepts_dotted_dict():
+    cfg = PatchConfig().patch({"nested.inner.x": 7, "nested.inner.path": "p", "extras.new.key": 1})
+    assert cfg.nested.inner.x == 7 and cfg.nested.inner.path == Path("p")
+    assert cfg.extras == {"new": {"key": 1}}
+    with pytest.raises(KeyError):
+        PatchConfig().patch({"nested.nope": 1})
+
+
+def test_patch_checks_types():
+    with pytest.raises(WrongTypeError):
+        PatchConfig().patch({"lr": "abc"})
+    with pytest.raises(WrongTypeError) as info:
+        PatchConfig().patch(ConfigPatch.loads('{"set": {"maybe": {"x": "1"}}}'))
+    assert info.value.field_path == "maybe.x"
+
+
+def test_patch_checks_base():
+    base = PatchConfig()
+    patch = base.diff(PatchConfig(lr=0.5))
+    with pytest.raises(ValueError):
+        PatchConfig(lr=0.4).patch(patch)
+
+
+def test_diff_of_sweep_configs():
+    base = PatchConfig()
+    for cfg in Sweep(base).grid({"lr": [0.1, 0.2], "nested.inner.x": [1, 2]}):
+        patch = base.diff(cfg)
+        assert set(patch.changes) <= {"lr", "nested.inner.x"}
+        assert base.patch(patch) == cfg
+
+
+@pytest.mark.parametrize("changes", [{"width": 5}, {"debug": True}, {"width": 3, "debug": True}])
+def test_patched_config_matches_from_dict(changes):
+    base = DerivedConfig()
+    patched = base.patch(changes)
+    assert patched == decoded(base, changes)
+    assert patched.area == patched.width ** 2
+    assert patched.log_level == (logging.DEBUG if patched.debug else logging.INFO)
+
+    other = DerivedConfig(**changes)
+    assert base.patch(ConfigPatch.loads(base.diff(other).dumps())) == other
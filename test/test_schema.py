@@ -0,0 +1,67 @@
+import argparse
+from dataclasses import dataclass, field
+from typing import Optional
+
+import pytest
+
+from foundation import BaseConfig, BaseCLIParser
+from foundation.utils import apply_overwrite
+
+
+@dataclass
+class Inner:
+    x: int = 1
+    table: dict = field(default_factory=dict)
+
+
+@dataclass
+class Nested:
+    test_value_int: int = 5
+    inner: Inner = field(default_factory=Inner)
+    maybe_inner: Optional[Inner] = None
+
+
+@dataclass
+class SchemaConfig(BaseConfig):
+    nested: Nested = field(default_factory=Nested)
+
+
+def test_schema_flattens_every_depth():
+    schema = SchemaConfig.get_schema()
+    assert schema is SchemaConfig.get_schema()
+    assert {"nested", "nested.inner", "nested.inner.x", "nested.maybe_inner.table"} <= set(schema.fields)
+    assert schema.fields["nested.inner.x"].type is int
+    assert SchemaConfig.collect_nested_dataclasses() == ["nested"]
+
+
+def test_schema_free_form_and_unknown_paths():
+    schema = SchemaConfig.get_schema()
+    assert "extras.anything.goes" in schema
+    assert "nested.inner.table.key" in schema
+    assert "nested.inner.y" not in schema
+    with pytest.raises(KeyError, match="nested.inner.x"):
+        schema.resolve("nested.inner.y")
+
+
+def test_parse_base_handles_deep_keys():
+    parser = BaseCLIParser(SchemaConfig)
+    args = argparse.Namespace(**{"nested.inner.x": 3, "nested.test_value_int": 4, "debug": False, "log_dir": None})
+    unpacked = parser.parse_base(args)
+    assert unpacked == {"nested": {"inner": {"x": 3}, "test_value_int": 4}, "debug": False}
+    assert SchemaConfig.from_dict(unpacked).nested.inner.x == 3
+
+    with pytest.raises(KeyError):
+        parser.parse_base(argparse.Namespace(**{"nested.inner.y": 3}))
+
+
+def test_apply_overwrite_checks_schema():
+    with pytest.raises(KeyError):
+        apply_overwrite({}, "nested.nope", 1, schema=SchemaConfig.get_schema())
+
+
+def test_cfg_load_overwrites_deep_keys(tmp_path):
+    cfg = SchemaConfig(overwrite_from_cmd=True)
+    path = tmp_path / "cfg.json"
+    cfg.save(path)
+    loaded = SchemaConfig.cfg_load(path, {"nested.inner.x": 9, "nested.unknown": 1})
+    assert loaded.nested.inner.x == 9
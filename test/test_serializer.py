@@ -0,0 +1,92 @@
+import json
+from collections import namedtuple
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum, IntEnum
+from pathlib import Path
+from typing import List, Optional, Tuple
+from uuid import UUID
+
+import pytest
+
+from foundation import BaseConfig, CustomJSONEncoder
+from foundation.utils import get_serializer
+
+
+class Colour(Enum):
+    RED = "red"
+
+
+class Level(IntEnum):
+    HIGH = 3
+
+
+Point = namedtuple("Point", "x y")
+
+
+@dataclass
+class Inner:
+    x: float = 1.5
+    tags: List[str] = field(default_factory=list)
+
+
+@dataclass
+class Nested:
+    test_value_int: int = 5
+    test_value_str: str = "Hello World"
+    test_dict: dict = field(default_factory=dict)
+    inner: Inner = field(default_factory=Inner)
+    empty: Optional[Inner] = None
+
+
+@dataclass
+class SerializerConfig(BaseConfig):
+    test_date: datetime = datetime(2026, 12, 1)
+    day: date = date(2026, 1, 2)
+    price: Decimal = Decimal("1.10")
+    uid: UUID = UUID("12345678-1234-5678-1234-567812345678")
+    colour: Colour = Colour.RED
+    level: Level = Level.HIGH
+    pair: Tuple[int, str] = (1, "a")
+    inners: List[Inner] = field(default_factory=lambda: [Inner(), Inner(2.0, ["ü"])])
+    nested: Nested = field(default_factory=Nested)
+
+
+def sample_configs():
+    yield SerializerConfig()
+    yield SerializerConfig(extras={
+        "table": {str(i): list(range(i % 7)) for i in range(2000)},
+        "floats": [float("nan"), float("inf"), -0.0, 1e300],
+        1: "int key", 2.5: "float key", None: "none key", True: "bool key",
+        "set": {3}, "path": Path("/tmp/x"), "type": SerializerConfig, "point": Point(1, 2),
+        "unicode": "Grüße ☃ \"quoted\"\n",
+        "nested_dc": Inner(),
+    })
+    yield SerializerConfig(nested=Nested(test_dict={"malerisch": {}, "deep": {"a": [{}, [], ()]}}))
+
+
+@pytest.mark.parametrize("cfg", list(sample_configs()))
+def test_identical_to_json_dump(cfg, tmp_path):
+    expected = json.dumps(asdict(cfg), indent=2, cls=CustomJSONEncoder)
+    path = tmp_path / "cfg.json"
+    cfg.save(path)
+    assert path.read_text() == expected
+    assert get_serializer(CustomJSONEncoder, None).dumps(cfg) == json.dumps(
+        asdict(cfg), separators=(",", ":"), cls=CustomJSONEncoder)
+
+
+def test_compact_save_roundtrip(tmp_path):
+    cfg = SerializerConfig(extras={"a": [1, 2]})
+    path = tmp_path / "cfg.json"
+    cfg.save(path, compact=True)
+    assert "\n" not in path.read_text()
+    assert json.loads(path.read_text()) == json.loads(get_serializer().dumps(cfg))
+
+
+def test_unserializable_values_raise_like_json():
+    cfg = SerializerConfig(extras={"obj": object()})
+    with pytest.raises(TypeError):
+        get_serializer().dumps(cfg)
+    with pytest.raises(TypeError):
+        get_serializer().dumps(SerializerConfig(extras={(1, 2): "tuple key"}))
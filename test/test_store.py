@@ -0,0 +1,83 @@
+from dataclasses import dataclass, field
+
+import pytest
+
+from foundation import BaseConfig, ConfigStore, Sweep
+
+
+@dataclass
+class Nested:
+    test_value_int: int = 5
+    test_value_str: str = "Hello World"
+
+
+@dataclass
+class StoreConfig(BaseConfig):
+    lr: float = 0.1
+    nested: Nested = field(default_factory=Nested)
+
+
+@dataclass
+class OtherConfig(BaseConfig):
+    lr: float = 0.1
+    nested: Nested = field(default_factory=Nested)
+
+
+@pytest.fixture
+def store(tmp_path):
+    with ConfigStore(tmp_path / "store" / "configs.db") as store:
+        yield store
+
+
+def test_put_deduplicates_by_content(store):
+    first = store.put(StoreConfig())
+    assert store.put(StoreConfig()) == first
+    assert store.put(StoreConfig(lr=0.2)) != first
+    assert len(store) == 2
+
+
+def test_equal_fields_of_other_classes_are_kept_apart(store):
+    ids = store.put_many([StoreConfig(), OtherConfig()])
+    assert ids[0] != ids[1] and len(store) == 2
+    assert store.get_hash(ids[0]) != store.get_hash(ids[1])
+    assert store.put(OtherConfig()) == ids[1]
+    assert store.get_dict(ids[1]) == store.get_dict(ids[0])
+
+
+def test_query_none_values(store):
+    ids = store.put_many([StoreConfig(), StoreConfig(lr=0.2, log_dir="logs")])
+    assert store.query(equals={"log_dir": None}) == ids[:1]
+    assert store.query(equals={"log_dir": "logs"}) == ids[1:]
+
+
+def test_bulk_insert_and_queries(store):
+    sweep = Sweep(StoreConfig()).grid({"lr": [0.1, 0.2, 0.3], "nested.test_value_int": [1, 5, 9]})
+    ids = store.put_many(sweep)
+    assert len(set(ids)) == 9
+
+    matches = store.query(equals={"nested.test_value_int": 5})
+    assert len(matches) == 3
+    assert all(store.get(i, StoreConfig).nested.test_value_int == 5 for i in matches)
+
+    matches = store.query(equals={"nested.test_value_int": 5}, ranges={"lr": (0.15, None)})
+    assert sorted(store.get(i, StoreConfig).lr for i in matches) == [0.2, 0.3]
+    assert store.query(ranges={"nested.test_value_int": (2, 8)}) == store.query(equals={"nested.test_value_int": 5})
+
+
+def test_cfg_load_from_store(store):
+    config_id = store.put(StoreConfig(lr=0.5, overwrite_from_cmd=True))
+    digest = store.get_hash(config_id)
+
+    assert StoreConfig.cfg_load(config_id, store=store).lr == 0.5
+    loaded = StoreConfig.cfg_load(digest, {"nested.test_value_int": 7}, store=store)
+    assert loaded.lr == 0.5 and loaded.nested.test_value_int == 7
+    with pytest.raises(KeyError):
+        StoreConfig.cfg_load(config_id + 1, store=store)
+
+
+def test_restricted_index(tmp_path):
+    with ConfigStore(tmp_path / "configs.db", indexed_paths=["lr"]) as store:
+        store.put(StoreConfig())
+        assert len(store.query(equals={"lr": 0.1})) == 1
+        with pytest.raises(KeyError):
+            store.query(equals={"nested.test_value_int": 5})
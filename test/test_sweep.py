@@ -0,0 +1,80 @@
+import json
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import pytest
+
+from conftest import DerivedConfig, decoded
+from foundation import BaseConfig, Sweep
+
+
+@dataclass
+class Inner:
+    x: int = 1
+
+
+@dataclass
+class Nested:
+    test_value_int: int = 5
+    inner: Inner = field(default_factory=Inner)
+
+
+@dataclass
+class SweepConfig(BaseConfig):
+    lr: float = 0.1
+    nested: Nested = field(default_factory=Nested)
+    nested2: Nested = field(default_factory=Nested)
+
+
+def test_grid_and_zip_combine_as_product():
+    sweep = Sweep(SweepConfig()).grid({"lr": [0.1, 0.2], "nested.inner.x": [1, 2, 3]}).zip({"log_level": [10, 20], "debug": [True, False]})
+    configs = list(sweep)
+    assert len(sweep) == len(configs) == 12
+    assert {(c.lr, c.nested.inner.x, c.log_level) for c in configs} == {
+        (lr, x, lvl) for lr in (0.1, 0.2) for x in (1, 2, 3) for lvl in (10, 20)
+    }
+
+
+def test_unchanged_branches_are_shared():
+    base = SweepConfig()
+    cfg = next(iter(Sweep(base).grid({"nested.inner.x": [7], "extras.tag": ["a"], "current_run_dir": ["/tmp/r"]})))
+    assert cfg.nested.inner.x == 7 and base.nested.inner.x == 1
+    assert cfg.nested2 is base.nested2
+    assert cfg.extras == {"tag": "a"} and base.extras == {}
+    assert cfg.current_run_dir == Path("/tmp/r")
+
+
+def test_random_is_reproducible():
+    axes = {"lr": lambda rng: rng.uniform(0, 1), "nested.test_value_int": [1, 2, 3]}
+    first = [(c.lr, c.nested.test_value_int) for c in Sweep(SweepConfig()).random(axes, n=20, seed=3)]
+    second = [(c.lr, c.nested.test_value_int) for c in Sweep(SweepConfig()).random(axes, n=20, seed=3)]
+    assert first == second and len(first) == 20
+
+
+def test_invalid_axes():
+    with pytest.raises(KeyError):
+        Sweep(SweepConfig()).grid({"nested.nope": [1]})
+    with pytest.raises(ValueError):
+        Sweep(SweepConfig()).zip({"lr": [1, 2], "debug": [True]})
+    with pytest.raises(ValueError):
+        list(Sweep(SweepConfig()).grid({"nested.inner": [None], "nested.inner.x": [1]}))
+
+
+def test_save_jsonl(tmp_path):
+    path = tmp_path / "sweep.jsonl"
+    assert Sweep(SweepConfig()).grid({"lr": [0.1, 0.2, 0.3]}).save_jsonl(path) == 3
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [line["lr"] for line in lines] == [0.1, 0.2, 0.3]
+    assert SweepConfig.from_dict(lines[1]).lr == 0.2
+
+
+def test_points_match_from_dict():
+    base = DerivedConfig()
+    sweep = Sweep(base).grid({"width": [3, 4], "debug": [True, False]})
+    for changes, cfg in zip(sweep.iter_overrides(), sweep):
+        assert ("git_hash" in vars(cfg)) is not cfg.debug  # debug starts the git lookup
+        assert cfg == decoded(base, changes)
+        assert cfg.area == cfg.width ** 2
+        assert cfg.log_level == (logging.DEBUG if cfg.debug else logging.INFO)
+    assert base.area == 4
@@ -0,0 +1,70 @@
+from dataclasses import dataclass, field
+from typing import Optional
+
+import pytest
+
+from foundation import BaseConfig, Sweep
+from foundation.utils import Check, ValidationError, Violation, constraint
+
+
+@dataclass
+class Optimizer:
+    name: str = field(default="adam", metadata=constraint(choices=("adam", "sgd")))
+    lr: float = field(default=0.1, metadata=constraint(gt=0, le=1))
+
+
+@dataclass
+class ValidatedConfig(BaseConfig):
+    optimizer: Optimizer = field(default_factory=Optimizer)
+    run_name: Optional[str] = field(default="run", metadata=constraint(regex=r"[a-z_]+", required=True))
+    warmup: int = field(default=0, metadata=constraint(ge=0))
+    steps: int = 100
+    checks = (Check(("warmup", "steps"), lambda warmup, steps: warmup < steps, "warmup must be shorter than steps"),)
+
+
+def test_valid_config_passes():
+    ValidatedConfig().validate()
+    BaseConfig().validate()
+
+
+def test_violations_are_collected_with_paths():
+    cfg = ValidatedConfig(optimizer=Optimizer(name="rmsprop", lr=2.0), run_name=None, warmup=200)
+    with pytest.raises(ValidationError) as info:
+        cfg.validate()
+    assert set(info.value.violations) == {
+        Violation("optimizer.name", "must be one of ['adam', 'sgd']"),
+        Violation("optimizer.lr", "must be <= 1"),
+        Violation("run_name", "is required"),
+        Violation("warmup, steps", "warmup must be shorter than steps"),
+    }
+
+
+def test_wrong_types_are_reported():
+    with pytest.raises(ValidationError) as info:
+        ValidatedConfig(warmup="3", run_name=5).validate()  # type: ignore
+    assert {v.path for v in info.value.violations} == {"warmup", "run_name", "warmup, steps"}
+
+
+def test_batch_reports_rows():
+    columns = {"optimizer.lr": [0.1, 0.0, 0.5, 3.0], "warmup": [0, 10, 200, 0]}
+    violations = ValidatedConfig.validate_batch(columns)
+    assert sorted((v.index, v.path) for v in violations) == [(1, "optimizer.lr"), (2, "warmup, steps"), (3, "optimizer.lr")]
+
+
+def test_batch_reports_shared_values_once():
+    base = ValidatedConfig(run_name="Bad Name")
+    violations = ValidatedConfig.validate_batch({"warmup": [1, 2, 3]}, base=base)
+    assert violations == [Violation("run_name", "must match '[a-z_]+'")]
+    with pytest.raises(ValueError):
+        ValidatedConfig.validate_batch({"warmup": [1], "steps": [1, 2]})
+
+
+def test_sweep_validation_reports_every_row():
+    lrs, warmups = [i / 100 for i in range(100)], list(range(0, 2000, 2))
+    sweep = Sweep(ValidatedConfig()).grid({"optimizer.lr": lrs, "warmup": warmups})
+    violations = sweep.validate()
+    assert len(sweep) == 100_000
+    # lr == 0 for the 1000 rows of the first lr, warmup >= steps for 950 warmups with each lr.
+    expected = [(w, "optimizer.lr") for w in range(len(warmups))]
+    expected += [(i * len(warmups) + w, "warmup, steps") for i in range(len(lrs)) for w in range(len(warmups)) if warmups[w] >= 100]
+    assert sorted((v.index, v.path) for v in violations) == sorted(expected)
@@ -0,0 +1,95 @@
+import json
+import logging
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+from conftest import DerivedConfig, SampleConfig
+from foundation import ConfigWatcher
+
+
+def rewrite(cfg, **changes):
+    path = cfg.get_cfg_file_path("load")
+    data = json.loads(path.read_text())
+    for key, value in changes.items():
+        node = data
+        *parents, last = key.split("__")
+        for part in parents:
+            node = node[part]
+        node[last] = value
+    path.write_text(json.dumps(data, indent=2))
+
+
+def test_reload_decodes_only_changed_branches(saved):
+    watcher = ConfigWatcher(saved, use_inotify=False)
+    received = []
+    watcher.subscribe(lambda paths, cfg: received.append((paths, cfg)))
+    rewrite(saved, inner__path="new", extras__a__c=2)
+    assert watcher.reload() == ["extras.a.c", "inner.path"]
+    cfg = watcher.config
+    assert cfg.inner.path == Path("new") and cfg.extras == {"a": {"b": 1, "c": 2}}
+    assert cfg.other is saved.other
+    assert saved.inner.path == Path("data")
+    assert received == [(["extras.a.c", "inner.path"], cfg)]
+    assert watcher.reload() == []
+
+
+def test_wrong_type_keeps_config(saved):
+    watcher = ConfigWatcher(saved, use_inotify=False)
+    rewrite(saved, lr="abc")
+    assert watcher.reload() == []
+    assert watcher.config is saved
+    rewrite(saved, lr="abc", inner__x="2")
+    assert watcher.reload() == []
+    rewrite(saved, lr=0.5, inner__x=2)
+    assert sorted(watcher.reload()) == ["inner.x", "lr"]
+    assert watcher.config.lr == 0.5 and watcher.config.inner.x == 2
+
+
+def test_reload_matches_loading_the_file(tmp_path):
+    cfg = DerivedConfig(current_run_dir=tmp_path, cfg_file_name_load="run", cfg_file_name_save="run")
+    cfg.save()
+    watcher = ConfigWatcher(cfg, use_inotify=False)
+    rewrite(cfg, width=5, debug=True)
+    assert sorted(watcher.reload()) == ["debug", "width"]
+    reloaded = watcher.config
+    assert reloaded.area == 25 and reloaded.log_level == logging.DEBUG
+    assert reloaded == DerivedConfig.cfg_load(cfg.get_cfg_file_path("load"))
+
+
+def test_invalid_json_keeps_config(saved):
+    watcher = ConfigWatcher(saved, use_inotify=False)
+    path = saved.get_cfg_file_path("load")
+    content = path.read_text()
+    path.write_text(content[:20])
+    assert watcher.reload() == [] and watcher.config is saved
+    path.write_text(content.replace('"lr": 0.1', '"lr": 0.3'))
+    assert watcher.reload() == ["lr"] and watcher.config.lr == 0.3
+
+
+def test_overrides_survive_unrelated_reloads(saved):
+    cfg = SampleConfig.cfg_load(saved.get_cfg_file_path("load"), overwrite={"other.x": 9})
+    watcher = ConfigWatcher(cfg, path=saved.get_cfg_file_path("load"), use_inotify=False)
+    rewrite(saved, lr=0.5)
+    watcher.reload()
+    assert watcher.config.lr == 0.5 and watcher.config.other.x == 9
+
+
+@pytest.mark.parametrize("use_inotify", [False, pytest.param(True, marks=pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify"))])
+def test_background_reload_coalesces_writes(saved, use_inotify):
+    calls = []
+    done = threading.Event()
+
+    def callback(paths, cfg):
+        calls.append(paths)
+        done.set()
+
+    with ConfigWatcher(saved, interval=0.02, debounce=0.2, use_inotify=use_inotify) as watcher:
+        watcher.subscribe(callback)
+        for lr in (0.2, 0.3, 0.4):
+            rewrite(saved, lr=lr)
+        assert done.wait(5)
+    assert watcher.config.lr == 0.4
+    assert calls == [["lr"]]